@@ -1,21 +1,144 @@
 """Local audio feature extraction from Spotify preview URLs."""
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
+from collections import OrderedDict
 import asyncio
+import concurrent.futures
+import hashlib
+import importlib.util
+import io
 import json
 import os
 import sys
 import tempfile
+from pathlib import Path
 
 try:
-    import requests
-    import librosa
+    import httpx
     import numpy as np
-    DEPENDENCIES_AVAILABLE = True
+    # librosa itself is imported on first use (see _import_librosa)
+    DEPENDENCIES_AVAILABLE = importlib.util.find_spec("librosa") is not None
 except ImportError:
     DEPENDENCIES_AVAILABLE = False
 
-from .exceptions import PreviewDownloadError, AudioProcessingError
+# librosa module, imported by _import_librosa()
+librosa = None
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit when numba is not installed."""
+        def decorator(fn):
+            return fn
+        return decorator
+
+from .exceptions import AudioAnalysisError, PreviewDownloadError, AudioProcessingError
+
+# Process-wide executor for CPU-bound librosa work, sized to the core count so
+# concurrent analyses don't oversubscribe the CPU (the asyncio default
+# executor allows up to 32 threads)
+_CPU_POOL = concurrent.futures.ThreadPoolExecutor(
+    max_workers=os.cpu_count() or 4,
+    thread_name_prefix="audio-analyze"
+)
+
+# Optional process pool for GIL-free analysis (created on first use)
+_PROCESS_POOL: Optional[concurrent.futures.ProcessPoolExecutor] = None
+
+
+def _import_librosa():
+    """
+    Import librosa on first use, with its on-disk cache enabled.
+
+    librosa memoizes filterbanks/windows on disk when LIBROSA_CACHE_DIR is set
+    at import time, so the variables are set just before the import; explicit
+    user settings take precedence. joblib unpickles whatever it finds in the
+    cache, so it lives in a private per-user directory (never the shared temp
+    dir); if that can't be created, librosa runs uncached.
+    """
+    global librosa
+    if librosa is None:
+        if "LIBROSA_CACHE_DIR" not in os.environ:
+            try:
+                cache_dir = str(Path.home() / '.spotify-mcp' / 'librosa_cache')
+                os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+                os.chmod(cache_dir, 0o700)
+            except (OSError, RuntimeError):  # RuntimeError: no home directory
+                pass
+            else:
+                os.environ["LIBROSA_CACHE_DIR"] = cache_dir
+                os.environ.setdefault("LIBROSA_CACHE_LEVEL", "20")
+
+        import librosa as librosa_module
+        librosa = librosa_module
+    return librosa
+
+
+def _get_process_pool() -> concurrent.futures.ProcessPoolExecutor:
+    """Get the shared process pool, creating it on first use."""
+    global _PROCESS_POOL
+    if _PROCESS_POOL is None:
+        _PROCESS_POOL = concurrent.futures.ProcessPoolExecutor(
+            max_workers=os.cpu_count() or 4
+        )
+    return _PROCESS_POOL
+
+
+@njit(cache=True, fastmath=True)
+def _reduce_features(chroma_sum, onset_env, beats, rms, centroid):
+    """
+    Reduce per-frame librosa arrays to scalar features.
+
+    Compiled with numba when available, otherwise runs as plain NumPy.
+
+    Args:
+        chroma_sum: Chroma energy summed over time (12 pitch classes)
+        onset_env: Onset strength envelope
+        beats: Beat frame indices
+        rms: RMS energy per frame
+        centroid: Spectral centroid per frame (Hz)
+
+    Returns:
+        Tuple of (key, mode, energy, danceability, valence)
+    """
+    # KEY: dominant pitch class, 0-11 (C, C#, D, ..., B)
+    key = int(np.argmax(chroma_sum))
+
+    # MODE (major/minor detection)
+    # Major chords have stronger 3rd (4 semitones up)
+    # Minor chords have stronger minor 3rd (3 semitones up)
+    mode = 1 if chroma_sum[(key + 4) % 12] > chroma_sum[(key + 3) % 12] else 0
+
+    # ENERGY: mean RMS normalized to 0-1 (use percentile to handle outliers)
+    energy = float(rms.mean())
+    max_rms = np.percentile(rms, 95)
+    if max_rms > 0:
+        energy = min(energy / max_rms, 1.0)
+
+    # DANCEABILITY: beat regularity (std deviation of beat intervals)...
+    regularity = 0.0
+    if beats.size > 1:
+        beat_intervals = np.diff(beats).astype(np.float32)
+        regularity = 1.0 - min(beat_intervals.std() / beat_intervals.mean(), 1.0)
+
+    # ...plus average onset strength at beat locations
+    strength = 0.0
+    if beats.size > 0:
+        beat_strengths = onset_env[np.minimum(beats, onset_env.size - 1)]
+        strength = beat_strengths.mean() / (onset_env.max() + 1e-6)
+
+    danceability = (regularity + strength) / 2.0
+
+    # VALENCE: brighter, higher-frequency music tends to sound happier.
+    # Normalize centroid to 0-1 using the typical 500-4000 Hz range
+    valence = (centroid.mean() - 500.0) / 3500.0
+    valence = max(0.0, min(1.0, valence))  # Clamp to [0, 1]
+
+    return key, mode, energy, danceability, valence
 
 
 class AudioFeatureAnalyzer:
@@ -32,19 +155,48 @@ class AudioFeatureAnalyzer:
         - valence: float (0.0-1.0) [estimated from spectral features]
 
     Note:
-        Requires optional dependencies: librosa, numpy, soundfile, requests
+        Requires optional dependencies: librosa, numpy, soundfile, httpx
         Install with: pip install .[audio]
     """
 
-    ANALYZER_VERSION = "1.0.0"  # Bump when algorithm changes
+    # Bump MAJOR/MINOR when results change (invalidates the cache);
+    # PATCH bumps keep cached results
+    ANALYZER_VERSION = "1.4.0"
+
+    # Analysis sample rate (mono). Nyquist at 8 kHz comfortably covers the
+    # 500-4000 Hz centroid range used for valence.
+    SAMPLE_RATE = 16000
+
+    # Frame parameters shared by every librosa feature
+    N_FFT = 2048
+    HOP_LENGTH = 1024
 
-    def __init__(self, cache_dir: Optional[str] = None):
+    # Previews below these limits are truncated or silent and are not analyzed
+    MIN_PREVIEW_BYTES = 10_000
+    MIN_PREVIEW_SECONDS = 3
+    SILENCE_THRESHOLD = 1e-4
+
+    # Number of analyses kept in memory in front of the disk cache
+    MEMORY_CACHE_SIZE = 1024
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_concurrent_downloads: int = 20,
+        max_concurrent_analyses: Optional[int] = None,
+        use_processes: bool = False
+    ):
         """
         Initialize analyzer with optional caching directory.
 
         Args:
             cache_dir: Directory for caching analysis results.
                       If None, uses system temp directory (recommended for MCP servers).
+            max_concurrent_downloads: Maximum preview downloads in flight at once
+            max_concurrent_analyses: Maximum librosa analyses running at once.
+                      If None, uses the number of CPUs.
+            use_processes: Run analyses in a shared process pool instead of
+                      the shared thread pool, bypassing the GIL
 
         Raises:
             ImportError: If required audio analysis dependencies are not installed
@@ -54,6 +206,7 @@ class AudioFeatureAnalyzer:
                 "Audio analysis dependencies not installed. "
                 "Install with: pip install .[audio]"
             )
+        _import_librosa()
 
         # Use system temp directory by default to avoid permission issues with MCP servers
         if cache_dir is None:
@@ -63,9 +216,47 @@ class AudioFeatureAnalyzer:
             cache_dir = os.path.join(tempfile.gettempdir(), cache_dir)
 
         self.cache_dir = cache_dir
-        os.makedirs(cache_dir, exist_ok=True)
+        self.hash_cache_dir = os.path.join(cache_dir, "by_hash")
+        os.makedirs(self.hash_cache_dir, exist_ok=True)
         print(f"🗂️  Audio cache directory: {cache_dir}", file=sys.stderr)
 
+        self.use_processes = use_processes
+
+        # In-process LRU of recent analyses: repeat lookups skip the filesystem
+        self._memory_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+        # Shared HTTP client for preview downloads (created on first request)
+        self._http: Optional[httpx.AsyncClient] = None
+
+        # Downloads are I/O-bound and can fan out widely; analyses are
+        # CPU-bound and are capped at the core count
+        self._download_slots = asyncio.Semaphore(max_concurrent_downloads)
+        self._analysis_slots = asyncio.Semaphore(
+            max_concurrent_analyses or os.cpu_count() or 4
+        )
+
+    async def __aenter__(self) -> "AudioFeatureAnalyzer":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def _get_http_client(self) -> "httpx.AsyncClient":
+        """Get the shared keep-alive HTTP client, creating it on first use."""
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                timeout=10.0,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=20),
+                follow_redirects=True
+            )
+        return self._http
+
+    async def close(self) -> None:
+        """Close the shared HTTP client."""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
     async def analyze_preview(
         self,
         preview_url: str,
@@ -86,62 +277,89 @@ class AudioFeatureAnalyzer:
             AudioProcessingError: If librosa analysis fails
 
         Note:
-            Uses asyncio.to_thread to avoid blocking event loop.
-            Analysis runs in separate thread pool.
+            Downloads use a shared non-blocking HTTP client, so several
+            previews can be fetched concurrently with asyncio.gather.
+            Analysis runs in a shared executor sized to the CPU count.
         """
         if not preview_url:
             return None
 
-        # Check cache (with version validation)
+        # Check in-memory cache first
+        cached = self._memory_cache.get(track_id)
+        if cached is not None:
+            self._memory_cache.move_to_end(track_id)
+            return dict(cached)
+
+        # Check disk cache (with version validation)
         cache_path = os.path.join(self.cache_dir, f"{track_id}.json")
         if os.path.exists(cache_path):
             try:
                 with open(cache_path, 'r') as f:
                     data = json.load(f)
-                    if data.get("analyzer_version") == self.ANALYZER_VERSION:
+                    cached_version = data.get("analyzer_version")
+                    if self._is_compatible_version(cached_version):
+                        if cached_version != self.ANALYZER_VERSION:
+                            print(
+                                f"ℹ️  Reusing analysis from analyzer {cached_version} for {track_id}",
+                                file=sys.stderr
+                            )
                         print(f"✅ Loaded cached analysis for {track_id}", file=sys.stderr)
+                        self._remember(track_id, data)
                         return data
                     else:
                         print(f"⚠️  Cache version mismatch for {track_id}, re-analyzing", file=sys.stderr)
             except (json.JSONDecodeError, IOError) as e:
                 print(f"⚠️  Cache read error for {track_id}: {e}", file=sys.stderr)
 
-        # Download preview (run in thread to avoid blocking)
+        # Download preview over the shared connection pool
         print(f"⬇️  Downloading preview for {track_id}...", file=sys.stderr)
         try:
-            response = await asyncio.to_thread(
-                requests.get,
-                preview_url,
-                timeout=10
-            )
+            async with self._download_slots:
+                response = await self._get_http_client().get(preview_url)
             response.raise_for_status()
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             raise PreviewDownloadError(
                 f"Failed to download preview: {preview_url}"
             ) from e
 
-        # Write to temporary file
-        with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as tmp_file:
-            tmp_file.write(response.content)
-            tmp_path = tmp_file.name
+        # Check content-addressed cache: identical audio bytes always yield
+        # identical features, regardless of which track ID they belong to
+        digest = hashlib.sha1(response.content).hexdigest()
+        hash_cache_path = os.path.join(
+            self.hash_cache_dir, f"{digest}_{self._cache_version()}.json"
+        )
+        if os.path.exists(hash_cache_path):
+            try:
+                with open(hash_cache_path, 'r') as f:
+                    features = json.load(f)
+                features["track_id"] = track_id
+                features["preview_url"] = preview_url
+                self._write_cache(cache_path, features)
+                self._remember(track_id, features)
+                print(f"✅ Reused analysis of identical audio for {track_id}", file=sys.stderr)
+                return features
+            except (json.JSONDecodeError, IOError) as e:
+                print(f"⚠️  Hash cache read error for {track_id}: {e}", file=sys.stderr)
 
         try:
-            # Run CPU-bound analysis in thread pool
+            # Run CPU-bound analysis in thread pool (decoded straight from memory)
             print(f"🔬 Analyzing audio for {track_id}...", file=sys.stderr)
-            features = await asyncio.to_thread(self._extract_features, tmp_path)
+            executor = _get_process_pool() if self.use_processes else _CPU_POOL
+            async with self._analysis_slots:
+                features = await asyncio.get_running_loop().run_in_executor(
+                    executor, self._extract_features, response.content
+                )
 
             # Add metadata
             features["analyzer_version"] = self.ANALYZER_VERSION
             features["track_id"] = track_id
             features["preview_url"] = preview_url
 
-            # Cache results
-            try:
-                with open(cache_path, 'w') as f:
-                    json.dump(features, f, indent=2)
+            # Cache results (by track ID and by audio content hash)
+            if self._write_cache(cache_path, features):
                 print(f"💾 Cached analysis for {track_id}", file=sys.stderr)
-            except IOError as e:
-                print(f"⚠️  Failed to cache analysis: {e}", file=sys.stderr)
+            self._write_cache(hash_cache_path, features)
+            self._remember(track_id, features)
 
             return features
 
@@ -150,98 +368,168 @@ class AudioFeatureAnalyzer:
                 f"Librosa failed to process audio for track {track_id}"
             ) from e
 
-        finally:
-            # Clean up temporary file
-            try:
-                os.unlink(tmp_path)
-            except OSError:
-                pass
+    async def analyze_many(
+        self,
+        items: List[Tuple[str, str]]
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Analyze many previews concurrently (async).
+
+        Downloads and librosa analyses overlap, bounded by the analyzer's
+        download and analysis concurrency limits.
 
-    def _extract_features(self, audio_path: str) -> Dict[str, Any]:
+        Args:
+            items: List of (preview_url, track_id) pairs
+
+        Returns:
+            List of feature dicts in the same order as items. Entries are None
+            when the preview is unavailable or could not be analyzed.
+        """
+        results = await asyncio.gather(
+            *(self.analyze_preview(url, track_id) for url, track_id in items),
+            return_exceptions=True
+        )
+
+        features_list: List[Optional[Dict[str, Any]]] = []
+        for (_, track_id), result in zip(items, results):
+            if isinstance(result, AudioAnalysisError):
+                print(f"⚠️  Analysis failed for {track_id}: {result}", file=sys.stderr)
+                features_list.append(None)
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                features_list.append(result)
+        return features_list
+
+    @classmethod
+    def _cache_version(cls) -> str:
+        """MAJOR.MINOR part of the analyzer version (the cache compatibility key)."""
+        return ".".join(cls.ANALYZER_VERSION.split(".")[:2])
+
+    @classmethod
+    def _is_compatible_version(cls, version: Optional[str]) -> bool:
+        """
+        Check whether results cached by another analyzer version can be reused.
+
+        Args:
+            version: analyzer_version stored with the cached results
+
+        Returns:
+            True if MAJOR.MINOR matches the current analyzer version
+        """
+        if not isinstance(version, str):
+            return False
+        return ".".join(version.split(".")[:2]) == cls._cache_version()
+
+    def _remember(self, track_id: str, features: Dict[str, Any]) -> None:
+        """Store analysis results in the in-memory LRU cache."""
+        self._memory_cache[track_id] = dict(features)
+        self._memory_cache.move_to_end(track_id)
+        if len(self._memory_cache) > self.MEMORY_CACHE_SIZE:
+            self._memory_cache.popitem(last=False)
+
+    def _write_cache(self, path: str, features: Dict[str, Any]) -> bool:
+        """
+        Write analysis results to a cache file.
+
+        Args:
+            path: Cache file path
+            features: Feature dict to store
+
+        Returns:
+            True if the file was written, False otherwise
+        """
+        try:
+            with open(path, 'w') as f:
+                json.dump(features, f, separators=(',', ':'))
+            return True
+        except IOError as e:
+            print(f"⚠️  Failed to cache analysis: {e}", file=sys.stderr)
+            return False
+
+    @staticmethod
+    def _skipped_features() -> Dict[str, Any]:
+        """Feature stub for previews too short or silent to analyze."""
+        return {
+            "tempo": 0.0,
+            "key": 0,
+            "mode": 0,
+            "energy": 0.0,
+            "danceability": 0.0,
+            "valence": 0.0,
+            "analysis_method": "librosa-skipped",
+            "preview_based": True
+        }
+
+    @classmethod
+    def _extract_features(cls, audio_bytes: bytes) -> Dict[str, Any]:
         """
         Extract audio features using librosa (synchronous, CPU-bound).
 
         Args:
-            audio_path: Path to MP3 file
+            audio_bytes: Raw MP3 data
 
         Returns:
             Dict with extracted features
 
         Note:
-            This is a blocking function. Should only be called via
-            asyncio.to_thread() to avoid blocking the event loop.
+            This is a blocking function. Should only be called through an
+            executor to avoid blocking the event loop. It is a classmethod so
+            it can be pickled into a process pool.
         """
-        # Load audio (librosa defaults to mono, 22050 Hz)
-        y, sr = librosa.load(audio_path, sr=22050)
+        # Too small to hold a usable preview: skip decoding entirely
+        if len(audio_bytes) < cls.MIN_PREVIEW_BYTES:
+            return cls._skipped_features()
+
+        # Process-pool workers import librosa here, on their first analysis
+        librosa = _import_librosa()
+
+        # Decode audio from memory, downmixed to mono at the analysis rate
+        y, sr = librosa.load(io.BytesIO(audio_bytes), sr=cls.SAMPLE_RATE, mono=True)
+
+        # Truncated or silent preview: features would be meaningless
+        if y.size < sr * cls.MIN_PREVIEW_SECONDS or float(np.abs(y).max()) < cls.SILENCE_THRESHOLD:
+            return cls._skipped_features()
+
+        hop_length = cls.HOP_LENGTH
+
+        # Single magnitude STFT shared by the spectral features below
+        S = np.abs(librosa.stft(y, n_fft=cls.N_FFT, hop_length=hop_length))
+
+        # Onset envelope shared by beat tracking and danceability
+        onset_env = librosa.onset.onset_strength(y=y, sr=sr, hop_length=hop_length)
 
         # 1. TEMPO (BPM)
-        tempo, beats = librosa.beat.beat_track(y=y, sr=sr)
-
-        # 2. KEY DETECTION (using chroma features)
-        # Use Constant-Q Transform chroma for better resolution
-        chroma = librosa.feature.chroma_cqt(y=y, sr=sr)
-
-        # Sum chroma across time and find dominant pitch class
-        chroma_sum = np.sum(chroma, axis=1)
-        key = int(np.argmax(chroma_sum))  # 0-11 (C, C#, D, ..., B)
-
-        # 3. MODE (major/minor detection)
-        # IMPROVED: Use chroma pattern analysis
-        # Major chords have stronger 3rd (4 semitones up)
-        # Minor chords have stronger minor 3rd (3 semitones up)
-        major_third_idx = (key + 4) % 12
-        minor_third_idx = (key + 3) % 12
-
-        major_strength = chroma_sum[major_third_idx]
-        minor_strength = chroma_sum[minor_third_idx]
-
-        mode = 1 if major_strength > minor_strength else 0
-
-        # 4. ENERGY (RMS energy normalized)
-        rms = librosa.feature.rms(y=y)[0]
-        energy = float(np.mean(rms))
-
-        # Normalize to 0-1 range (use percentile to handle outliers)
-        max_rms = np.percentile(rms, 95)
-        if max_rms > 0:
-            energy = min(energy / max_rms, 1.0)
-
-        # 5. DANCEABILITY (estimated from beat strength and regularity)
-        onset_env = librosa.onset.onset_strength(y=y, sr=sr)
-
-        # Regularity: std deviation of beat intervals
-        if len(beats) > 1:
-            beat_intervals = np.diff(beats)
-            regularity = 1.0 - min(np.std(beat_intervals) / np.mean(beat_intervals), 1.0)
-        else:
-            regularity = 0.0
-
-        # Strength: average onset strength at beat locations
-        if len(beats) > 0:
-            beat_strengths = onset_env[beats]
-            strength = np.mean(beat_strengths) / (np.max(onset_env) + 1e-6)
-        else:
-            strength = 0.0
-
-        danceability = float((regularity + strength) / 2.0)
-
-        # 6. VALENCE (estimated from spectral features)
-        # Brighter, higher-frequency music tends to sound happier
-        spectral_centroid = librosa.feature.spectral_centroid(y=y, sr=sr)[0]
-
-        # Normalize centroid to 0-1 (using typical range)
-        # Typical range: 500-4000 Hz
-        mean_centroid = np.mean(spectral_centroid)
-        valence = float((mean_centroid - 500) / 3500)
-        valence = max(0.0, min(1.0, valence))  # Clamp to [0, 1]
+        tempo, beats = librosa.beat.beat_track(
+            onset_envelope=onset_env, sr=sr, hop_length=hop_length
+        )
+
+        # 2. KEY & MODE DETECTION (using chroma features)
+        # STFT chroma from the shared spectrogram: far cheaper than a CQT and
+        # accurate enough for argmax key and third-interval mode detection
+        chroma = librosa.feature.chroma_stft(S=S ** 2, sr=sr, n_fft=cls.N_FFT)
+
+        # Sum chroma across time
+        chroma_sum = chroma.sum(axis=1, dtype=np.float32)
+
+        # 3. ENERGY (RMS energy)
+        rms = librosa.feature.rms(S=S, frame_length=cls.N_FFT, hop_length=hop_length)[0]
+
+        # 4. VALENCE (estimated from spectral features)
+        spectral_centroid = librosa.feature.spectral_centroid(S=S, sr=sr, n_fft=cls.N_FFT)[0]
+
+        # Reduce the arrays to scalar features
+        key, mode, energy, danceability, valence = _reduce_features(
+            chroma_sum, onset_env, np.asarray(beats, dtype=np.int64), rms, spectral_centroid
+        )
 
         return {
             "tempo": float(tempo),
-            "key": key,
-            "mode": mode,
-            "energy": energy,
-            "danceability": danceability,
-            "valence": valence,
+            "key": int(key),
+            "mode": int(mode),
+            "energy": float(energy),
+            "danceability": float(danceability),
+            "valence": float(valence),
             "analysis_method": "librosa",
             "preview_based": True
         }
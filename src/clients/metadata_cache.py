@@ -0,0 +1,228 @@
+"""Persistent cache for Spotify track and artist metadata."""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Stay well below SQLite's bound-parameter limit for IN (...) queries
+_QUERY_CHUNK_SIZE = 500
+
+
+class MetadataCache:
+    """
+    SQLite-backed cache for raw Spotify track and artist objects.
+
+    Objects are stored as the JSON Spotify returned, so cached and fresh
+    results look the same. Tracks carry fields that change (popularity,
+    preview_url, available_markets), so they expire after track_ttl_hours;
+    artist metadata (genres, popularity) expires after artist_ttl_hours.
+
+    Whole responses of slow-changing endpoints (artist albums, related
+    artists) are kept in a separate table keyed by endpoint and arguments,
+    with a caller-chosen maximum age.
+    """
+
+    DB_FILENAME = "metadata.sqlite"
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        track_ttl_hours: int = 24,
+        artist_ttl_hours: int = 24
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            cache_dir: Directory to store the cache database. If None, uses ~/.spotify-mcp/metadata_cache
+            track_ttl_hours: Time-to-live in hours for track objects
+            artist_ttl_hours: Time-to-live in hours for artist objects
+        """
+        if cache_dir is None:
+            cache_dir = str(Path.home() / '.spotify-mcp' / 'metadata_cache')
+
+        self.cache_path = os.path.join(cache_dir, self.DB_FILENAME)
+        self._track_ttl_seconds = track_ttl_hours * 3600
+        self._artist_ttl_seconds = artist_ttl_hours * 3600
+
+        os.makedirs(cache_dir, exist_ok=True)
+
+        # One connection shared by threads, serialized with a lock
+        self._db_lock = threading.Lock()
+        self._conn = sqlite3.connect(self.cache_path, check_same_thread=False)
+        with self._db_lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            for table in ("tracks", "artists", "responses"):
+                self._conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} ("
+                    "id TEXT PRIMARY KEY, "
+                    "payload TEXT NOT NULL, "
+                    "fetched_ts REAL NOT NULL)"
+                )
+        logger.debug("Metadata cache initialized at: %s", self.cache_path)
+
+    def _select(self, sql: str, ids: List[str], min_ts: float = 0.0) -> list:
+        """Run an `id IN (...)` query over ids in chunks and return all rows."""
+        rows = []
+        for i in range(0, len(ids), _QUERY_CHUNK_SIZE):
+            chunk = ids[i:i + _QUERY_CHUNK_SIZE]
+            placeholders = ",".join("?" * len(chunk))
+            with self._db_lock:
+                rows.extend(self._conn.execute(
+                    sql.format(placeholders=placeholders), (*chunk, min_ts)
+                ).fetchall())
+        return rows
+
+    def _get(self, table: str, ids: Iterable[str], min_ts: float) -> Dict[str, Dict[str, Any]]:
+        """Load cached objects fetched at or after min_ts, keyed by ID."""
+        ids = list(dict.fromkeys(ids))
+        if not ids:
+            return {}
+
+        try:
+            rows = self._select(
+                f"SELECT id, payload FROM {table} "
+                "WHERE id IN ({placeholders}) AND fetched_ts >= ?",
+                ids,
+                min_ts
+            )
+        except sqlite3.Error as e:
+            logger.warning("Failed to read %s from metadata cache: %s", table, e)
+            return {}
+
+        objects = {}
+        for object_id, payload in rows:
+            try:
+                objects[object_id] = json.loads(payload)
+            except ValueError:
+                logger.warning("Ignoring corrupted %s cache entry: %s", table, object_id)
+        return objects
+
+    def _set(self, table: str, objects: List[Dict[str, Any]]) -> None:
+        """Store Spotify objects (rows keyed by their 'id')."""
+        if not objects:
+            return
+
+        now = time.time()
+        rows = [
+            (obj['id'], json.dumps(obj, separators=(',', ':')), now)
+            for obj in objects
+        ]
+        try:
+            with self._db_lock, self._conn:
+                self._conn.executemany(
+                    f"INSERT OR REPLACE INTO {table} (id, payload, fetched_ts) VALUES (?, ?, ?)",
+                    rows
+                )
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.warning("Failed to write %s to metadata cache: %s", table, e)
+
+    def cached_track_ids(self, track_ids: Iterable[str]) -> Set[str]:
+        """
+        Find which tracks are cached and unexpired, without loading their payloads.
+
+        Args:
+            track_ids: Spotify track IDs
+
+        Returns:
+            Set of the given IDs that have an unexpired cached track object
+        """
+        ids = list(dict.fromkeys(track_ids))
+        if not ids:
+            return set()
+
+        try:
+            rows = self._select(
+                "SELECT id FROM tracks WHERE id IN ({placeholders}) AND fetched_ts >= ?",
+                ids,
+                time.time() - self._track_ttl_seconds
+            )
+        except sqlite3.Error as e:
+            logger.warning("Failed to read tracks from metadata cache: %s", e)
+            return set()
+        return {row[0] for row in rows}
+
+    def get_tracks(self, track_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get cached track objects that have not expired.
+
+        Args:
+            track_ids: Spotify track IDs
+
+        Returns:
+            Dict of track ID -> raw Spotify track object (uncached or expired IDs omitted)
+        """
+        return self._get("tracks", track_ids, time.time() - self._track_ttl_seconds)
+
+    def set_tracks(self, tracks: List[Dict[str, Any]]) -> None:
+        """
+        Cache track objects.
+
+        Args:
+            tracks: Raw Spotify track objects
+        """
+        self._set("tracks", tracks)
+
+    def get_artists(self, artist_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get cached artist objects that have not expired.
+
+        Args:
+            artist_ids: Spotify artist IDs
+
+        Returns:
+            Dict of artist ID -> raw Spotify artist object (uncached or expired IDs omitted)
+        """
+        return self._get("artists", artist_ids, time.time() - self._artist_ttl_seconds)
+
+    def set_artists(self, artists: List[Dict[str, Any]]) -> None:
+        """
+        Cache artist objects.
+
+        Args:
+            artists: Raw Spotify artist objects
+        """
+        self._set("artists", artists)
+
+    def get_response(self, key: str, max_age: float) -> Optional[Any]:
+        """
+        Get a cached endpoint response.
+
+        Args:
+            key: Endpoint and arguments (e.g., "artist_albums:<id>:album:50:0")
+            max_age: Maximum age in seconds
+
+        Returns:
+            The cached response, or None if missing or older than max_age
+        """
+        return self._get("responses", [key], time.time() - max_age).get(key)
+
+    def set_response(self, key: str, response: Any) -> None:
+        """
+        Cache an endpoint response.
+
+        Args:
+            key: Endpoint and arguments
+            response: JSON-serializable Spotify response
+        """
+        try:
+            with self._db_lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses (id, payload, fetched_ts) VALUES (?, ?, ?)",
+                    (key, json.dumps(response, separators=(',', ':')), time.time())
+                )
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.warning("Failed to write response to metadata cache: %s", e)
+
+    def close(self) -> None:
+        """Close the cache database."""
+        with self._db_lock:
+            self._conn.close()
@@ -1,24 +1,42 @@
 """Spotify API client wrapper using spotipy."""
 
+import asyncio
 import os
+import random
+import re
+import sqlite3
 import sys
+import threading
 import time
+import requests
 import spotipy
+from requests.adapters import HTTPAdapter
 from spotipy.oauth2 import SpotifyOAuth
-from typing import Optional, List, Dict, Any, Callable
+from urllib3.util.retry import Retry
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict, Any, Callable, DefaultDict, Iterable, Iterator, Set, Tuple
+
+from .metadata_cache import MetadataCache
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Import new audio features service
 try:
-    import sys
-    import os
-    # Add src directory to path if not already present
-    src_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    if src_dir not in sys.path:
-        sys.path.insert(0, src_dir)
-
-    from features.service import AudioFeaturesService
-    from features.models import SpotifyTrack
-    from features.clients import GetSongBPMClient
+    try:
+        from ..features.service import AudioFeaturesService
+        from ..features.models import SpotifyTrack
+        from ..features.clients import GetSongBPMClient
+    except ImportError:
+        # Imported as top-level "clients" package (src/ on sys.path, as server.py does)
+        from features.service import AudioFeaturesService
+        from features.models import SpotifyTrack
+        from features.clients import GetSongBPMClient
     AUDIO_FEATURES_ENABLED = True
 except ImportError as e:
     AudioFeaturesService = None
@@ -28,8 +46,289 @@ except ImportError as e:
     print(f"⚠️  Audio features disabled: {e}", file=sys.stderr)
 
 
+def _join_artist_names(artists: List[Dict[str, Any]]) -> str:
+    """Join artist names into a display string (e.g., "Artist A, Artist B")."""
+    return ", ".join(artist['name'] for artist in artists)
+
+
+@dataclass(slots=True, frozen=True)
+class TrackSummary:
+    """Compact track record returned by the track-listing methods."""
+
+    id: str
+    name: str
+    artist: str
+    album: str
+    uri: str
+    url: str
+    duration_ms: Optional[int] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a plain dict (duration_ms only when known)."""
+        data = {
+            "id": self.id,
+            "name": self.name,
+            "artist": self.artist,
+            "album": self.album,
+            "uri": self.uri,
+            "url": self.url
+        }
+        if self.duration_ms is not None:
+            data["duration_ms"] = self.duration_ms
+        return data
+
+
+class TokenBucket:
+    """Thread-safe token bucket for proactive client-side rate limiting."""
+
+    def __init__(self, rate: float, capacity: int):
+        """
+        Initialize a full bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum tokens (burst size)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Take one token, blocking until one is available."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class _JSONResponse(requests.Response):
+    """Response whose json() parses the raw bytes with orjson when available."""
+
+    def json(self, **kwargs):
+        if orjson is not None and not kwargs and self.content:
+            return orjson.loads(self.content)
+        return super().json(**kwargs)
+
+
+@dataclass(slots=True)
+class _CachedResponse:
+    """Body and validators of a cached GET response."""
+
+    content: bytes
+    headers: Dict[str, str]
+    encoding: Optional[str]
+    etag: Optional[str]
+    fresh_until: float
+
+
+class ConditionalGetAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that revalidates repeated GETs instead of re-downloading them.
+
+    Successful GET responses carrying an ETag or a positive Cache-Control
+    max-age are kept per URL. While fresh they are served without a request;
+    afterwards the next GET sends If-None-Match and a 304 reuses the cached
+    body. Any non-GET request through the adapter (playlist edits, token
+    refreshes) clears the cache so the client never reads its own stale writes.
+
+    Responses are also built as _JSONResponse, so spotipy's response.json()
+    calls get orjson parsing when it is installed.
+    """
+
+    MAX_ENTRIES = 256
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._responses: "OrderedDict[str, _CachedResponse]" = OrderedDict()
+        self._responses_lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        """Send a request, answering GETs from the cache where possible."""
+        if request.method != "GET":
+            with self._responses_lock:
+                self._responses.clear()
+            return super().send(request, **kwargs)
+
+        with self._responses_lock:
+            cached = self._responses.get(request.url)
+        if cached is not None:
+            if time.monotonic() < cached.fresh_until:
+                return self._build_response(request, cached)
+            if cached.etag:
+                request.headers["If-None-Match"] = cached.etag
+
+        response = super().send(request, **kwargs)
+
+        if response.status_code == 304 and cached is not None:
+            response.close()
+            return self._build_response(request, cached)
+
+        if response.status_code == 200:
+            self._store(request.url, response)
+        return response
+
+    def build_response(self, req, resp):
+        """Build the response as a _JSONResponse (same state, faster json())."""
+        response = super().build_response(req, resp)
+        response.__class__ = _JSONResponse
+        return response
+
+    def _store(self, url: str, response: requests.Response) -> None:
+        """Cache a 200 response if it carries usable validators."""
+        cache_control = response.headers.get("Cache-Control", "")
+        if "no-store" in cache_control:
+            return
+
+        match = re.search(r"max-age=(\d+)", cache_control)
+        max_age = int(match.group(1)) if match else 0
+        etag = response.headers.get("ETag")
+        if not etag and max_age <= 0:
+            return
+
+        entry = _CachedResponse(
+            content=response.content,
+            headers=dict(response.headers),
+            encoding=response.encoding,
+            etag=etag,
+            fresh_until=time.monotonic() + max_age
+        )
+        with self._responses_lock:
+            self._responses[url] = entry
+            self._responses.move_to_end(url)
+            while len(self._responses) > self.MAX_ENTRIES:
+                self._responses.popitem(last=False)
+
+    @staticmethod
+    def _build_response(request, cached: _CachedResponse) -> requests.Response:
+        """Rebuild a 200 response from a cache entry."""
+        response = _JSONResponse()
+        response.status_code = 200
+        response.reason = "OK"
+        response.headers = requests.structures.CaseInsensitiveDict(cached.headers)
+        response._content = cached.content
+        response.encoding = cached.encoding
+        response.url = request.url
+        response.request = request
+        return response
+
+
+class CachedSpotifyOAuth(SpotifyOAuth):
+    """
+    SpotifyOAuth that keeps the current access token in memory.
+
+    spotipy asks the auth manager for a token before every API request, and
+    the stock implementation re-reads the token cache file each time. This
+    serves the token from memory until it is within TOKEN_REFRESH_MARGIN
+    seconds of expiry, then falls back to spotipy's cache/refresh path.
+    """
+
+    TOKEN_REFRESH_MARGIN = 60
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._mem_token: Optional[Dict[str, Any]] = None
+        self._mem_token_lock = threading.Lock()
+
+    def get_access_token(self, code=None, as_dict=True, check_cache=True):
+        """Get an access token, re-reading the cache only near expiry."""
+        if code is not None or not check_cache:
+            self._mem_token = None
+            return super().get_access_token(code=code, as_dict=as_dict, check_cache=check_cache)
+
+        with self._mem_token_lock:
+            token_info = self._mem_token
+            if token_info is None or token_info['expires_at'] - time.time() < self.TOKEN_REFRESH_MARGIN:
+                # Validates (and refreshes if needed) the cached token, or runs the auth flow
+                access_token = super().get_access_token(as_dict=False)
+                token_info = self.cache_handler.get_cached_token()
+                if not token_info or token_info.get('access_token') != access_token:
+                    # Token could not be read back from the cache; don't memoize it
+                    self._mem_token = None
+                    return token_info if as_dict else access_token
+                self._mem_token = token_info
+
+        return token_info if as_dict else token_info['access_token']
+
+    def token_expires_at(self) -> Optional[float]:
+        """Expiry (epoch seconds) of the current token, or None if there is none yet."""
+        token_info = self._mem_token or self.cache_handler.get_cached_token()
+        return token_info['expires_at'] if token_info else None
+
+    def refresh_now(self) -> Optional[float]:
+        """
+        Refresh the access token ahead of expiry.
+
+        Returns:
+            New expiry (epoch seconds), or None if there is no refresh token
+        """
+        with self._mem_token_lock:
+            token_info = self._mem_token or self.cache_handler.get_cached_token()
+            if not token_info or not token_info.get('refresh_token'):
+                return None
+            # spotipy saves the new token (keeping the refresh token) to the cache
+            self._mem_token = self.refresh_access_token(token_info['refresh_token'])
+            return self._mem_token['expires_at']
+
+
 class SpotifyClient:
     """Wrapper around spotipy for Spotify API interactions."""
+
+    # Client-side request budget (Spotify tolerates roughly 10 req/s)
+    REQUESTS_PER_SECOND = 10
+    MAX_CONCURRENT_REQUESTS = 2
+    MAX_ATTEMPTS = 3
+
+    # OAuth scopes requested at authorization time
+    SCOPE = (
+        "playlist-modify-public "
+        "playlist-modify-private "
+        "playlist-read-private "
+        "playlist-read-collaborative "
+        "user-library-read "
+        "user-top-read"
+    )
+
+    # Server-side projection of playlist_items pages down to the fields
+    # _track_summary reads (Spotify keeps it on the "next" URLs as well)
+    PLAYLIST_ITEM_FIELDS = (
+        "items(track(id,name,uri,artists(name),album(name),external_urls(spotify))),"
+        "next,total"
+    )
+
+    # Human-readable top-tracks time ranges (curated playlist descriptions)
+    TIME_RANGE_LABELS = {
+        "short_term": "last month",
+        "medium_term": "last 6 months",
+        "long_term": "all time"
+    }
+
+    # Transport-level retries for transient 5xx errors. Only urllib3's default
+    # idempotent methods are replayed: a 5xx on a POST (adding tracks,
+    # creating a playlist) may arrive after Spotify applied the write, and
+    # replaying it would add the tracks twice or create a second playlist
+    HTTP_RETRY = Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=[500, 502, 503, 504]
+    )
+
+    # Persisted related artists responses are reused this long
+    RESPONSE_CACHE_TTL = 24 * 3600  # seconds
+
+    # Artist albums pages change when a release drops, so they expire sooner
+    ARTIST_ALBUMS_CACHE_TTL = 3600  # seconds
+
+    # Artist metadata (genres, popularity) is stable over hours, but not forever
+    ARTIST_CACHE_TTL = 3600  # seconds
+    ARTIST_CACHE_MAX_SIZE = 10_000
     
     def __init__(
         self,
@@ -49,28 +348,55 @@ class SpotifyClient:
             cache_path: Path to store OAuth tokens
             getsongbpm_api_key: GetSongBPM API key (optional)
         """
-        self.scope = " ".join([
-            "playlist-modify-public",
-            "playlist-modify-private",
-            "playlist-read-private",
-            "playlist-read-collaborative",
-            "user-library-read",
-            "user-top-read",
-        ])
-
         # Detect if running in container (disable browser for Docker/glama.ai)
         in_container = os.path.exists('/.dockerenv') or os.getenv('GLAMA_VERSION')
 
-        self.auth_manager = SpotifyOAuth(
+        # Pooled keep-alive HTTP session shared by API calls and token refreshes;
+        # repeated GETs (e.g. the same playlist in stats/compare/merge) are
+        # revalidated with ETags instead of re-downloaded
+        self._session = requests.Session()
+        adapter = ConditionalGetAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=self.HTTP_RETRY
+        )
+        self._session.mount("https://", adapter)
+
+        self.auth_manager = CachedSpotifyOAuth(
             client_id=client_id,
             client_secret=client_secret,
             redirect_uri=redirect_uri,
-            scope=self.scope,
+            scope=self.SCOPE,
             cache_path=cache_path,
-            open_browser=not in_container  # Disable browser in containers
+            open_browser=not in_container,  # Disable browser in containers
+            requests_session=self._session
         )
 
         self.sp: Optional[spotipy.Spotify] = None
+        self._user_id: Optional[str] = None
+
+        # Pace requests before they are sent instead of only reacting to 429s
+        self._rate_limiter = TokenBucket(
+            rate=self.REQUESTS_PER_SECOND,
+            capacity=self.REQUESTS_PER_SECOND
+        )
+        self._concurrency = threading.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+
+        # After a 429, every thread holds off until Spotify's Retry-After passes
+        self._rate_limited_until = 0.0
+
+        # Artist metadata memo shared by playlist and artist logic:
+        # artist_id -> (expires_at, artist)
+        self._artist_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._artist_cache_lock = threading.Lock()
+
+        # Track/artist metadata persisted across runs (behind the memo above);
+        # an unwritable home or locked database only disables the cache
+        self._metadata_cache: Optional[MetadataCache] = None
+        try:
+            self._metadata_cache = MetadataCache()
+        except (OSError, sqlite3.Error) as e:
+            print(f"⚠️  Metadata cache disabled: {e}", file=sys.stderr)
 
         # Initialize audio features service (optional feature)
         if AUDIO_FEATURES_ENABLED:
@@ -90,14 +416,77 @@ class SpotifyClient:
     
     def authenticate(self) -> None:
         """Authenticate with Spotify. Opens browser on first run."""
-        self.sp = spotipy.Spotify(auth_manager=self.auth_manager)
+        self.sp = spotipy.Spotify(
+            auth_manager=self.auth_manager,
+            requests_session=self._session
+        )
         # Test the connection
         user = self.sp.me()
+        self._user_id = user['id']
         print(f"✅ Authenticated as: {user['display_name']} ({user['id']})")
 
+    def token_expires_at(self) -> Optional[float]:
+        """Expiry (epoch seconds) of the current access token, if authenticated."""
+        return self.auth_manager.token_expires_at()
+
+    def refresh_token(self) -> Optional[float]:
+        """
+        Refresh the OAuth access token now, instead of on the next API call.
+
+        Returns:
+            New expiry (epoch seconds), or None if no token could be refreshed
+        """
+        return self.auth_manager.refresh_now()
+
+    def _get_user_id(self) -> str:
+        """Get the current user's ID, fetched once and then memoized."""
+        if self._user_id is None:
+            self._user_id = self._with_retry(self.sp.me)['id']
+        return self._user_id
+
+    @staticmethod
+    def _track_summary(item: Dict[str, Any], duration_ms: Optional[int] = None) -> TrackSummary:
+        """
+        Build the compact track record returned by the track-listing methods.
+
+        Args:
+            item: Raw Spotify track object
+            duration_ms: Track length to include, if the caller wants it
+
+        Returns:
+            TrackSummary with id, name, artist, album, uri, and url
+        """
+        return TrackSummary(
+            id=item['id'],
+            name=item['name'],
+            artist=_join_artist_names(item['artists']),
+            album=item['album']['name'],
+            uri=item['uri'],
+            url=item['external_urls']['spotify'],
+            duration_ms=duration_ms
+        )
+
+    def close(self) -> None:
+        """Close the pooled HTTP session and the metadata cache."""
+        self._session.close()
+        if self._metadata_cache:
+            self._metadata_cache.close()
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP session and the audio features service."""
+        if self.audio_features_service:
+            await self.audio_features_service.aclose()
+        self.close()
+
     def _with_retry(self, fn: Callable, *args, **kwargs) -> Any:
         """
-        Execute Spotify API call with automatic retry on rate limit.
+        Execute Spotify API call with rate limiting and retry on rate limit.
+
+        Every call first takes a token from the client-wide token bucket and
+        a concurrency slot. On HTTP 429 the call is retried up to
+        MAX_ATTEMPTS times, waiting Retry-After plus exponential jitter; the
+        Retry-After window also pauses every other call on this client, so
+        concurrent batches don't keep hitting the limit.
 
         Args:
             fn: The Spotify API function to call
@@ -110,18 +499,30 @@ class SpotifyClient:
         Raises:
             spotipy.SpotifyException: For non-rate-limit errors
         """
-        try:
-            return fn(*args, **kwargs)
-        except spotipy.SpotifyException as e:
-            if e.http_status == 429:  # Rate limited
-                retry_after = int(e.headers.get("Retry-After", 1))
+        for attempt in range(self.MAX_ATTEMPTS):
+            pause = self._rate_limited_until - time.monotonic()
+            if pause > 0:
+                time.sleep(pause)
+
+            self._rate_limiter.acquire()
+            try:
+                with self._concurrency:
+                    return fn(*args, **kwargs)
+            except spotipy.SpotifyException as e:
+                # Re-raise non-rate-limit errors and the final failed attempt
+                if e.http_status != 429 or attempt == self.MAX_ATTEMPTS - 1:
+                    raise
+                retry_after = int((e.headers or {}).get("Retry-After", 1))
+                self._rate_limited_until = max(
+                    self._rate_limited_until,
+                    time.monotonic() + retry_after
+                )
+                delay = retry_after + random.uniform(0, 2 ** attempt)
                 print(
-                    f"⚠️  Rate limited. Waiting {retry_after} seconds...",
+                    f"⚠️  Rate limited. Waiting {delay:.1f} seconds...",
                     file=sys.stderr
                 )
-                time.sleep(retry_after)
-                return fn(*args, **kwargs)  # Single retry after waiting
-            raise  # Re-raise non-rate-limit errors
+                time.sleep(delay)
 
     def create_playlist(
         self,
@@ -143,8 +544,9 @@ class SpotifyClient:
         if not self.sp:
             raise RuntimeError("Not authenticated. Call authenticate() first.")
         
-        user_id = self.sp.me()['id']
-        playlist = self.sp.user_playlist_create(
+        user_id = self._get_user_id()
+        playlist = self._with_retry(
+            self.sp.user_playlist_create,
             user=user_id,
             name=name,
             description=description,
@@ -179,7 +581,8 @@ class SpotifyClient:
         if not self.sp:
             raise RuntimeError("Not authenticated. Call authenticate() first.")
 
-        # Spotify allows max 100 tracks per request
+        # Spotify allows max 100 tracks per request. Batches are sent
+        # serially: each one appends, so order must be preserved
         batch_size = 100
         tracks_added = 0
 
@@ -218,16 +621,23 @@ class SpotifyClient:
         try:
             # Spotify allows max 100 tracks per request for removal
             batch_size = 100
-            tracks_removed = 0
-
-            for i in range(0, len(track_uris), batch_size):
-                batch = track_uris[i:i + batch_size]
-                self._with_retry(
-                    self.sp.playlist_remove_all_occurrences_of_items,
-                    playlist_id,
-                    batch
-                )
-                tracks_removed += len(batch)
+            batches = [
+                track_uris[i:i + batch_size]
+                for i in range(0, len(track_uris), batch_size)
+            ]
+
+            # Removal is order-independent, so batches run concurrently
+            # (bounded by the client's rate limiter)
+            with ThreadPoolExecutor(max_workers=self.MAX_CONCURRENT_REQUESTS) as executor:
+                list(executor.map(
+                    lambda batch: self._with_retry(
+                        self.sp.playlist_remove_all_occurrences_of_items,
+                        playlist_id,
+                        batch
+                    ),
+                    batches
+                ))
+            tracks_removed = sum(len(batch) for batch in batches)
 
             return {
                 "success": True,
@@ -242,7 +652,7 @@ class SpotifyClient:
         self,
         query: str,
         limit: int = 20
-    ) -> List[Dict[str, Any]]:
+    ) -> List[TrackSummary]:
         """
         Search for tracks on Spotify.
         
@@ -251,26 +661,17 @@ class SpotifyClient:
             limit: Maximum number of results (1-50)
             
         Returns:
-            List of track dicts with id, name, artist, uri, and url
+            List of TrackSummary records with id, name, artist, album, uri, url, and duration_ms
         """
         if not self.sp:
             raise RuntimeError("Not authenticated. Call authenticate() first.")
         
-        results = self.sp.search(q=query, type='track', limit=min(limit, 50))
+        results = self._with_retry(self.sp.search, q=query, type='track', limit=min(limit, 50))
         
-        tracks = []
-        for item in results['tracks']['items']:
-            tracks.append({
-                "id": item['id'],
-                "name": item['name'],
-                "artist": ", ".join([artist['name'] for artist in item['artists']]),
-                "album": item['album']['name'],
-                "uri": item['uri'],
-                "url": item['external_urls']['spotify'],
-                "duration_ms": item['duration_ms']
-            })
-        
-        return tracks
+        return [
+            self._track_summary(item, duration_ms=item['duration_ms'])
+            for item in results['tracks']['items']
+        ]
     
     def get_user_playlists(self, limit: int = 50) -> List[Dict[str, Any]]:
         """
@@ -282,61 +683,448 @@ class SpotifyClient:
         Returns:
             List of playlist dicts with id, name, description, and url
         """
+        return list(islice(self.iter_user_playlists(page_size=min(limit, 50)), limit))
+
+    def iter_user_playlists(self, page_size: int = 50) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the current user's playlists, one page at a time.
+
+        The next page is only requested once the caller has consumed the
+        previous one, so a search that stops at the first match (e.g. with
+        next()) fetches no more pages than it needs.
+
+        Args:
+            page_size: Playlists per request (Spotify allows at most 50)
+
+        Returns:
+            Iterator of playlist dicts with id, name, description, and url
+        """
         if not self.sp:
             raise RuntimeError("Not authenticated. Call authenticate() first.")
-        
-        results = self.sp.current_user_playlists(limit=limit)
-        
-        playlists = []
-        for item in results['items']:
-            playlists.append({
-                "id": item['id'],
-                "name": item['name'],
-                "description": item['description'] or "",
-                "url": item['external_urls']['spotify'],
-                "tracks_total": item['tracks']['total'],
-                "public": item['public']
-            })
-        
-        return playlists
+
+        return self._iter_user_playlists(page_size)
+
+    def _iter_user_playlists(self, page_size: int) -> Iterator[Dict[str, Any]]:
+        """Yield playlist summaries page by page until Spotify reports no next page."""
+        offset = 0
+        while True:
+            results = self._with_retry(
+                self.sp.current_user_playlists, limit=page_size, offset=offset
+            )
+            for item in results['items']:
+                yield {
+                    "id": item['id'],
+                    "name": item['name'],
+                    "description": item['description'] or "",
+                    "url": item['external_urls']['spotify'],
+                    "tracks_total": item['tracks']['total'],
+                    "public": item['public']
+                }
+            if not results.get('next'):
+                return
+            offset += page_size
     
-    def get_playlist_tracks(self, playlist_id: str) -> List[Dict[str, Any]]:
+    def get_playlist(self, playlist_id: str, fields: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get a playlist's details.
+
+        Args:
+            playlist_id: Spotify playlist ID
+            fields: Spotify fields filter (e.g. "name,owner(display_name)").
+                Without it the response embeds the first 100 full track items.
+
+        Returns:
+            Raw Spotify playlist object (only the requested fields if given)
+        """
+        if not self.sp:
+            raise RuntimeError("Not authenticated. Call authenticate() first.")
+
+        return self._with_retry(self.sp.playlist, playlist_id, fields=fields)
+
+    def get_playlist_tracks(self, playlist_id: str) -> List[TrackSummary]:
         """
         Get all tracks from a playlist.
-        
+
+        The first page reveals the playlist size; the remaining pages are
+        then requested concurrently and spliced back together in order.
+
         Args:
             playlist_id: Spotify playlist ID
-            
+
         Returns:
-            List of track dicts
+            List of TrackSummary records
         """
         if not self.sp:
             raise RuntimeError("Not authenticated. Call authenticate() first.")
-        
+
+        page_size = 100
+
+        def fetch_page(offset: int) -> Dict[str, Any]:
+            return self._with_retry(
+                self.sp.playlist_items,
+                playlist_id,
+                fields=self.PLAYLIST_ITEM_FIELDS,
+                limit=page_size,
+                offset=offset
+            )
+
+        first_page = fetch_page(0)
+        tracks = self._tracks_from_playlist_page(first_page)
+
+        offsets = range(page_size, first_page['total'], page_size)
+        if offsets:
+            with ThreadPoolExecutor(max_workers=self.MAX_CONCURRENT_REQUESTS) as executor:
+                for page in executor.map(fetch_page, offsets):
+                    tracks.extend(self._tracks_from_playlist_page(page))
+
+        return tracks
+
+    async def get_playlist_tracks_async(
+        self,
+        playlist_id: str,
+        max_concurrency: int = 5
+    ) -> List[TrackSummary]:
+        """
+        Get all tracks from a playlist, fetching pages concurrently.
+
+        The first page reveals the playlist size; the remaining pages are
+        then requested in parallel and spliced back together in order.
+
+        Args:
+            playlist_id: Spotify playlist ID
+            max_concurrency: Maximum page requests in flight at once
+
+        Returns:
+            List of TrackSummary records (same as get_playlist_tracks)
+        """
+        if not self.sp:
+            raise RuntimeError("Not authenticated. Call authenticate() first.")
+
+        page_size = 100
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def fetch_page(offset: int) -> Dict[str, Any]:
+            async with semaphore:
+                return await asyncio.to_thread(
+                    self._with_retry,
+                    self.sp.playlist_items,
+                    playlist_id,
+                    fields=self.PLAYLIST_ITEM_FIELDS,
+                    limit=page_size,
+                    offset=offset
+                )
+
+        first_page = await fetch_page(0)
+        pages = [first_page]
+        pages.extend(await asyncio.gather(*(
+            fetch_page(offset)
+            for offset in range(page_size, first_page['total'], page_size)
+        )))
+
         tracks = []
-        results = self.sp.playlist_items(playlist_id)
-        
-        while results:
-            for item in results['items']:
-                if item['track']:  # Sometimes tracks can be null
-                    track = item['track']
-                    tracks.append({
-                        "id": track['id'],
-                        "name": track['name'],
-                        "artist": ", ".join([artist['name'] for artist in track['artists']]),
-                        "album": track['album']['name'],
-                        "uri": track['uri'],
-                        "url": track['external_urls']['spotify']
-                    })
-            
-            # Check if there are more results
-            if results['next']:
-                results = self.sp.next(results)
-            else:
-                break
-        
+        for page in pages:
+            tracks.extend(self._tracks_from_playlist_page(page))
         return tracks
+
+    @staticmethod
+    def _tracks_from_playlist_page(page: Dict[str, Any]) -> List[TrackSummary]:
+        """
+        Convert one page of playlist items into track records.
+
+        Args:
+            page: Paging object returned by playlist_items
+
+        Returns:
+            List of TrackSummary records (null tracks are skipped)
+        """
+        return [
+            SpotifyClient._track_summary(item['track'])
+            for item in page['items']
+            if item['track']  # Sometimes tracks can be null
+        ]
     
+    def get_tracks(self, track_ids: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Get full track metadata for many tracks.
+
+        Tracks are fetched in concurrent batches of 50 (the Spotify maximum).
+
+        Args:
+            track_ids: Spotify track IDs
+
+        Returns:
+            List of raw Spotify track objects in the same order as track_ids
+            (None for unknown IDs)
+        """
+        return list(self.iter_tracks(track_ids))
+
+    def iter_tracks(self, track_ids: List[str]) -> Iterator[Optional[Dict[str, Any]]]:
+        """
+        Stream full track metadata for many tracks, one batch at a time.
+
+        Like get_tracks(), but yields each batch's tracks as soon as it
+        arrives so callers aggregating over large playlists don't hold every
+        track object at once. Tracks in the persistent metadata cache are
+        served from it; only the rest are requested from Spotify (and then
+        cached).
+
+        Args:
+            track_ids: Spotify track IDs
+
+        Returns:
+            Iterator of raw Spotify track objects in the same order as
+            track_ids (None for unknown IDs)
+        """
+        if not self.sp:
+            raise RuntimeError("Not authenticated. Call authenticate() first.")
+
+        cached_ids = self._metadata_cache.cached_track_ids(track_ids) if self._metadata_cache else set()
+        return self._iter_tracks_cached(track_ids, cached_ids)
+
+    def _iter_tracks_cached(
+        self,
+        track_ids: List[str],
+        cached_ids: Set[str]
+    ) -> Iterator[Optional[Dict[str, Any]]]:
+        """Merge cached tracks with concurrently fetched ones, in track_ids order."""
+        missing = [tid for tid in track_ids if tid not in cached_ids]
+        fetched = self._iter_track_batches(
+            [missing[i:i + 50] for i in range(0, len(missing), 50)]
+        )
+
+        try:
+            for i in range(0, len(track_ids), 50):
+                batch = track_ids[i:i + 50]
+                stored = self._metadata_cache.get_tracks(tid for tid in batch if tid in cached_ids) if cached_ids else {}
+                fresh = []
+                for tid in batch:
+                    if tid in cached_ids:
+                        track = stored.get(tid)
+                        if track is None:
+                            # Expired since cached_track_ids() was checked
+                            track = self._with_retry(self.sp.track, tid)
+                            fresh.append(track)
+                    else:
+                        track = next(fetched)
+                        if track:
+                            fresh.append(track)
+                    yield track
+                if self._metadata_cache:
+                    self._metadata_cache.set_tracks(fresh)
+        finally:
+            fetched.close()
+
+    def _iter_track_batches(self, batches: List[List[str]]) -> Iterator[Optional[Dict[str, Any]]]:
+        """Fetch track batches concurrently, yielding them in order."""
+        with ThreadPoolExecutor(max_workers=self.MAX_CONCURRENT_REQUESTS) as executor:
+            for result in executor.map(lambda batch: self._with_retry(self.sp.tracks, batch), batches):
+                yield from result['tracks']
+
+    def get_artist(self, artist_id: str) -> Dict[str, Any]:
+        """
+        Get full artist metadata, memoized per client and in the metadata cache.
+
+        Args:
+            artist_id: Spotify artist ID
+
+        Returns:
+            Raw Spotify artist object
+        """
+        if not self.sp:
+            raise RuntimeError("Not authenticated. Call authenticate() first.")
+
+        artist = self._cached_artist(artist_id)
+        if artist is None:
+            if self._metadata_cache:
+                artist = self._metadata_cache.get_artists([artist_id]).get(artist_id)
+            if artist is None:
+                artist = self._with_retry(self.sp.artist, artist_id)
+                if self._metadata_cache:
+                    self._metadata_cache.set_artists([artist])
+            self._cache_artist(artist)
+        return artist
+
+    def get_artists(self, artist_ids: Iterable[str]) -> List[Dict[str, Any]]:
+        """
+        Get full artist metadata for many artists, memoized per client.
+
+        Artists not cached in memory or in the persistent metadata cache are
+        fetched in concurrent batches of 50 (the Spotify maximum) and stored
+        in both for later calls.
+
+        Args:
+            artist_ids: Spotify artist IDs (any iterable, e.g. a set)
+
+        Returns:
+            List of raw Spotify artist objects, one per unique ID in first-seen
+            order (unknown IDs are skipped)
+        """
+        if not self.sp:
+            raise RuntimeError("Not authenticated. Call authenticate() first.")
+
+        unique_ids = dict.fromkeys(artist_ids)
+        artists: Dict[str, Dict[str, Any]] = {}
+        missing = []
+        for aid in unique_ids:
+            artist = self._cached_artist(aid)
+            if artist is None:
+                missing.append(aid)
+            else:
+                artists[aid] = artist
+
+        # Then the persistent cache
+        if self._metadata_cache:
+            for aid, artist in self._metadata_cache.get_artists(missing).items():
+                artists[aid] = artist
+                self._cache_artist(artist)
+            missing = [aid for aid in missing if aid not in artists]
+
+        batches = [missing[i:i + 50] for i in range(0, len(missing), 50)]
+        fetched = []
+
+        # Batches are independent, so they run concurrently (bounded by the
+        # client's rate limiter); the cache is filled from this thread
+        with ThreadPoolExecutor(max_workers=self.MAX_CONCURRENT_REQUESTS) as executor:
+            for result in executor.map(lambda batch: self._with_retry(self.sp.artists, batch), batches):
+                for artist in result['artists']:
+                    if artist:
+                        artists[artist['id']] = artist
+                        self._cache_artist(artist)
+                        fetched.append(artist)
+        if self._metadata_cache:
+            self._metadata_cache.set_artists(fetched)
+
+        return [artists[aid] for aid in unique_ids if aid in artists]
+
+    def _cached_response(
+        self,
+        key: str,
+        max_age: float,
+        fn: Callable,
+        *args,
+        **kwargs
+    ) -> Any:
+        """Call fn through _with_retry, reusing a persisted response up to max_age seconds old."""
+        if not self._metadata_cache:
+            return self._with_retry(fn, *args, **kwargs)
+
+        response = self._metadata_cache.get_response(key, max_age)
+        if response is None:
+            response = self._with_retry(fn, *args, **kwargs)
+            self._metadata_cache.set_response(key, response)
+        return response
+
+    def _cached_artist(self, artist_id: str) -> Optional[Dict[str, Any]]:
+        """Return a cached artist object, or None if missing or expired."""
+        with self._artist_cache_lock:
+            entry = self._artist_cache.get(artist_id)
+            if entry is None:
+                return None
+            expires_at, artist = entry
+            if time.monotonic() >= expires_at:
+                del self._artist_cache[artist_id]
+                return None
+            return artist
+
+    def _cache_artist(self, artist: Dict[str, Any]) -> None:
+        """Store an artist object for ARTIST_CACHE_TTL seconds."""
+        with self._artist_cache_lock:
+            now = time.monotonic()
+            if len(self._artist_cache) >= self.ARTIST_CACHE_MAX_SIZE:
+                # Drop expired entries first, then the oldest insertions
+                self._artist_cache = {
+                    aid: entry for aid, entry in self._artist_cache.items()
+                    if entry[0] > now
+                }
+                while len(self._artist_cache) >= self.ARTIST_CACHE_MAX_SIZE:
+                    del self._artist_cache[next(iter(self._artist_cache))]
+            self._artist_cache[artist['id']] = (now + self.ARTIST_CACHE_TTL, artist)
+
+    def get_artist_albums(
+        self,
+        artist_id: str,
+        album_type: str,
+        limit: int = 50,
+        offset: int = 0
+    ) -> Dict[str, Any]:
+        """
+        Get one page of an artist's albums.
+
+        Args:
+            artist_id: Spotify artist ID
+            album_type: Album group (album, single, compilation, appears_on)
+            limit: Page size (max 50)
+            offset: Index of the first album to return
+
+        Returns:
+            Raw Spotify paging object of simplified albums
+        """
+        if not self.sp:
+            raise RuntimeError("Not authenticated. Call authenticate() first.")
+
+        limit = min(limit, 50)
+        return self._cached_response(
+            f"artist_albums:{artist_id}:{album_type}:{limit}:{offset}",
+            self.ARTIST_ALBUMS_CACHE_TTL,
+            self.sp.artist_albums,
+            artist_id,
+            album_type=album_type,
+            limit=limit,
+            offset=offset
+        )
+
+    def get_related_artists(self, artist_id: str) -> Dict[str, Any]:
+        """
+        Get artists similar to an artist.
+
+        Args:
+            artist_id: Spotify artist ID
+
+        Returns:
+            Raw Spotify response ({"artists": [...]})
+        """
+        if not self.sp:
+            raise RuntimeError("Not authenticated. Call authenticate() first.")
+
+        return self._cached_response(
+            f"related_artists:{artist_id}",
+            self.RESPONSE_CACHE_TTL,
+            self.sp.artist_related_artists,
+            artist_id
+        )
+
+    def get_artist_top_tracks(self, artist_id: str, country: str = 'US') -> Dict[str, Any]:
+        """
+        Get an artist's top tracks in a market.
+
+        Args:
+            artist_id: Spotify artist ID
+            country: ISO 3166-1 alpha-2 country code
+
+        Returns:
+            Raw Spotify response ({"tracks": [...]})
+        """
+        if not self.sp:
+            raise RuntimeError("Not authenticated. Call authenticate() first.")
+
+        return self._with_retry(self.sp.artist_top_tracks, artist_id, country=country)
+
+    def change_playlist_details(self, playlist_id: str, **changes: Any) -> None:
+        """
+        Change a playlist's details (name, public, collaborative, description).
+
+        Args:
+            playlist_id: Spotify playlist ID
+            **changes: Fields to change, as accepted by spotipy's playlist_change_details
+
+        Raises:
+            spotipy.SpotifyException: If Spotify rejects the change
+        """
+        if not self.sp:
+            raise RuntimeError("Not authenticated. Call authenticate() first.")
+
+        self._with_retry(self.sp.playlist_change_details, playlist_id, **changes)
+
     def get_recommendations(
         self,
         seed_tracks: Optional[List[str]] = None,
@@ -344,7 +1132,7 @@ class SpotifyClient:
         seed_genres: Optional[List[str]] = None,
         limit: int = 20,
         **kwargs
-    ) -> List[Dict[str, Any]]:
+    ) -> List[TrackSummary]:
         """
         Get track recommendations based on seeds.
 
@@ -356,7 +1144,7 @@ class SpotifyClient:
             **kwargs: Additional tunable attributes (e.g., target_energy=0.8)
 
         Returns:
-            List of recommended track dicts
+            List of recommended TrackSummary records
 
         Raises:
             RuntimeError: If not authenticated
@@ -373,7 +1161,8 @@ class SpotifyClient:
             )
 
         try:
-            results = self.sp.recommendations(
+            results = self._with_retry(
+                self.sp.recommendations,
                 seed_tracks=seed_tracks,
                 seed_artists=seed_artists,
                 seed_genres=seed_genres,
@@ -381,18 +1170,7 @@ class SpotifyClient:
                 **kwargs
             )
 
-            tracks = []
-            for item in results['tracks']:
-                tracks.append({
-                    "id": item['id'],
-                    "name": item['name'],
-                    "artist": ", ".join([artist['name'] for artist in item['artists']]),
-                    "album": item['album']['name'],
-                    "uri": item['uri'],
-                    "url": item['external_urls']['spotify']
-                })
-
-            return tracks
+            return [self._track_summary(item) for item in results['tracks']]
 
         except spotipy.SpotifyException as e:
             raise RuntimeError(f"Spotify API error: {e}")
@@ -421,31 +1199,29 @@ class SpotifyClient:
                     "total_tracks": 0
                 }
 
-            # Track seen combinations of (name, artist)
-            seen: Dict[tuple, List[Dict[str, Any]]] = {}
+            # Group tracks by normalized (name, artist); casefold gives
+            # Unicode-correct case-insensitive comparison
+            seen: DefaultDict[tuple, List[TrackSummary]] = defaultdict(list)
+            duplicate_count = 0
 
             for track in tracks:
-                # Create a normalized key (lowercase for case-insensitive comparison)
-                key = (track['name'].lower(), track['artist'].lower())
-
-                if key not in seen:
-                    seen[key] = []
-                seen[key].append(track)
+                track_list = seen[(track.name.casefold(), track.artist.casefold())]
+                if track_list:
+                    duplicate_count += 1  # Don't count the first occurrence
+                track_list.append(track)
 
             # Find duplicates (entries where we've seen the same track more than once)
-            duplicates = []
-            duplicate_count = 0
-
-            for key, track_list in seen.items():
-                if len(track_list) > 1:
-                    duplicate_count += len(track_list) - 1  # Don't count the first occurrence
-                    duplicates.append({
-                        "name": track_list[0]['name'],
-                        "artist": track_list[0]['artist'],
-                        "occurrences": len(track_list),
-                        "uris": [t['uri'] for t in track_list],
-                        "urls": [t['url'] for t in track_list]
-                    })
+            duplicates = [
+                {
+                    "name": track_list[0].name,
+                    "artist": track_list[0].artist,
+                    "occurrences": len(track_list),
+                    "uris": [t.uri for t in track_list],
+                    "urls": [t.url for t in track_list]
+                }
+                for track_list in seen.values()
+                if len(track_list) > 1
+            ]
 
             return {
                 "duplicate_count": duplicate_count,
@@ -460,7 +1236,7 @@ class SpotifyClient:
         self,
         limit: int = 20,
         time_range: str = "medium_term"
-    ) -> List[Dict[str, Any]]:
+    ) -> List[TrackSummary]:
         """
         Get user's top tracks based on listening history.
 
@@ -472,7 +1248,7 @@ class SpotifyClient:
                 - "long_term": all time
 
         Returns:
-            List of track dicts with id, name, artist, album, uri, and url
+            List of TrackSummary records with id, name, artist, album, uri, and url
 
         Raises:
             RuntimeError: If not authenticated
@@ -489,23 +1265,13 @@ class SpotifyClient:
             )
 
         try:
-            results = self.sp.current_user_top_tracks(
+            results = self._with_retry(
+                self.sp.current_user_top_tracks,
                 limit=min(limit, 50),
                 time_range=time_range
             )
 
-            tracks = []
-            for item in results['items']:
-                tracks.append({
-                    "id": item['id'],
-                    "name": item['name'],
-                    "artist": ", ".join([artist['name'] for artist in item['artists']]),
-                    "album": item['album']['name'],
-                    "uri": item['uri'],
-                    "url": item['external_urls']['spotify']
-                })
-
-            return tracks
+            return [self._track_summary(item) for item in results['items']]
 
         except spotipy.SpotifyException as e:
             raise RuntimeError(f"Spotify API error: {e}")
@@ -560,8 +1326,10 @@ class SpotifyClient:
             if not top_tracks:
                 raise RuntimeError("No top tracks found for user")
 
-            # Step 2: Get recommendations using top 5 tracks as seeds
-            seed_track_ids = [track['id'] for track in top_tracks[:5]]
+            # Step 2: Get recommendations using top 5 tracks as seeds. This must
+            # succeed before anything is created, so a failure (the endpoint is
+            # deprecated and unavailable to many apps) leaves no empty playlist
+            seed_track_ids = [track.id for track in top_tracks[:5]]
             recommendations = self.get_recommendations(
                 seed_tracks=seed_track_ids,
                 limit=num_recommendations
@@ -569,14 +1337,9 @@ class SpotifyClient:
 
             # Step 3: Create the playlist
             if not playlist_description:
-                time_labels = {
-                    "short_term": "last month",
-                    "medium_term": "last 6 months",
-                    "long_term": "all time"
-                }
                 playlist_description = (
                     f"Curated mix based on your top {num_top_tracks} tracks from "
-                    f"{time_labels.get(time_range, time_range)} plus "
+                    f"{self.TIME_RANGE_LABELS.get(time_range, time_range)} plus "
                     f"{num_recommendations} similar recommendations"
                 )
 
@@ -587,8 +1350,8 @@ class SpotifyClient:
             )
 
             # Step 4: Combine tracks and add to playlist
-            all_track_uris = [track['uri'] for track in top_tracks]
-            all_track_uris.extend([track['uri'] for track in recommendations])
+            all_track_uris = [track.uri for track in top_tracks]
+            all_track_uris.extend([track.uri for track in recommendations])
 
             add_result = self.add_tracks_to_playlist(
                 playlist_id=playlist_info['playlist_id'],
@@ -642,27 +1405,85 @@ class SpotifyClient:
 
         # Get track metadata from Spotify
         try:
-            track_data = self.sp.track(track_id)
+            # _with_retry blocks (rate limiting, retry sleeps), so keep it off the event loop
+            track_data = await asyncio.to_thread(self._with_retry, self.sp.track, track_id)
 
             # Build SpotifyTrack model
-            spotify_track = SpotifyTrack(
-                id=track_id,
-                name=track_data['name'],
-                artist=", ".join([artist['name'] for artist in track_data['artists']]),
-                duration_ms=track_data['duration_ms'],
-                isrc=track_data.get('external_ids', {}).get('isrc')
-            )
+            spotify_track = self._spotify_track(track_data)
 
             # Get features using the service
             features = await self.audio_features_service.get_features(spotify_track)
 
             if features:
                 # Convert pydantic model to dict for compatibility
-                return features.dict()
+                return features.model_dump()
             else:
                 return None
 
         except spotipy.SpotifyException as e:
             raise RuntimeError(f"Failed to get track {track_id}: {e}")
         except Exception as e:
-            raise RuntimeError(f"Failed to fetch audio features for {track_id}: {e}")
\ No newline at end of file
+            raise RuntimeError(f"Failed to fetch audio features for {track_id}: {e}")
+
+    async def get_tracks_audio_features(self, track_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Get audio features for many tracks at once (async).
+
+        Track metadata comes from the batched /tracks endpoint, and the
+        features service resolves ISRCs in batched MusicBrainz requests
+        before running the waterfall concurrently, instead of one full
+        lookup chain per track.
+
+        Args:
+            track_ids: Spotify track IDs
+
+        Returns:
+            One dict per known track, in track_ids order, with track_id, name,
+            artist, and features (dict, or None if unavailable). Unknown IDs
+            are left out.
+
+        Raises:
+            RuntimeError: If service not available or authentication fails
+        """
+        if not self.audio_features_service:
+            raise RuntimeError(
+                "Audio features service not available. Check dependencies."
+            )
+
+        if not self.sp:
+            raise RuntimeError("Not authenticated. Call authenticate() first.")
+
+        try:
+            tracks_data = await asyncio.to_thread(self.get_tracks, track_ids)
+        except spotipy.SpotifyException as e:
+            raise RuntimeError(f"Failed to get tracks: {e}")
+
+        spotify_tracks = [
+            self._spotify_track(track_data) for track_data in tracks_data if track_data
+        ]
+
+        try:
+            features_list = await self.audio_features_service.get_features_batch(spotify_tracks)
+        except Exception as e:
+            raise RuntimeError(f"Failed to fetch audio features: {e}")
+
+        return [
+            {
+                "track_id": track.id,
+                "name": track.name,
+                "artist": track.artist,
+                "features": features.model_dump() if features else None
+            }
+            for track, features in zip(spotify_tracks, features_list)
+        ]
+
+    @staticmethod
+    def _spotify_track(track_data: Dict[str, Any]) -> "SpotifyTrack":
+        """Build the features service's track model from a raw Spotify track."""
+        return SpotifyTrack(
+            id=track_data['id'],
+            name=track_data['name'],
+            artist=_join_artist_names(track_data['artists']),
+            duration_ms=track_data['duration_ms'],
+            isrc=track_data.get('external_ids', {}).get('isrc')
+        )
\ No newline at end of file
@@ -1,30 +1,54 @@
-"""Caching layer for audio features."""
+"""Caching layer for audio features and MusicBrainz lookups."""
 
+import asyncio
 import json
 import logging
 import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Optional
-from datetime import datetime, timedelta
+from typing import AsyncIterator, Dict, Optional, Tuple
+from datetime import datetime, timedelta, timezone
 
 from .models import AudioFeatures
 
 logger = logging.getLogger(__name__)
 
 
+def _features_to_bytes(features: AudioFeatures) -> bytes:
+    """Serialize features straight to JSON bytes with pydantic's serializer."""
+    return features.model_dump_json().encode('utf-8')
+
+
+def _to_timestamp(iso: str) -> float:
+    """Convert an ISO timestamp to epoch seconds, treating naive values as UTC."""
+    dt = datetime.fromisoformat(iso)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
 class FeatureCache:
     """
-    Simple file-based cache for audio features.
+    SQLite-backed cache for audio features.
 
-    Uses JSON files in a cache directory. Supports TTL for cache invalidation.
+    Stores one row per track in a single WAL-mode database inside the cache
+    directory. Supports TTL for cache invalidation.
+    Blocking database I/O runs in worker threads so the event loop is never
+    stalled, and operations on the same track are serialized by a per-track lock.
     """
 
+    DB_FILENAME = "features.sqlite"
+
     def __init__(self, cache_dir: Optional[str] = None, ttl_days: int = 30):
         """
         Initialize cache.
 
         Args:
-            cache_dir: Directory to store cache files. If None, uses ~/.spotify-mcp/feature_cache
+            cache_dir: Directory to store the cache database. If None, uses ~/.spotify-mcp/feature_cache
             ttl_days: Cache time-to-live in days
         """
         # Use home directory if no cache_dir provided
@@ -32,15 +56,55 @@ class FeatureCache:
             cache_dir = str(Path.home() / '.spotify-mcp' / 'feature_cache')
         
         self.cache_dir = cache_dir
+        self.cache_path = os.path.join(cache_dir, self.DB_FILENAME)
         self.ttl = timedelta(days=ttl_days)
-        
+        self._ttl_seconds = self.ttl.total_seconds()
+
+        # Per-track locks guarding concurrent read/write of the same entry,
+        # with the number of operations holding or waiting on each; a lock is
+        # dropped once its last user is done, so the map only holds tracks
+        # with operations in flight
+        self._locks: Dict[str, Tuple[asyncio.Lock, int]] = {}
+
         # Create cache directory (now using absolute path)
         os.makedirs(cache_dir, exist_ok=True)
-        logger.debug("Feature cache initialized at: %s", cache_dir)
 
-    def _get_cache_path(self, track_id: str) -> str:
-        """Get cache file path for track ID."""
-        return os.path.join(self.cache_dir, f"{track_id}.json")
+        # One connection shared by worker threads; sqlite3 connections are not
+        # safe for concurrent use, so access is serialized with a thread lock
+        self._db_lock = threading.Lock()
+        self._conn = sqlite3.connect(self.cache_path, check_same_thread=False)
+        with self._db_lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS features ("
+                "track_id TEXT PRIMARY KEY, "
+                "retrieved_at TEXT NOT NULL, "
+                "payload BLOB, "
+                "not_found INTEGER NOT NULL DEFAULT 0)"
+            )
+        logger.debug("Feature cache initialized at: %s", self.cache_path)
+
+    @asynccontextmanager
+    async def _locked(self, track_id: str) -> AsyncIterator[None]:
+        """Hold the lock serializing cache operations for a track."""
+        entry = self._locks.get(track_id)
+        lock = entry[0] if entry is not None else asyncio.Lock()
+        self._locks[track_id] = (lock, entry[1] + 1 if entry is not None else 1)
+        try:
+            async with lock:
+                yield
+        finally:
+            lock, users = self._locks[track_id]
+            if users > 1:
+                self._locks[track_id] = (lock, users - 1)
+            else:
+                del self._locks[track_id]
+
+    def _execute(self, sql: str, params: tuple = ()) -> list:
+        """Run a statement in its own transaction and return all rows."""
+        with self._db_lock, self._conn:
+            return self._conn.execute(sql, params).fetchall()
 
     async def get(self, track_id: str) -> Optional[AudioFeatures]:
         """
@@ -52,39 +116,46 @@ class FeatureCache:
         Returns:
             AudioFeatures if cached and valid, None otherwise
         """
-        cache_path = self._get_cache_path(track_id)
+        async with self._locked(track_id):
+            return await asyncio.to_thread(self._read, track_id)
 
-        if not os.path.exists(cache_path):
+    def _read(self, track_id: str) -> Optional[AudioFeatures]:
+        """Blocking implementation of get()."""
+        try:
+            # One query for the row; the TTL and negative marker are checked
+            # first so expired and negative entries never parse the payload
+            rows = self._execute(
+                "SELECT retrieved_at, not_found, payload FROM features WHERE track_id = ?",
+                (track_id,)
+            )
+        except sqlite3.Error as e:
+            logger.warning("Failed to read cache for track %s: %s", track_id, e)
             return None
 
-        try:
-            with open(cache_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+        if not rows:
+            return None
 
-            # Check if cache is still valid
-            retrieved_at = datetime.fromisoformat(data["retrieved_at"])
-            age = datetime.utcnow() - retrieved_at
+        retrieved_at, not_found, payload = rows[0]
 
-            if age > self.ttl:
+        try:
+            # Check if cache is still valid
+            if time.time() - _to_timestamp(retrieved_at) > self._ttl_seconds:
                 logger.debug("Cache expired for track: %s", track_id)
-                os.unlink(cache_path)
+                self._delete(track_id)
                 return None
 
             # Check for negative cache (no features found)
-            if data.get("_not_found"):
+            if not_found:
                 logger.debug("Negative cache hit for track: %s", track_id)
                 return None
 
             logger.debug("Cache hit for track: %s", track_id)
-            return AudioFeatures(**data)
+            return AudioFeatures.model_validate_json(payload)
 
-        except (json.JSONDecodeError, KeyError, ValueError, OSError) as e:
+        except (json.JSONDecodeError, KeyError, ValueError, TypeError) as e:
             logger.warning("Failed to read cache for track %s: %s", track_id, e)
-            # Clean up corrupted cache file
-            try:
-                os.unlink(cache_path)
-            except OSError:
-                pass
+            # Clean up corrupted cache entry
+            self._delete(track_id)
             return None
 
     async def set(self, track_id: str, features: Optional[AudioFeatures]) -> None:
@@ -95,28 +166,28 @@ class FeatureCache:
             track_id: Spotify track ID
             features: AudioFeatures object or None for negative cache
         """
-        cache_path = self._get_cache_path(track_id)
+        async with self._locked(track_id):
+            await asyncio.to_thread(self._write, track_id, features)
 
+    def _write(self, track_id: str, features: Optional[AudioFeatures]) -> None:
+        """Blocking implementation of set()."""
         try:
             if features is None:
                 # Negative cache: store marker that features not found
-                data = {
-                    "_not_found": True,
-                    "retrieved_at": datetime.utcnow().isoformat()
-                }
+                row = (track_id, datetime.now(timezone.utc).isoformat(), None, 1)
             else:
-                # Convert pydantic model to dict with datetime serialization
-                data = features.dict()
-                # Convert datetime to ISO format string
-                if "retrieved_at" in data and isinstance(data["retrieved_at"], datetime):
-                    data["retrieved_at"] = data["retrieved_at"].isoformat()
+                # Serialize pydantic model directly (datetimes become ISO strings)
+                row = (track_id, features.retrieved_at.isoformat(), _features_to_bytes(features), 0)
 
-            with open(cache_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
+            self._execute(
+                "INSERT OR REPLACE INTO features (track_id, retrieved_at, payload, not_found) "
+                "VALUES (?, ?, ?, ?)",
+                row
+            )
 
             logger.debug("Cached features for track: %s", track_id)
 
-        except (OSError, TypeError) as e:
+        except (sqlite3.Error, TypeError) as e:
             logger.warning("Failed to write cache for track %s: %s", track_id, e)
 
     async def clear(self, track_id: Optional[str] = None) -> None:
@@ -127,18 +198,170 @@ class FeatureCache:
             track_id: Track ID to clear, or None to clear all
         """
         if track_id:
-            cache_path = self._get_cache_path(track_id)
-            try:
-                os.unlink(cache_path)
-                logger.debug("Cleared cache for track: %s", track_id)
-            except OSError:
-                pass
+            async with self._locked(track_id):
+                await asyncio.to_thread(self._clear, track_id)
+        else:
+            await asyncio.to_thread(self._clear, None)
+
+    def _clear(self, track_id: Optional[str]) -> None:
+        """Blocking implementation of clear()."""
+        if track_id:
+            self._delete(track_id)
+            logger.debug("Cleared cache for track: %s", track_id)
         else:
-            # Clear all cache files
+            # Clear all cache entries
             try:
-                for filename in os.listdir(self.cache_dir):
-                    if filename.endswith('.json'):
-                        os.unlink(os.path.join(self.cache_dir, filename))
+                self._execute("DELETE FROM features")
                 logger.info("Cleared entire feature cache")
-            except OSError as e:
-                logger.warning("Failed to clear cache: %s", e)
\ No newline at end of file
+            except sqlite3.Error as e:
+                logger.warning("Failed to clear cache: %s", e)
+
+    def _delete(self, track_id: str) -> None:
+        """Delete a single cache entry, ignoring database errors."""
+        try:
+            self._execute("DELETE FROM features WHERE track_id = ?", (track_id,))
+        except sqlite3.Error:
+            pass
+
+    def close(self) -> None:
+        """Close the cache database."""
+        with self._db_lock:
+            self._conn.close()
+
+
+class MBIDCache:
+    """
+    Two-tier cache for MusicBrainz MBID lookups.
+
+    An in-memory LRU sits in front of a SQLite table, so lookups repeated in a
+    run skip the database and lookups repeated across runs skip MusicBrainz
+    (rate limited to 1 request/second). Misses are cached too, with a shorter
+    TTL, since new recordings get added to MusicBrainz over time.
+    """
+
+    DB_FILENAME = "mbid.sqlite"
+    MEMORY_CACHE_SIZE = 4096
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        ttl_days: int = 30,
+        negative_ttl_days: int = 7
+    ):
+        """
+        Initialize cache.
+
+        Args:
+            cache_dir: Directory to store the cache database. If None, uses ~/.spotify-mcp/feature_cache
+            ttl_days: Time-to-live in days for found MBIDs
+            negative_ttl_days: Time-to-live in days for lookups that found nothing
+        """
+        if cache_dir is None:
+            cache_dir = str(Path.home() / '.spotify-mcp' / 'feature_cache')
+
+        self.cache_path = os.path.join(cache_dir, self.DB_FILENAME)
+        self._ttl_seconds = timedelta(days=ttl_days).total_seconds()
+        self._negative_ttl_seconds = timedelta(days=negative_ttl_days).total_seconds()
+
+        # key -> (mbid or None, retrieved timestamp), most recently used last
+        self._memory: "OrderedDict[str, Tuple[Optional[str], float]]" = OrderedDict()
+
+        os.makedirs(cache_dir, exist_ok=True)
+
+        self._db_lock = threading.Lock()
+        self._conn = sqlite3.connect(self.cache_path, check_same_thread=False)
+        with self._db_lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS mbids ("
+                "key TEXT PRIMARY KEY, "
+                "mbid TEXT, "
+                "retrieved_ts REAL NOT NULL)"
+            )
+        logger.debug("MBID cache initialized at: %s", self.cache_path)
+
+    def _execute(self, sql: str, params: tuple = ()) -> list:
+        """Run a statement in its own transaction and return all rows."""
+        with self._db_lock, self._conn:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _is_fresh(self, mbid: Optional[str], retrieved_ts: float) -> bool:
+        """Check an entry against the positive or negative TTL."""
+        ttl = self._ttl_seconds if mbid else self._negative_ttl_seconds
+        return time.time() - retrieved_ts <= ttl
+
+    def _remember(self, key: str, mbid: Optional[str], retrieved_ts: float) -> None:
+        """Store an entry in the memory tier, evicting the least recently used."""
+        self._memory[key] = (mbid, retrieved_ts)
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.MEMORY_CACHE_SIZE:
+            self._memory.popitem(last=False)
+
+    async def get(self, key: str) -> Tuple[bool, Optional[str]]:
+        """
+        Get a cached lookup result.
+
+        Args:
+            key: Lookup key (e.g., "isrc:USRC17607839")
+
+        Returns:
+            (hit, mbid) tuple; mbid is None on a miss or a cached negative result
+        """
+        entry = self._memory.get(key)
+        if entry is not None:
+            if self._is_fresh(*entry):
+                self._memory.move_to_end(key)
+                return True, entry[0]
+            del self._memory[key]
+
+        entry = await asyncio.to_thread(self._read, key)
+        if entry is None:
+            return False, None
+
+        self._remember(key, *entry)
+        return True, entry[0]
+
+    def _read(self, key: str) -> Optional[Tuple[Optional[str], float]]:
+        """Blocking database lookup for get(); drops expired rows."""
+        try:
+            rows = self._execute("SELECT mbid, retrieved_ts FROM mbids WHERE key = ?", (key,))
+            if not rows:
+                return None
+
+            mbid, retrieved_ts = rows[0]
+            if not self._is_fresh(mbid, retrieved_ts):
+                self._execute("DELETE FROM mbids WHERE key = ?", (key,))
+                return None
+            return mbid, retrieved_ts
+
+        except sqlite3.Error as e:
+            logger.warning("Failed to read MBID cache for %s: %s", key, e)
+            return None
+
+    async def set(self, key: str, mbid: Optional[str]) -> None:
+        """
+        Cache a lookup result.
+
+        Args:
+            key: Lookup key
+            mbid: MBID found, or None to cache a negative result
+        """
+        retrieved_ts = time.time()
+        self._remember(key, mbid, retrieved_ts)
+        await asyncio.to_thread(self._write, key, mbid, retrieved_ts)
+
+    def _write(self, key: str, mbid: Optional[str], retrieved_ts: float) -> None:
+        """Blocking database write for set()."""
+        try:
+            self._execute(
+                "INSERT OR REPLACE INTO mbids (key, mbid, retrieved_ts) VALUES (?, ?, ?)",
+                (key, mbid, retrieved_ts)
+            )
+        except sqlite3.Error as e:
+            logger.warning("Failed to write MBID cache for %s: %s", key, e)
+
+    def close(self) -> None:
+        """Close the cache database."""
+        with self._db_lock:
+            self._conn.close()
@@ -0,0 +1,15 @@
+"""Note name to pitch class mapping shared by the feature source clients."""
+
+from types import MappingProxyType
+from typing import Mapping
+
+# Pitch classes (0-11) for note names, enharmonic spellings included
+KEY_MAP: Mapping[str, int] = MappingProxyType({
+    "C": 0, "C#": 1, "Db": 1,
+    "D": 2, "D#": 3, "Eb": 3,
+    "E": 4,
+    "F": 5, "F#": 6, "Gb": 6,
+    "G": 7, "G#": 8, "Ab": 8,
+    "A": 9, "A#": 10, "Bb": 10,
+    "B": 11
+})
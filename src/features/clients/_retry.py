@@ -0,0 +1,86 @@
+"""Minimal async retry loop and request pacing for the feature source HTTP requests."""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Rate limited or server-side failures worth another attempt
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+class RateLimiter:
+    """
+    Spaces out requests to one API, at most `rate` per second.
+
+    Each wait() claims the next free slot, so concurrent callers queue up
+    instead of bursting. Share one instance per API (e.g. as a class
+    attribute) so every client of that API draws from the same budget.
+    """
+
+    def __init__(self, rate: float):
+        """
+        Initialize limiter.
+
+        Args:
+            rate: Maximum requests per second
+        """
+        self._interval = 1.0 / rate
+        self._next_slot = 0.0
+
+    async def wait(self) -> None:
+        """Wait until the next request slot."""
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self._interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+async def retry_http(
+    fn: Callable[[], Awaitable[httpx.Response]],
+    *,
+    attempts: int = 3,
+    base: float = 2.0,
+    cap: float = 10.0,
+    limiter: Optional[RateLimiter] = None
+) -> httpx.Response:
+    """
+    Send a request, retrying transport errors and retryable status codes.
+
+    Only the request itself is retried, so a response body is never parsed
+    more than once. Waits grow exponentially (base, 2*base, ... up to cap).
+
+    Args:
+        fn: Zero-argument callable that sends the request (e.g. a lambda around client.get)
+        attempts: Maximum number of attempts
+        base: Wait in seconds after the first failed attempt
+        cap: Maximum wait in seconds
+        limiter: Rate limiter to wait on before every attempt (optional)
+
+    Returns:
+        The response of the last attempt (callers still check its status)
+
+    Raises:
+        httpx.HTTPError: If the final attempt fails with a transport error or timeout
+    """
+    for attempt in range(attempts):
+        last_attempt = attempt == attempts - 1
+        if limiter is not None:
+            await limiter.wait()
+        try:
+            response = await fn()
+        except httpx.HTTPError as e:
+            if last_attempt:
+                raise
+            logger.debug("Request failed (%r), retrying", e)
+        else:
+            if response.status_code not in RETRY_STATUS_CODES or last_attempt:
+                return response
+            logger.debug("Got HTTP %s, retrying", response.status_code)
+
+        await asyncio.sleep(min(cap, base * 2 ** attempt))
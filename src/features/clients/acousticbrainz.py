@@ -1,11 +1,14 @@
 """AcousticBrainz API client."""
 
+import asyncio
 import logging
-from typing import Optional
+from typing import Dict, List, Optional
 import httpx
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
 from ..models import AudioFeatures
+from ._keymap import KEY_MAP
+from ._retry import RateLimiter, retry_http
+from .http import get_client, parse_json
 
 logger = logging.getLogger(__name__)
 
@@ -15,12 +18,28 @@ class AcousticBrainzClient:
 
     BASE_URL = "https://acousticbrainz.org/api/v1"
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type((httpx.HTTPError, httpx.TimeoutException)),
-        reraise=True
-    )
+    # Low-level descriptors read by _map_to_audio_features; selecting them
+    # avoids downloading and parsing the full spectral feature tree
+    LOW_LEVEL_FEATURES = "rhythm.bpm;tonal.key_key;tonal.key_scale;lowlevel.average_loudness"
+
+    # Conservative pace shared by every instance, the same budget as
+    # MusicBrainz; a 429 still backs off through retry_http
+    RATE_LIMITER = RateLimiter(1.0)
+
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
+        """
+        Initialize AcousticBrainz client.
+
+        Args:
+            client: Shared httpx.AsyncClient (optional, defaults to the pooled
+                client for BASE_URL)
+        """
+        self._client = client
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the injected client, or the shared pooled client for BASE_URL."""
+        return self._client or get_client(self.BASE_URL)
+
     async def fetch(self, mbid: str) -> Optional[AudioFeatures]:
         """
         Fetch audio features from AcousticBrainz using MBID.
@@ -32,31 +51,82 @@ class AcousticBrainzClient:
             AudioFeatures if found, None otherwise
         """
         try:
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                logger.debug(f"Fetching from AcousticBrainz: {mbid}")
-                response = await client.get(f"{self.BASE_URL}/{mbid}/low-level")
-
-                if response.status_code == 404:
-                    logger.debug(f"No features found in AcousticBrainz for MBID: {mbid}")
-                    return None
+            client = self._get_client()
+            logger.debug("Fetching from AcousticBrainz: %s", mbid)
+            url = f"{self.BASE_URL}/{mbid}/low-level"
+            response = await retry_http(lambda: client.get(
+                url, params={"features": self.LOW_LEVEL_FEATURES}, timeout=15.0
+            ), limiter=self.RATE_LIMITER)
+
+            if response.status_code == 400:
+                # Feature selection rejected; fall back to the full document
+                logger.debug("AcousticBrainz rejected feature selection for MBID: %s", mbid)
+                response = await retry_http(
+                    lambda: client.get(url, timeout=15.0), limiter=self.RATE_LIMITER
+                )
+
+            if response.status_code == 404:
+                logger.debug("No features found in AcousticBrainz for MBID: %s", mbid)
+                return None
 
-                response.raise_for_status()
-                data = response.json()
+            response.raise_for_status()
+            data = parse_json(response)
 
-                return self._map_to_audio_features(data, mbid)
+            return self._map_to_audio_features(data, mbid)
 
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
                 return None
-            logger.error(f"HTTP error from AcousticBrainz: {e.response.status_code}")
+            logger.error("HTTP error from AcousticBrainz: %s", e.response.status_code)
             raise
         except httpx.TimeoutException:
-            logger.warning(f"Timeout fetching from AcousticBrainz for MBID: {mbid}")
+            logger.warning("Timeout fetching from AcousticBrainz for MBID: %s", mbid)
             raise
         except Exception:
-            logger.exception(f"Unexpected error in AcousticBrainzClient for MBID: {mbid}")
+            logger.exception("Unexpected error in AcousticBrainzClient for MBID: %s", mbid)
             return None
 
+    async def fetch_many(
+        self,
+        mbids: List[str],
+        max_concurrency: int = 4
+    ) -> Dict[str, Optional[AudioFeatures]]:
+        """
+        Fetch audio features for many MBIDs concurrently.
+
+        Requests are paced by the shared RATE_LIMITER; the concurrency bound
+        only limits how many are in flight while the slowest ones finish.
+
+        Args:
+            mbids: MusicBrainz Recording IDs
+            max_concurrency: Maximum requests in flight at once
+
+        Returns:
+            Dict mapping each MBID to its AudioFeatures (None if not found).
+            MBIDs whose request failed are left out.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def fetch_one(mbid: str) -> Optional[AudioFeatures]:
+            async with semaphore:
+                return await self.fetch(mbid)
+
+        unique_mbids = list(dict.fromkeys(mbids))
+        results = await asyncio.gather(
+            *(fetch_one(mbid) for mbid in unique_mbids),
+            return_exceptions=True
+        )
+
+        features_by_mbid: Dict[str, Optional[AudioFeatures]] = {}
+        for mbid, result in zip(unique_mbids, results):
+            if isinstance(result, Exception):
+                logger.warning("AcousticBrainz fetch failed for MBID %s: %s", mbid, result)
+            elif isinstance(result, BaseException):
+                raise result
+            else:
+                features_by_mbid[mbid] = result
+        return features_by_mbid
+
     def _map_to_audio_features(self, data: dict, mbid: str) -> Optional[AudioFeatures]:
         """
         Map AcousticBrainz response to AudioFeatures model.
@@ -73,7 +143,7 @@ class AcousticBrainzClient:
             # {
             #   "rhythm": { "bpm": 120.5, ... },
             #   "tonal": { "key_key": 9, "key_scale": "major", ... },
-            #   "lowlevel": { "spectral_centroid": {...}, ... },
+            #   "lowlevel": { "average_loudness": 0.93, ... },
             #   "metadata": { ... }
             # }
 
@@ -83,44 +153,27 @@ class AcousticBrainzClient:
 
             # Extract BPM
             tempo = None
-            if "bpm" in rhythm:
-                tempo = float(rhythm["bpm"])
+            if (bpm := rhythm.get("bpm")) is not None:
+                tempo = float(bpm)
 
             # Extract key and mode
             key = None
-            mode = None
-            if "key_key" in tonal:
-                key_value = tonal["key_key"]
+            if (key_value := tonal.get("key_key")) is not None:
                 # Handle both string and integer key values
                 if isinstance(key_value, str):
                     # Map note names to pitch class
-                    key_map = {
-                        "C": 0, "C#": 1, "Db": 1,
-                        "D": 2, "D#": 3, "Eb": 3,
-                        "E": 4,
-                        "F": 5, "F#": 6, "Gb": 6,
-                        "G": 7, "G#": 8, "Ab": 8,
-                        "A": 9, "A#": 10, "Bb": 10,
-                        "B": 11
-                    }
-                    key = key_map.get(key_value)
+                    key = KEY_MAP.get(key_value)
                 else:
                     key = int(key_value)
-            if "key_scale" in tonal:
-                mode = 1 if tonal["key_scale"] == "major" else 0
+            mode = None
+            if (key_scale := tonal.get("key_scale")) is not None:
+                mode = 1 if key_scale == "major" else 0
 
-            # Extract energy (estimate from RMS energy)
+            # Estimate energy from average loudness. Essentia reports it already
+            # normalized to [0, 1] (not dB), so it can't fill the dB loudness field.
             energy = None
-            if "average_loudness" in lowlevel:
-                # Normalize from dB scale (typically -60 to 0)
-                loudness_db = lowlevel["average_loudness"]
-                # Simple normalization: map [-60, 0] to [0, 1]
-                energy = max(0.0, min(1.0, (loudness_db + 60) / 60))
-
-            # Extract loudness
-            loudness = None
-            if "average_loudness" in lowlevel:
-                loudness = float(lowlevel["average_loudness"])
+            if (average_loudness := lowlevel.get("average_loudness")) is not None:
+                energy = max(0.0, min(1.0, float(average_loudness)))
 
             # Note: AcousticBrainz doesn't provide direct equivalents for
             # danceability, valence, acousticness, speechiness, etc.
@@ -131,11 +184,10 @@ class AcousticBrainzClient:
                 key=key,
                 mode=mode,
                 energy=energy,
-                loudness=loudness,
                 source="acousticbrainz",
                 source_track_id=mbid
             )
 
         except (KeyError, ValueError, TypeError) as e:
-            logger.warning(f"Failed to parse AcousticBrainz response for MBID {mbid}: {e}")
+            logger.warning("Failed to parse AcousticBrainz response for MBID %s: %s", mbid, e)
             return None
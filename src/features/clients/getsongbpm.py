@@ -1,35 +1,83 @@
 """GetSongBPM API client."""
 
 import logging
+from functools import lru_cache
 from typing import Optional
 import httpx
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
 from ..models import AudioFeatures, SpotifyTrack
+from ._keymap import KEY_MAP
+from ._retry import retry_http
+from .http import get_client, parse_json
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=128)
+def _parse_key(key_str: str) -> Optional[int]:
+    """
+    Parse key notation to pitch class integer.
+
+    Args:
+        key_str: Key notation (e.g., "C", "F#m", "Bbm")
+
+    Returns:
+        Pitch class integer (0-11) or None
+    """
+    if not key_str:
+        return None
+
+    # Remove 'm' for minor
+    key_str = key_str.replace("m", "").strip()
+
+    return KEY_MAP.get(key_str)
+
+
+@lru_cache(maxsize=128)
+def _parse_time_signature(time_sig_str: str) -> Optional[int]:
+    """
+    Parse time signature string to integer.
+
+    Args:
+        time_sig_str: Time signature (e.g., "4/4", "3/4")
+
+    Returns:
+        Numerator of time signature or None
+    """
+    if not time_sig_str:
+        return None
+
+    try:
+        numerator = time_sig_str.split("/")[0]
+        return int(numerator)
+    except (IndexError, ValueError):
+        return None
+
+
 class GetSongBPMClient:
     """Client for GetSongBPM API."""
 
     BASE_URL = "https://api.getsong.co"
 
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, client: Optional[httpx.AsyncClient] = None):
         """
         Initialize GetSongBPM client.
 
         Args:
             api_key: GetSongBPM API key
+            client: Shared httpx.AsyncClient (optional, defaults to the pooled
+                client for BASE_URL)
         """
         self.api_key = api_key
+        self._client = client
+
+        # Query parameters shared by every search request
+        self._base_params = {"api_key": api_key, "type": "both"}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the injected client, or the shared pooled client for BASE_URL."""
+        return self._client or get_client(self.BASE_URL)
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type((httpx.HTTPError, httpx.TimeoutException)),
-        reraise=True
-    )
     async def fetch(self, track: SpotifyTrack) -> Optional[AudioFeatures]:
         """
         Fetch audio features from GetSongBPM API.
@@ -42,47 +90,45 @@ class GetSongBPMClient:
         """
         try:
             # Use the search endpoint with correct parameters
-            params = {
-                "api_key": self.api_key,
-                "type": "both",
-                "lookup": f"song:{track.name} artist:{track.artist}"
-            }
+            params = {**self._base_params, "lookup": f"song:{track.name} artist:{track.artist}"}
 
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                logger.debug(f"Searching GetSongBPM: {track.name} by {track.artist}")
-                response = await client.get(f"{self.BASE_URL}/search/", params=params)
+            client = self._get_client()
+            logger.debug("Searching GetSongBPM: %s by %s", track.name, track.artist)
+            response = await retry_http(
+                lambda: client.get(f"{self.BASE_URL}/search/", params=params, timeout=10.0)
+            )
 
-                # 404 means not found in their database
-                if response.status_code == 404:
-                    logger.debug(f"Track not found in GetSongBPM: {track.id}")
-                    return None
+            # 404 means not found in their database
+            if response.status_code == 404:
+                logger.debug("Track not found in GetSongBPM: %s", track.id)
+                return None
 
-                response.raise_for_status()
-                data = response.json()
+            response.raise_for_status()
+            data = parse_json(response)
 
-                # Check if we have search results
-                search_results = data.get("search", [])
-                if not search_results or not isinstance(search_results, list) or len(search_results) == 0:
-                    logger.debug(f"No search results from GetSongBPM for: {track.id}")
-                    return None
+            # Check if we have search results
+            search_results = data.get("search", [])
+            if not search_results or not isinstance(search_results, list) or len(search_results) == 0:
+                logger.debug("No search results from GetSongBPM for: %s", track.id)
+                return None
 
-                # Use the first result (best match)
-                first_result = search_results[0]
-                logger.debug(f"Found match: {first_result.get('title')} (ID: {first_result.get('id')})")
+            # Use the first result (best match)
+            first_result = search_results[0]
+            logger.debug("Found match: %s (ID: %s)", first_result.get('title'), first_result.get('id'))
 
-                # Parse and map to our model
-                return self._map_to_audio_features({"song": first_result}, track.id)
+            # Parse and map to our model
+            return self._map_to_audio_features({"song": first_result}, track.id)
 
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
                 return None
-            logger.error(f"HTTP error from GetSongBPM: {e.response.status_code}")
+            logger.error("HTTP error from GetSongBPM: %s", e.response.status_code)
             raise
         except httpx.TimeoutException:
-            logger.warning(f"Timeout fetching from GetSongBPM for track: {track.id}")
+            logger.warning("Timeout fetching from GetSongBPM for track: %s", track.id)
             raise
         except Exception:
-            logger.exception(f"Unexpected error in GetSongBPMClient for track: {track.id}")
+            logger.exception("Unexpected error in GetSongBPMClient for track: %s", track.id)
             return None
 
     def _map_to_audio_features(self, data: dict, track_id: str) -> Optional[AudioFeatures]:
@@ -101,11 +147,11 @@ class GetSongBPMClient:
 
             # Map key notation to pitch class integer (0-11)
             key_str = song_data.get("key_of", "")
-            key_int = self._parse_key(key_str)
+            key_int = _parse_key(key_str)
 
             # Map time signature string to integer
             time_sig = song_data.get("time_sig", "")
-            time_sig_int = self._parse_time_signature(time_sig)
+            time_sig_int = _parse_time_signature(time_sig)
 
             return AudioFeatures(
                 tempo=float(song_data["tempo"]) if song_data.get("tempo") else None,
@@ -118,52 +164,5 @@ class GetSongBPMClient:
                 source_track_id=song_data.get("id")
             )
         except (KeyError, ValueError, TypeError) as e:
-            logger.warning(f"Failed to parse GetSongBPM response for track {track_id}: {e}")
-            return None
-
-    def _parse_key(self, key_str: str) -> Optional[int]:
-        """
-        Parse key notation to pitch class integer.
-
-        Args:
-            key_str: Key notation (e.g., "C", "F#m", "Bbm")
-
-        Returns:
-            Pitch class integer (0-11) or None
-        """
-        if not key_str:
-            return None
-
-        # Remove 'm' for minor
-        key_str = key_str.replace("m", "").strip()
-
-        key_map = {
-            "C": 0, "C#": 1, "Db": 1,
-            "D": 2, "D#": 3, "Eb": 3,
-            "E": 4,
-            "F": 5, "F#": 6, "Gb": 6,
-            "G": 7, "G#": 8, "Ab": 8,
-            "A": 9, "A#": 10, "Bb": 10,
-            "B": 11
-        }
-
-        return key_map.get(key_str)
-
-    def _parse_time_signature(self, time_sig_str: str) -> Optional[int]:
-        """
-        Parse time signature string to integer.
-
-        Args:
-            time_sig_str: Time signature (e.g., "4/4", "3/4")
-
-        Returns:
-            Numerator of time signature or None
-        """
-        if not time_sig_str:
-            return None
-
-        try:
-            numerator = time_sig_str.split("/")[0]
-            return int(numerator)
-        except (IndexError, ValueError):
+            logger.warning("Failed to parse GetSongBPM response for track %s: %s", track_id, e)
             return None
@@ -0,0 +1,66 @@
+"""Shared HTTP clients for the audio features sources."""
+
+import json
+import logging
+from typing import Any, Dict
+
+import httpx
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import h2  # noqa: F401  (enables httpx HTTP/2 support)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = httpx.Timeout(15.0, connect=5.0)
+DEFAULT_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+
+_clients: Dict[str, httpx.AsyncClient] = {}
+
+
+def get_client(base_url: str) -> httpx.AsyncClient:
+    """
+    Get the long-lived AsyncClient for a host, creating it on first use.
+
+    Reusing one client per base URL keeps connections alive across requests
+    instead of paying a TCP+TLS handshake per lookup.
+
+    Args:
+        base_url: API base URL (e.g., "https://musicbrainz.org/ws/2")
+
+    Returns:
+        Shared httpx.AsyncClient bound to base_url
+    """
+    client = _clients.get(base_url)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            base_url=base_url,
+            http2=HTTP2_AVAILABLE,
+            limits=DEFAULT_LIMITS,
+            timeout=DEFAULT_TIMEOUT
+        )
+        _clients[base_url] = client
+        logger.debug("Created shared HTTP client for %s (http2=%s)", base_url, HTTP2_AVAILABLE)
+    return client
+
+
+async def close_clients() -> None:
+    """Close all shared clients (call on shutdown)."""
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        await client.aclose()
+
+
+def parse_json(response: httpx.Response) -> Any:
+    """Parse a JSON response body straight from bytes (orjson if available)."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return json.loads(response.content)
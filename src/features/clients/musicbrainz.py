@@ -1,9 +1,12 @@
 """MusicBrainz API client for ISRC lookups."""
 
 import logging
-from typing import Optional
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
 import httpx
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+
+from ..cache import MBIDCache
+from ._retry import RateLimiter, retry_http
+from .http import get_client, parse_json
 
 logger = logging.getLogger(__name__)
 
@@ -14,12 +17,54 @@ class MusicBrainzClient:
     BASE_URL = "https://musicbrainz.org/ws/2"
     USER_AGENT = "SpotifyMCP/1.0 (https://github.com/yourusername/spotify-mcp)"
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type((httpx.HTTPError, httpx.TimeoutException)),
-        reraise=True
-    )
+    # ISRCs OR-ed together per batched search request
+    ISRC_BATCH_SIZE = 25
+
+    # MusicBrainz allows about one request per second per client; shared by
+    # every instance so concurrent lookups queue instead of drawing 503s
+    RATE_LIMITER = RateLimiter(1.0)
+
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        cache: Optional[MBIDCache] = None
+    ):
+        """
+        Initialize MusicBrainz client.
+
+        Args:
+            client: Shared httpx.AsyncClient (optional, defaults to the pooled
+                client for BASE_URL)
+            cache: MBID lookup cache (optional, lookups are uncached without it)
+        """
+        self._client = client
+        self.cache = cache
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the injected client, or the shared pooled client for BASE_URL."""
+        return self._client or get_client(self.BASE_URL)
+
+    async def _cached(
+        self,
+        key: str,
+        fetch: Callable[..., Awaitable[Optional[str]]],
+        *args
+    ) -> Optional[str]:
+        """Return a cached lookup result, or run fetch and cache its result."""
+        if self.cache is None:
+            return await fetch(*args)
+
+        hit, mbid = await self.cache.get(key)
+        if hit:
+            logger.debug("MBID cache hit for %s", key)
+            return mbid
+
+        # Errors propagate uncached; only answers from MusicBrainz (a match,
+        # no recordings or a 404) are stored
+        mbid = await fetch(*args)
+        await self.cache.set(key, mbid)
+        return mbid
+
     async def lookup_mbid_by_isrc(self, isrc: str) -> Optional[str]:
         """
         Lookup MusicBrainz Recording ID (MBID) using ISRC.
@@ -30,6 +75,86 @@ class MusicBrainzClient:
         Returns:
             MBID (MusicBrainz ID) if found, None otherwise
         """
+        return await self._cached(f"isrc:{isrc}", self._fetch_mbid_by_isrc, isrc)
+
+    async def cached_mbid_for_isrc(self, isrc: str) -> Tuple[bool, Optional[str]]:
+        """
+        Look up an ISRC in the MBID cache only, without querying MusicBrainz.
+
+        Args:
+            isrc: International Standard Recording Code
+
+        Returns:
+            (hit, mbid) tuple; mbid is None on a miss or a cached negative result
+        """
+        if self.cache is None:
+            return False, None
+        return await self.cache.get(f"isrc:{isrc}")
+
+    async def lookup_mbids_by_isrcs(self, isrcs: List[str]) -> Dict[str, Optional[str]]:
+        """
+        Lookup MBIDs for many ISRCs, ISRC_BATCH_SIZE codes per request.
+
+        Results are written to the cache, so later lookup_mbid_by_isrc calls
+        for the same codes are answered without a request.
+
+        Args:
+            isrcs: International Standard Recording Codes
+
+        Returns:
+            Dict mapping each ISRC to its MBID (None if not found)
+        """
+        results: Dict[str, Optional[str]] = {}
+        missing: List[str] = []
+
+        for isrc in dict.fromkeys(isrcs):  # De-duplicate, keep order
+            if self.cache is not None:
+                hit, mbid = await self.cache.get(f"isrc:{isrc}")
+                if hit:
+                    results[isrc] = mbid
+                    continue
+            missing.append(isrc)
+
+        # One request at a time (and paced by RATE_LIMITER)
+        for i in range(0, len(missing), self.ISRC_BATCH_SIZE):
+            chunk = missing[i:i + self.ISRC_BATCH_SIZE]
+            found, complete = await self._fetch_mbids_by_isrcs(chunk)
+
+            for isrc in chunk:
+                mbid = found.get(isrc)
+                results[isrc] = mbid
+                # A truncated result page can't prove an ISRC has no recording
+                if self.cache is not None and (mbid or complete):
+                    await self.cache.set(f"isrc:{isrc}", mbid)
+
+        return results
+
+    async def fuzzy_search_mbid(
+        self,
+        track_name: str,
+        artist_name: str,
+        duration_ms: Optional[int] = None
+    ) -> Optional[str]:
+        """
+        Fuzzy search for MBID using track and artist name.
+
+        Args:
+            track_name: Track name
+            artist_name: Artist name
+            duration_ms: Track duration in milliseconds (optional, for matching)
+
+        Returns:
+            MBID if found, None otherwise
+        """
+        # Bucket duration to the second so near-identical lengths share an entry
+        duration_bucket = duration_ms // 1000 if duration_ms else ""
+        key = f"fuzzy:{track_name.casefold()}|{artist_name.casefold()}|{duration_bucket}"
+        return await self._cached(
+            key, self._fetch_fuzzy_mbid, track_name, artist_name, duration_ms
+        )
+
+    async def _fetch_mbid_by_isrc(self, isrc: str) -> Optional[str]:
+        """Query MusicBrainz for an ISRC (uncached, retried)."""
         try:
             headers = {
                 "User-Agent": self.USER_AGENT,
@@ -41,66 +166,98 @@ class MusicBrainzClient:
                 "fmt": "json"
             }
 
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                logger.debug(f"Looking up MBID for ISRC: {isrc}")
-                response = await client.get(
-                    f"{self.BASE_URL}/recording/",
-                    params=params,
-                    headers=headers
-                )
-
-                if response.status_code == 404:
-                    logger.debug(f"No recording found for ISRC: {isrc}")
-                    return None
-
-                response.raise_for_status()
-                data = response.json()
-
-                # Extract first recording MBID from results
-                recordings = data.get("recordings", [])
-                if recordings and len(recordings) > 0:
-                    mbid = recordings[0].get("id")
-                    logger.debug(f"Found MBID {mbid} for ISRC {isrc}")
-                    return mbid
-
-                logger.debug(f"No recordings in response for ISRC: {isrc}")
+            client = self._get_client()
+            logger.debug("Looking up MBID for ISRC: %s", isrc)
+            response = await retry_http(lambda: client.get(
+                f"{self.BASE_URL}/recording/",
+                params=params,
+                headers=headers,
+                timeout=10.0
+            ), limiter=self.RATE_LIMITER)
+
+            if response.status_code == 404:
+                logger.debug("No recording found for ISRC: %s", isrc)
                 return None
 
+            response.raise_for_status()
+            data = parse_json(response)
+
+            # Extract first recording MBID from results
+            recordings = data.get("recordings", [])
+            if recordings and len(recordings) > 0:
+                mbid = recordings[0].get("id")
+                logger.debug("Found MBID %s for ISRC %s", mbid, isrc)
+                return mbid
+
+            logger.debug("No recordings in response for ISRC: %s", isrc)
+            return None
+
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
                 return None
-            logger.error(f"HTTP error from MusicBrainz: {e.response.status_code}")
+            logger.error("HTTP error from MusicBrainz: %s", e.response.status_code)
             raise
         except httpx.TimeoutException:
-            logger.warning(f"Timeout fetching from MusicBrainz for ISRC: {isrc}")
+            logger.warning("Timeout fetching from MusicBrainz for ISRC: %s", isrc)
             raise
         except Exception:
-            logger.exception(f"Unexpected error in MusicBrainzClient for ISRC: {isrc}")
-            return None
+            logger.exception("Unexpected error in MusicBrainzClient for ISRC: %s", isrc)
+            raise
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type((httpx.HTTPError, httpx.TimeoutException)),
-        reraise=True
-    )
-    async def fuzzy_search_mbid(
+    async def _fetch_mbids_by_isrcs(self, isrcs: List[str]) -> Tuple[Dict[str, str], bool]:
+        """
+        Query MusicBrainz for several ISRCs in one search (uncached, retried).
+
+        Returns:
+            (isrc -> MBID of the best-scoring recording, whether every match
+            fit in the response)
+        """
+        headers = {
+            "User-Agent": self.USER_AGENT,
+            "Accept": "application/json"
+        }
+
+        params = {
+            "query": " OR ".join(f"isrc:{isrc}" for isrc in isrcs),
+            "fmt": "json",
+            "limit": 100
+        }
+
+        client = self._get_client()
+        logger.debug("Looking up MBIDs for %s ISRCs", len(isrcs))
+        response = await retry_http(lambda: client.get(
+            f"{self.BASE_URL}/recording/",
+            params=params,
+            headers=headers,
+            timeout=10.0
+        ), limiter=self.RATE_LIMITER)
+
+        if response.status_code == 404:
+            return {}, True
+
+        response.raise_for_status()
+        data = parse_json(response)
+
+        wanted = set(isrcs)
+        found: Dict[str, str] = {}
+        recordings = data.get("recordings", [])
+
+        # Recordings come back best match first; keep the first one per ISRC
+        for recording in recordings:
+            for isrc in recording.get("isrcs", []):
+                if isrc in wanted and isrc not in found:
+                    found[isrc] = recording.get("id")
+
+        complete = data.get("count", len(recordings)) <= len(recordings)
+        return found, complete
+
+    async def _fetch_fuzzy_mbid(
         self,
         track_name: str,
         artist_name: str,
         duration_ms: Optional[int] = None
     ) -> Optional[str]:
-        """
-        Fuzzy search for MBID using track and artist name.
-
-        Args:
-            track_name: Track name
-            artist_name: Artist name
-            duration_ms: Track duration in milliseconds (optional, for matching)
-
-        Returns:
-            MBID if found, None otherwise
-        """
+        """Fuzzy search MusicBrainz by track and artist name (uncached, retried)."""
         try:
             headers = {
                 "User-Agent": self.USER_AGENT,
@@ -116,47 +273,48 @@ class MusicBrainzClient:
                 "limit": 5  # Get top 5 matches for comparison
             }
 
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                logger.debug(f"Fuzzy searching MBID for: {track_name} by {artist_name}")
-                response = await client.get(
-                    f"{self.BASE_URL}/recording/",
-                    params=params,
-                    headers=headers
-                )
-
-                if response.status_code == 404:
-                    logger.debug(f"No recording found for: {track_name}")
-                    return None
+            client = self._get_client()
+            logger.debug("Fuzzy searching MBID for: %s by %s", track_name, artist_name)
+            response = await retry_http(lambda: client.get(
+                f"{self.BASE_URL}/recording/",
+                params=params,
+                headers=headers,
+                timeout=10.0
+            ), limiter=self.RATE_LIMITER)
+
+            if response.status_code == 404:
+                logger.debug("No recording found for: %s", track_name)
+                return None
 
-                response.raise_for_status()
-                data = response.json()
+            response.raise_for_status()
+            data = parse_json(response)
 
-                recordings = data.get("recordings", [])
-                if not recordings:
-                    return None
+            recordings = data.get("recordings", [])
+            if not recordings:
+                return None
 
-                # If we have duration, try to find the best match
-                if duration_ms:
-                    best_match = self._find_best_duration_match(recordings, duration_ms)
-                    if best_match:
-                        return best_match.get("id")
+            # If we have duration, try to find the best match
+            if duration_ms:
+                best_match = self._find_best_duration_match(recordings, duration_ms)
+                if best_match:
+                    return best_match.get("id")
 
-                # Otherwise, return first result
-                mbid = recordings[0].get("id")
-                logger.debug(f"Found MBID {mbid} for {track_name}")
-                return mbid
+            # Otherwise, return first result
+            mbid = recordings[0].get("id")
+            logger.debug("Found MBID %s for %s", mbid, track_name)
+            return mbid
 
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
                 return None
-            logger.error(f"HTTP error from MusicBrainz: {e.response.status_code}")
+            logger.error("HTTP error from MusicBrainz: %s", e.response.status_code)
             raise
         except httpx.TimeoutException:
-            logger.warning(f"Timeout fuzzy searching MusicBrainz for: {track_name}")
+            logger.warning("Timeout fuzzy searching MusicBrainz for: %s", track_name)
             raise
         except Exception:
-            logger.exception(f"Unexpected error in fuzzy search for: {track_name}")
-            return None
+            logger.exception("Unexpected error in fuzzy search for: %s", track_name)
+            raise
 
     def _find_best_duration_match(
         self,
@@ -175,18 +333,13 @@ class MusicBrainzClient:
         Returns:
             Best matching recording or None
         """
-        best_match = None
-        min_diff = float('inf')
-
-        for recording in recordings:
-            # MusicBrainz duration is in milliseconds
-            mb_duration = recording.get("length")
-            if not mb_duration:
-                continue
-
-            diff = abs(mb_duration - target_duration_ms)
-            if diff < min_diff and diff <= tolerance_ms:
-                min_diff = diff
-                best_match = recording
-
+        # MusicBrainz duration is in milliseconds; first closest match wins ties
+        best_match = min(
+            (recording for recording in recordings if recording.get("length")),
+            key=lambda recording: abs(recording["length"] - target_duration_ms),
+            default=None
+        )
+
+        if best_match is None or abs(best_match["length"] - target_duration_ms) > tolerance_ms:
+            return None
         return best_match
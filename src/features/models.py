@@ -1,6 +1,6 @@
 """Data models for audio features."""
 
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional, Literal
 from pydantic import BaseModel, Field
 
@@ -33,13 +33,10 @@ class AudioFeatures(BaseModel):
     # Metadata
     source: Optional[str] = Field(None, description="Data source (e.g., 'getsongbpm', 'acousticbrainz')")
     source_track_id: Optional[str] = Field(None, description="Track ID from source (e.g., MBID)")
-    retrieved_at: datetime = Field(default_factory=datetime.utcnow, description="When features were retrieved")
-
-    class Config:
-        """Pydantic configuration."""
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
+    retrieved_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        description="When features were retrieved (UTC)"
+    )
 
 
 class SpotifyTrack(BaseModel):
@@ -1,14 +1,19 @@
 """Audio features service with multi-source waterfall logic."""
 
+import asyncio
 import logging
-from typing import Optional
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
 
 from .models import AudioFeatures, SpotifyTrack
-from .cache import FeatureCache
+from .cache import FeatureCache, MBIDCache
 from .clients import GetSongBPMClient, MusicBrainzClient, AcousticBrainzClient
+from .clients.http import close_clients
 
 logger = logging.getLogger(__name__)
 
+# A waterfall step: fetches features for a track, None if it has none
+FeatureSource = Callable[[SpotifyTrack], Awaitable[Optional[AudioFeatures]]]
+
 
 class AudioFeaturesService:
     """
@@ -38,14 +43,35 @@ class AudioFeaturesService:
             cache: Feature cache (optional)
         """
         self.getsongbpm = getsongbpm_client
-        self.musicbrainz = musicbrainz_client or MusicBrainzClient()
-        self.acousticbrainz = acousticbrainz_client or AcousticBrainzClient()
         self.cache = cache or FeatureCache()
+        self.musicbrainz = musicbrainz_client or MusicBrainzClient(
+            cache=MBIDCache(cache_dir=self.cache.cache_dir)
+        )
+        self.acousticbrainz = acousticbrainz_client or AcousticBrainzClient()
+
+        # Waterfall sources, bound once for the configured clients:
+        # GetSongBPM (fastest, pre-computed), then MusicBrainz + AcousticBrainz
+        self._sources: List[Tuple[str, FeatureSource]] = []
+        if self.getsongbpm:
+            self._sources.append(("GetSongBPM", self.getsongbpm.fetch))
+        self._sources.append(("AcousticBrainz", self._fetch_from_acousticbrainz))
+
+        # Waterfall runs in progress, so concurrent requests for a track share one
+        self._inflight: Dict[str, asyncio.Task] = {}
 
         # Log which clients are available
-        logger.info(f"AudioFeaturesService initialized with clients: "
-                   f"GetSongBPM={'enabled' if self.getsongbpm else 'disabled'}, "
-                   f"MusicBrainz=enabled, AcousticBrainz=enabled")
+        logger.info(
+            "AudioFeaturesService initialized with clients: "
+            "GetSongBPM=%s, MusicBrainz=enabled, AcousticBrainz=enabled",
+            'enabled' if self.getsongbpm else 'disabled'
+        )
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP clients and caches (call on shutdown)."""
+        await close_clients()
+        self.cache.close()
+        if self.musicbrainz.cache is not None:
+            self.musicbrainz.cache.close()
 
     async def get_features(self, track: SpotifyTrack) -> Optional[AudioFeatures]:
         """
@@ -57,40 +83,152 @@ class AudioFeaturesService:
         Returns:
             AudioFeatures if found, None otherwise
         """
-        logger.info(f"Fetching features for track: {track.id} - {track.name} by {track.artist}")
+        logger.info("Fetching features for track: %s - %s by %s", track.id, track.name, track.artist)
 
         # 1. Check cache
         cached = await self.cache.get(track.id)
         if cached is not None:
-            logger.info(f"Returning cached features for track: {track.id}")
+            logger.info("Returning cached features for track: %s", track.id)
             return cached
 
-        # 2. Try GetSongBPM (if available)
-        if self.getsongbpm:
+        # Join a fetch already running for this track instead of starting
+        # another. The fetch is its own task, shielded from every caller, so
+        # one cancelled caller doesn't cancel it for the others.
+        task = self._inflight.get(track.id)
+        if task is not None:
+            logger.debug("Joining in-flight fetch for track: %s", track.id)
+        else:
+            task = asyncio.create_task(self._fetch_features(track))
+            self._inflight[track.id] = task
+            task.add_done_callback(lambda done: self._forget_inflight(track.id, done))
+        return await asyncio.shield(task)
+
+    def _forget_inflight(self, track_id: str, task: asyncio.Task) -> None:
+        """Drop a finished fetch task (and retrieve its outcome)."""
+        if self._inflight.get(track_id) is task:
+            del self._inflight[track_id]
+        if not task.cancelled():
+            task.exception()  # Mark retrieved even if every caller was cancelled
+
+    async def _fetch_features(self, track: SpotifyTrack) -> Optional[AudioFeatures]:
+        """
+        Run the source waterfall for a cache miss and cache the outcome.
+
+        Args:
+            track: Spotify track information
+
+        Returns:
+            AudioFeatures if found, None otherwise
+        """
+        # 2-3. Try each configured source in order
+        failed = False
+        for source_name, fetch in self._sources:
             try:
-                features = await self.getsongbpm.fetch(track)
+                features = await fetch(track)
                 if features:
-                    logger.info(f"Found features from GetSongBPM for track: {track.id}")
+                    logger.info("Found features from %s for track: %s", source_name, track.id)
                     await self.cache.set(track.id, features)
                     return features
             except Exception as e:
-                logger.warning(f"GetSongBPM failed for track {track.id}: {e}")
-
-        # 3. Try MusicBrainz + AcousticBrainz
-        try:
-            features = await self._fetch_from_acousticbrainz(track)
-            if features:
-                logger.info(f"Found features from AcousticBrainz for track: {track.id}")
-                await self.cache.set(track.id, features)
-                return features
-        except Exception as e:
-            logger.warning(f"AcousticBrainz path failed for track {track.id}: {e}")
-
-        # 4. No features found - cache negative result
-        logger.warning(f"No audio features found for track: {track.id}")
-        await self.cache.set(track.id, None)
+                failed = True
+                logger.warning("%s failed for track %s: %s", source_name, track.id, e)
+
+        # 4. No features found - cache negative result, unless a source
+        # errored (the next call should retry it rather than trust a miss)
+        logger.warning("No audio features found for track: %s", track.id)
+        if not failed:
+            await self.cache.set(track.id, None)
         return None
 
+    async def get_features_batch(
+        self,
+        tracks: List[SpotifyTrack],
+        max_concurrency: int = 10
+    ) -> List[Optional[AudioFeatures]]:
+        """
+        Get audio features for many tracks.
+
+        ISRCs are resolved to MBIDs up front in batched MusicBrainz requests.
+        When GetSongBPM is not configured, AcousticBrainz is the first source,
+        so tracks with a resolved ISRC are fetched from it in one concurrent
+        stage. Every other track runs the normal waterfall concurrently (its
+        ISRC lookup is answered from the MBID cache).
+
+        Args:
+            tracks: Spotify track information
+            max_concurrency: Maximum tracks run through the waterfall at once
+
+        Returns:
+            AudioFeatures (or None) for each track, in the same order as tracks
+        """
+        results: Dict[str, Optional[AudioFeatures]] = {}
+
+        isrc_mbids: Dict[str, Optional[str]] = {}
+        isrcs = [track.isrc for track in tracks if track.isrc]
+        if isrcs:
+            try:
+                isrc_mbids = await self.musicbrainz.lookup_mbids_by_isrcs(isrcs)
+            except Exception as e:
+                # Per-track lookups below still run, just without the head start
+                logger.warning("Batched ISRC lookup failed: %s", e)
+
+        if not self.getsongbpm:
+            await self._fetch_batch_from_acousticbrainz(tracks, isrc_mbids, results)
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def fetch(track: SpotifyTrack) -> None:
+            async with semaphore:
+                results[track.id] = await self.get_features(track)
+
+        await asyncio.gather(*(fetch(track) for track in tracks if track.id not in results))
+        return [results[track.id] for track in tracks]
+
+    async def _fetch_batch_from_acousticbrainz(
+        self,
+        tracks: List[SpotifyTrack],
+        isrc_mbids: Dict[str, Optional[str]],
+        results: Dict[str, Optional[AudioFeatures]]
+    ) -> None:
+        """
+        Resolve tracks with a known ISRC MBID through one AcousticBrainz stage.
+
+        Args:
+            tracks: Spotify track information
+            isrc_mbids: ISRC -> MBID map from the batched MusicBrainz lookup
+            results: Track ID -> features map, filled in for every track settled
+                here (tracks whose fetch failed are left for the waterfall)
+        """
+        candidates = {track.id: track for track in tracks if isrc_mbids.get(track.isrc)}
+        if not candidates:
+            return
+
+        cached = await asyncio.gather(*(self.cache.get(track_id) for track_id in candidates))
+        pending = []
+        for track, features in zip(candidates.values(), cached):
+            if features is not None:
+                results[track.id] = features
+            else:
+                pending.append(track)
+
+        fetched = await self.acousticbrainz.fetch_many(
+            [isrc_mbids[track.isrc] for track in pending]
+        )
+
+        settled = [track for track in pending if isrc_mbids[track.isrc] in fetched]
+        for track in settled:
+            results[track.id] = fetched[isrc_mbids[track.isrc]]
+        # Misses get a negative entry, same as the waterfall would write
+        await asyncio.gather(*(self.cache.set(track.id, results[track.id]) for track in settled))
+
+    def _fuzzy_search_mbid(self, track: SpotifyTrack) -> Awaitable[Optional[str]]:
+        """Search MusicBrainz for a track's MBID by name, artist and duration."""
+        return self.musicbrainz.fuzzy_search_mbid(
+            track_name=track.name,
+            artist_name=track.artist,
+            duration_ms=track.duration_ms
+        )
+
     async def _fetch_from_acousticbrainz(self, track: SpotifyTrack) -> Optional[AudioFeatures]:
         """
         Fetch features from AcousticBrainz via MusicBrainz lookup.
@@ -101,27 +239,43 @@ class AudioFeaturesService:
         Returns:
             AudioFeatures if found, None otherwise
         """
-        # First, get MBID from MusicBrainz
-        mbid = None
-
-        # Try ISRC lookup first (most reliable)
+        # First, get MBID from MusicBrainz, preferring the ISRC (most reliable).
+        # A cached ISRC answer settles it without any request; otherwise the
+        # fuzzy search starts alongside the ISRC request so the fallback
+        # doesn't wait an extra round trip, and is cancelled if the ISRC wins.
+        isrc_hit, mbid = False, None
         if track.isrc:
-            logger.debug(f"Looking up MBID by ISRC: {track.isrc}")
-            mbid = await self.musicbrainz.lookup_mbid_by_isrc(track.isrc)
-
-        # Fallback to fuzzy search if ISRC lookup failed
-        if not mbid:
-            logger.debug(f"Fuzzy searching MBID for: {track.name} by {track.artist}")
-            mbid = await self.musicbrainz.fuzzy_search_mbid(
-                track_name=track.name,
-                artist_name=track.artist,
-                duration_ms=track.duration_ms
-            )
+            isrc_hit, mbid = await self.musicbrainz.cached_mbid_for_isrc(track.isrc)
+
+        if mbid:
+            logger.debug("Found cached MBID for ISRC: %s", track.isrc)
+        elif isrc_hit or not track.isrc:
+            logger.debug("Fuzzy searching MBID for: %s by %s", track.name, track.artist)
+            mbid = await self._fuzzy_search_mbid(track)
+        else:
+            fuzzy_task = asyncio.create_task(self._fuzzy_search_mbid(track))
+            try:
+                logger.debug("Looking up MBID by ISRC: %s", track.isrc)
+                try:
+                    mbid = await self.musicbrainz.lookup_mbid_by_isrc(track.isrc)
+                except Exception as e:
+                    logger.debug("ISRC lookup failed for %s: %s", track.isrc, e)
+
+                # Fallback to fuzzy search if ISRC lookup failed
+                if not mbid:
+                    logger.debug("Fuzzy searching MBID for: %s by %s", track.name, track.artist)
+                    mbid = await fuzzy_task
+            finally:
+                if not fuzzy_task.done():
+                    fuzzy_task.cancel()
+                # Retrieve the outcome (result, error or cancellation) so an
+                # unused fuzzy search never logs an unretrieved exception
+                await asyncio.gather(fuzzy_task, return_exceptions=True)
 
         # If we found an MBID, query AcousticBrainz
         if mbid:
-            logger.debug(f"Found MBID {mbid}, querying AcousticBrainz")
+            logger.debug("Found MBID %s, querying AcousticBrainz", mbid)
             return await self.acousticbrainz.fetch(mbid)
 
-        logger.debug(f"No MBID found for track: {track.id}")
+        logger.debug("No MBID found for track: %s", track.id)
         return None
@@ -1,11 +1,16 @@
 """Artist discovery and analysis business logic."""
 
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Optional
 
 
 class ArtistLogic:
     """Business logic for artist operations."""
 
+    # Parallel page requests in get_artist_discography (the client still
+    # enforces its own rate limit and concurrency cap)
+    MAX_PAGE_WORKERS = 5
+
     def __init__(self, spotify_client):
         """
         Initialize with Spotify client.
@@ -45,7 +50,7 @@ class ArtistLogic:
         if include_groups is None:
             include_groups = ['album', 'single', 'compilation']
 
-        artist = self.client.sp.artist(artist_id)
+        artist = self.client.get_artist(artist_id)
 
         results = {
             "artist_name": artist['name'],
@@ -55,34 +60,47 @@ class ArtistLogic:
             "followers": artist['followers']['total']
         }
 
-        # Get albums by group
+        # Get albums by group: first pages for every group concurrently (they
+        # reveal each group's total), then all remaining pages concurrently
+        page_size = min(limit, 50)
+        with ThreadPoolExecutor(max_workers=self.MAX_PAGE_WORKERS) as pool:
+            first_pages = list(pool.map(
+                lambda group: self.client.get_artist_albums(artist_id, group, limit=page_size),
+                include_groups
+            ))
+
+            page_requests = [
+                (group, offset)
+                for group, first_page in zip(include_groups, first_pages)
+                for offset in range(page_size, min(first_page['total'], limit), page_size)
+            ]
+            later_pages = list(pool.map(
+                lambda request: self.client.get_artist_albums(
+                    artist_id, request[0], limit=page_size, offset=request[1]
+                ),
+                page_requests
+            ))
+
+        pages_by_group: Dict[str, List[Dict[str, Any]]] = {
+            group: [first_page] for group, first_page in zip(include_groups, first_pages)
+        }
+        for (group, _), page in zip(page_requests, later_pages):
+            pages_by_group[group].append(page)  # Offsets were requested in order
+
         for group in include_groups:
-            albums = []
-            result = self.client.sp.artist_albums(
-                artist_id,
-                album_type=group,
-                limit=min(limit, 50)
-            )
-
-            while result:
-                for album in result['items']:
-                    albums.append({
-                        "name": album['name'],
-                        "release_date": album['release_date'],
-                        "total_tracks": album['total_tracks'],
-                        "album_type": album['album_type'],
-                        "id": album['id'],
-                        "uri": album['uri'],
-                        "url": album['external_urls']['spotify']
-                    })
-
-                # Pagination
-                if result['next'] and len(albums) < limit:
-                    result = self.client.sp.next(result)
-                else:
-                    break
-
-            results[f"{group}s"] = albums
+            results[f"{group}s"] = [
+                {
+                    "name": album['name'],
+                    "release_date": album['release_date'],
+                    "total_tracks": album['total_tracks'],
+                    "album_type": album['album_type'],
+                    "id": album['id'],
+                    "uri": album['uri'],
+                    "url": album['external_urls']['spotify']
+                }
+                for page in pages_by_group[group]
+                for album in page['items']
+            ]
 
         results['total_releases'] = sum(
             len(results.get(f"{group}s", []))
@@ -109,8 +127,8 @@ class ArtistLogic:
                 - related_artists: List of related artist details
                 - count: Number of related artists returned
         """
-        artist = self.client.sp.artist(artist_id)
-        related = self.client.sp.artist_related_artists(artist_id)
+        artist = self.client.get_artist(artist_id)
+        related = self.client.get_related_artists(artist_id)
 
         related_artists = []
         for related_artist in related['artists'][:limit]:
@@ -154,8 +172,8 @@ class ArtistLogic:
                 - tracks: List of top track dicts
                 - count: Number of tracks returned
         """
-        artist = self.client.sp.artist(artist_id)
-        result = self.client.sp.artist_top_tracks(artist_id, country=country)
+        artist = self.client.get_artist(artist_id)
+        result = self.client.get_artist_top_tracks(artist_id, country=country)
 
         tracks = []
         for track in result['tracks']:
@@ -1,12 +1,22 @@
 """Playlist intelligence business logic."""
 
-from typing import Dict, Any, List
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
 import sys
 
 
 class PlaylistLogic:
     """Business logic for playlist operations."""
 
+    # Parallel source playlist fetches in merge_playlists (the client still
+    # enforces its own rate limit and concurrency cap)
+    MAX_PLAYLIST_WORKERS = 5
+
+    # Playlist detail fields each method reads (skips the embedded track items)
+    STATS_PLAYLIST_FIELDS = "name,description,owner(display_name),public,collaborative"
+    NAME_PLAYLIST_FIELDS = "name"
+
     def __init__(self, spotify_client):
         """
         Initialize with Spotify client.
@@ -38,9 +48,13 @@ class PlaylistLogic:
                 - public: Whether playlist is public
                 - collaborative: Whether playlist is collaborative
         """
-        # Get playlist details and tracks
-        playlist = self.client.sp.playlist(playlist_id)
-        tracks = self.client.get_playlist_tracks(playlist_id)
+        # Get playlist details and tracks (details fetched alongside the track pages)
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            playlist_future = pool.submit(
+                self.client.get_playlist, playlist_id, self.STATS_PLAYLIST_FIELDS
+            )
+            tracks = self.client.get_playlist_tracks(playlist_id)
+            playlist = playlist_future.result()
 
         if not tracks:
             return {
@@ -52,56 +66,56 @@ class PlaylistLogic:
             }
 
         # Collect track IDs for batch fetching
-        track_ids = [track['uri'].split(':')[-1] for track in tracks]
+        track_ids = [track.uri.rpartition(':')[2] for track in tracks]
 
-        # Batch fetch track details (50 per call)
-        all_track_details = []
-        for i in range(0, len(track_ids), 50):
-            batch = track_ids[i:i+50]
-            track_details = self.client.sp.tracks(batch)['tracks']
-            all_track_details.extend(track_details)
+        # Stream track details (50 per call, batches run concurrently) so the
+        # stats below are aggregated without holding every track object
+        track_details = self.client.iter_tracks(track_ids)
 
-        # Calculate stats
+        # Calculate stats and collect unique artist IDs (for genre analysis)
+        # in a single pass
         total_duration_ms = 0
-        release_years = []
-        earliest_track = None
-        newest_track = None
+        release_year_total = 0
+        release_year_count = 0
+        earliest_detail = None
+        newest_detail = None
         earliest_date = None
         newest_date = None
+        artist_ids = set()
 
-        for track_detail in all_track_details:
+        for track_detail in track_details:
             if track_detail:
                 total_duration_ms += track_detail['duration_ms']
 
+                for artist in track_detail['artists']:
+                    artist_ids.add(artist['id'])
+
                 # Track release years
                 release_date = track_detail['album']['release_date']
                 try:
-                    year = int(release_date.split('-')[0])
-                    release_years.append(year)
-
-                    # Track earliest and newest
-                    if earliest_date is None or release_date < earliest_date:
-                        earliest_date = release_date
-                        earliest_track = {
-                            'name': track_detail['name'],
-                            'artist': ', '.join([a['name'] for a in track_detail['artists']]),
-                            'release_date': release_date
-                        }
-
-                    if newest_date is None or release_date > newest_date:
-                        newest_date = release_date
-                        newest_track = {
-                            'name': track_detail['name'],
-                            'artist': ', '.join([a['name'] for a in track_detail['artists']]),
-                            'release_date': release_date
-                        }
-                except (ValueError, IndexError):
+                    year = int(release_date[:4])
+                    release_year_total += year
+                    release_year_count += 1
+
+                    # Release dates come as YYYY, YYYY-MM or YYYY-MM-DD; pad
+                    # to full dates so mixed precisions compare consistently
+                    sort_date = release_date + '-01-01'[len(release_date) - 4:]
+
+                    # Track earliest and newest (summaries are built once,
+                    # after the loop, for the final winners only)
+                    if earliest_date is None or sort_date < earliest_date:
+                        earliest_date = sort_date
+                        earliest_detail = track_detail
+
+                    if newest_date is None or sort_date > newest_date:
+                        newest_date = sort_date
+                        newest_detail = track_detail
+                except ValueError:
                     pass
 
         # Format duration
-        hours = total_duration_ms // (1000 * 60 * 60)
-        minutes = (total_duration_ms // (1000 * 60)) % 60
-        seconds = (total_duration_ms // 1000) % 60
+        minutes, seconds = divmod(total_duration_ms // 1000, 60)
+        hours, minutes = divmod(minutes, 60)
 
         if hours > 0:
             duration_formatted = f"{hours}h {minutes}m {seconds}s"
@@ -109,30 +123,16 @@ class PlaylistLogic:
             duration_formatted = f"{minutes}m {seconds}s"
 
         # Calculate average year
-        avg_year = sum(release_years) / len(release_years) if release_years else 0
+        avg_year = release_year_total / release_year_count if release_year_count else 0
 
-        # Collect unique artist IDs for genre analysis
-        artist_ids = set()
-        for track_detail in all_track_details:
-            if track_detail:
-                for artist in track_detail['artists']:
-                    artist_ids.add(artist['id'])
-
-        # Batch fetch artist genres (50 per call)
-        genre_counts: Dict[str, int] = {}
-        artist_ids_list = list(artist_ids)
+        # Batch fetch artist genres (50 per call, concurrent, memoized by the client)
+        genre_counts: Counter = Counter()
 
-        for i in range(0, len(artist_ids_list), 50):
-            batch = artist_ids_list[i:i+50]
-            artists = self.client.sp.artists(batch)['artists']
+        for artist in self.client.get_artists(artist_ids):
+            genre_counts.update(artist['genres'])
 
-            for artist in artists:
-                if artist and artist['genres']:
-                    for genre in artist['genres']:
-                        genre_counts[genre] = genre_counts.get(genre, 0) + 1
-
-        # Sort genres by count and get top 10
-        top_genres = sorted(genre_counts.items(), key=lambda x: x[1], reverse=True)[:10]
+        # Top 10 genres by count
+        top_genres = genre_counts.most_common(10)
 
         return {
             "playlist_name": playlist['name'],
@@ -142,13 +142,24 @@ class PlaylistLogic:
             "total_duration_formatted": duration_formatted,
             "avg_release_year": round(avg_year, 1) if avg_year else None,
             "genre_breakdown": dict(top_genres),
-            "earliest_track": earliest_track,
-            "newest_track": newest_track,
+            "earliest_track": self._release_summary(earliest_detail),
+            "newest_track": self._release_summary(newest_detail),
             "owner": playlist['owner']['display_name'],
             "public": playlist['public'],
             "collaborative": playlist['collaborative']
         }
 
+    @staticmethod
+    def _release_summary(track_detail: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Build the earliest/newest track entry for get_playlist_stats."""
+        if track_detail is None:
+            return None
+        return {
+            'name': track_detail['name'],
+            'artist': ', '.join([a['name'] for a in track_detail['artists']]),
+            'release_date': track_detail['album']['release_date']
+        }
+
     def merge_playlists(
         self,
         playlist_ids: List[str],
@@ -176,38 +187,42 @@ class PlaylistLogic:
                 - duplicates_removed: Number of duplicates removed (if applicable)
                 - source_playlists: Info about source playlists
         """
-        # Get all tracks from all playlists
+        # Get all tracks from all playlists, removing duplicates per source
+        # playlist as they are collected if requested
         all_tracks = []
         source_playlist_info = []
+        seen_uris = set()
+        duplicates_removed = 0
 
-        for playlist_id in playlist_ids:
-            playlist = self.client.sp.playlist(playlist_id)
-            tracks = self.client.get_playlist_tracks(playlist_id)
-
+        # Source playlists are independent, so fetch their details and tracks
+        # concurrently; results are consumed in the original order
+        with ThreadPoolExecutor(max_workers=self.MAX_PLAYLIST_WORKERS) as pool:
+            playlists = pool.map(
+                lambda pid: self.client.get_playlist(pid, self.NAME_PLAYLIST_FIELDS),
+                playlist_ids
+            )
+            playlist_tracks = pool.map(self.client.get_playlist_tracks, playlist_ids)
+            sources = list(zip(playlists, playlist_tracks))
+
+        for playlist, tracks in sources:
             source_playlist_info.append({
                 "name": playlist['name'],
                 "track_count": len(tracks)
             })
 
-            all_tracks.extend(tracks)
+            if not remove_duplicates:
+                all_tracks.extend(tracks)
+                continue
 
-        if not all_tracks:
-            raise RuntimeError("No tracks found in source playlists")
-
-        # Remove duplicates if requested
-        duplicates_removed = 0
-        if remove_duplicates:
-            seen_uris = set()
-            unique_tracks = []
-
-            for track in all_tracks:
-                if track['uri'] not in seen_uris:
-                    seen_uris.add(track['uri'])
-                    unique_tracks.append(track)
+            for track in tracks:
+                if track.uri not in seen_uris:
+                    seen_uris.add(track.uri)
+                    all_tracks.append(track)
                 else:
                     duplicates_removed += 1
 
-            all_tracks = unique_tracks
+        if not all_tracks:
+            raise RuntimeError("No tracks found in source playlists")
 
         # Create new playlist
         if not description:
@@ -221,7 +236,7 @@ class PlaylistLogic:
         )
 
         # Add tracks to new playlist
-        track_uris = [track['uri'] for track in all_tracks]
+        track_uris = [track.uri for track in all_tracks]
         add_result = self.client.add_tracks_to_playlist(
             playlist_id=new_playlist['playlist_id'],
             track_uris=track_uris
@@ -259,21 +274,26 @@ class PlaylistLogic:
                 - unique_1_count: Number unique to playlist 1
                 - unique_2_count: Number unique to playlist 2
         """
-        # Get both playlists
-        playlist_1 = self.client.sp.playlist(playlist_id_1)
-        playlist_2 = self.client.sp.playlist(playlist_id_2)
-
-        tracks_1 = self.client.get_playlist_tracks(playlist_id_1)
-        tracks_2 = self.client.get_playlist_tracks(playlist_id_2)
-
-        # Create sets of URIs
-        uris_1 = {track['uri']: track for track in tracks_1}
-        uris_2 = {track['uri']: track for track in tracks_2}
+        # Get both playlists and their tracks (four independent requests)
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            playlist_1 = pool.submit(self.client.get_playlist, playlist_id_1, self.NAME_PLAYLIST_FIELDS)
+            playlist_2 = pool.submit(self.client.get_playlist, playlist_id_2, self.NAME_PLAYLIST_FIELDS)
+            tracks_1 = pool.submit(self.client.get_playlist_tracks, playlist_id_1)
+            tracks_2 = pool.submit(self.client.get_playlist_tracks, playlist_id_2)
+
+            playlist_1 = playlist_1.result()
+            playlist_2 = playlist_2.result()
+            tracks_1 = tracks_1.result()
+            tracks_2 = tracks_2.result()
+
+        # Map URIs to tracks (dict key views support set operations directly)
+        uris_1 = {track.uri: track for track in tracks_1}
+        uris_2 = {track.uri: track for track in tracks_2}
 
         # Find shared and unique tracks
-        shared_uris = set(uris_1.keys()) & set(uris_2.keys())
-        unique_1_uris = set(uris_1.keys()) - set(uris_2.keys())
-        unique_2_uris = set(uris_2.keys()) - set(uris_1.keys())
+        shared_uris = uris_1.keys() & uris_2.keys()
+        unique_1_uris = uris_1.keys() - uris_2.keys()
+        unique_2_uris = uris_2.keys() - uris_1.keys()
 
         return {
             "playlist_1_name": playlist_1['name'],
@@ -289,7 +309,8 @@ class PlaylistLogic:
     def set_collaborative(
         self,
         playlist_id: str,
-        collaborative: bool
+        collaborative: bool,
+        playlist_name: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Toggle collaborative status of a playlist.
@@ -297,6 +318,7 @@ class PlaylistLogic:
         Args:
             playlist_id: Spotify playlist ID
             collaborative: Whether to make playlist collaborative
+            playlist_name: Playlist name, if already known (skips fetching it)
 
         Returns:
             Dict with:
@@ -305,21 +327,20 @@ class PlaylistLogic:
                 - collaborative: New collaborative status
                 - success: Whether operation succeeded
         """
-        # Get current playlist info
-        playlist = self.client.sp.playlist(playlist_id)
-
-        # Update collaborative status
-        self.client.sp.playlist_change_details(
-            playlist_id=playlist_id,
+        # Get current playlist info (only needed for its name)
+        if playlist_name is None:
+            playlist_name = self.client.get_playlist(playlist_id, self.NAME_PLAYLIST_FIELDS)['name']
+
+        # Update collaborative status; spotipy raises on a non-2xx response,
+        # so there is no need to re-fetch the playlist to verify
+        self.client.change_playlist_details(
+            playlist_id,
             collaborative=collaborative
         )
 
-        # Verify the change
-        updated_playlist = self.client.sp.playlist(playlist_id)
-
         return {
             "playlist_id": playlist_id,
-            "playlist_name": playlist['name'],
-            "collaborative": updated_playlist['collaborative'],
-            "success": updated_playlist['collaborative'] == collaborative
+            "playlist_name": playlist_name,
+            "collaborative": collaborative,
+            "success": True
         }
@@ -1,9 +1,17 @@
 """Spotify MCP Server - Exposes Spotify API as MCP tools."""
 
 import asyncio
+import json
 import os
 import sys
-from typing import Any
+import time
+from itertools import islice
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Print startup message immediately for debugging
 print("🚀 Starting Spotify MCP Server...", file=sys.stderr, flush=True)
@@ -20,7 +28,6 @@ sys.path.insert(0, os.path.dirname(__file__))
 
 try:
     from mcp.server import Server
-    from mcp.server.stdio import stdio_server
     from mcp.types import Tool, TextContent
     print("✓ MCP imports successful", file=sys.stderr, flush=True)
 except ImportError as e:
@@ -37,9 +44,6 @@ except ImportError as e:
     sys.exit(1)
 
 
-# Load environment variables
-load_dotenv()
-
 # Initialize MCP server
 server = Server("spotify-mcp")
 
@@ -49,796 +53,1106 @@ playlist_logic: PlaylistLogic = None
 artist_logic: ArtistLogic = None
 
 
-@server.list_tools()
-async def list_tools() -> list[Tool]:
-    """List all available Spotify tools."""
-    return [
-        Tool(
-            name="create_playlist",
-            description="Create a new Spotify playlist",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "name": {
-                        "type": "string",
-                        "description": "Name of the playlist"
-                    },
-                    "description": {
-                        "type": "string",
-                        "description": "Description of the playlist (optional)"
-                    },
-                    "public": {
-                        "type": "boolean",
-                        "description": "Whether the playlist is public (default: false)"
-                    }
+# Read-only tool results are reused for a short while (and concurrent
+# identical reads share one request); any write tool drops them all
+READ_CACHE_TTL = 60  # seconds
+READ_CACHE_MAX_ENTRIES = 512
+_read_cache: Dict[Tuple[str, bytes], Tuple[float, Any]] = {}
+_inflight: Dict[Tuple[str, bytes], asyncio.Task] = {}
+_write_generation = 0  # Bumped by every write; reads started earlier aren't cached
+
+
+def _call_key(fn: Callable, kwargs: Dict[str, Any]) -> Tuple[str, bytes]:
+    """Key a call by method and (JSON-serializable) arguments."""
+    if orjson is not None:
+        return fn.__qualname__, orjson.dumps(kwargs, option=orjson.OPT_SORT_KEYS)
+    return fn.__qualname__, json.dumps(kwargs, sort_keys=True).encode()
+
+
+async def _single_flight(key: Tuple[str, bytes], call: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Await call(), or join an identical call already in progress.
+
+    The call runs as its own task and every caller (the first one included)
+    awaits it through asyncio.shield(), so a cancelled caller only stops
+    waiting: the shared work and the other callers carry on.
+
+    Args:
+        key: Call key from _call_key()
+        call: Zero-argument coroutine function doing the work
+
+    Returns:
+        The result of call() (shared by every caller that joined it)
+    """
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.create_task(call())
+        _inflight[key] = task
+        task.add_done_callback(lambda done: _forget_inflight(key, done))
+    return await asyncio.shield(task)
+
+
+def _forget_inflight(key: Tuple[str, bytes], task: asyncio.Task) -> None:
+    """Drop a finished single-flight task (and retrieve its outcome)."""
+    if _inflight.get(key) is task:
+        del _inflight[key]
+    if not task.cancelled():
+        task.exception()  # Mark retrieved even if every caller was cancelled
+
+
+def _store_read(key: Tuple[str, bytes], result: Any) -> None:
+    """
+    Cache a read result, dropping expired and oldest entries.
+
+    Every entry has the same TTL, so the dict's insertion order is also its
+    expiry order: expired entries are always at the front.
+    """
+    now = time.monotonic()
+    _read_cache.pop(key, None)  # Re-insert at the end
+    _read_cache[key] = (now + READ_CACHE_TTL, result)
+
+    while _read_cache:
+        oldest_key, (expires_at, _) = next(iter(_read_cache.items()))
+        if expires_at > now and len(_read_cache) <= READ_CACHE_MAX_ENTRIES:
+            break
+        del _read_cache[oldest_key]
+
+
+async def _cached_read(fn: Callable, **kwargs) -> Any:
+    """
+    Call a read-only client/logic method through the short-lived result cache.
+
+    Sync methods run in a worker thread; coroutine functions are awaited.
+
+    Args:
+        fn: Bound method to call
+        **kwargs: Keyword arguments for fn (JSON-serializable tool arguments)
+
+    Returns:
+        The (possibly cached) result of fn(**kwargs)
+    """
+    key = _call_key(fn, kwargs)
+
+    entry = _read_cache.get(key)
+    if entry is not None and entry[0] > time.monotonic():
+        return entry[1]
+
+    async def read() -> Any:
+        generation = _write_generation
+        if asyncio.iscoroutinefunction(fn):
+            result = await fn(**kwargs)
+        else:
+            result = await asyncio.to_thread(fn, **kwargs)
+        if generation == _write_generation:
+            _store_read(key, result)
+        return result
+
+    return await _single_flight(key, read)
+
+
+async def _run_write(fn: Callable, **kwargs) -> Any:
+    """Run a modifying client/logic method in a worker thread, then drop cached reads."""
+    global _write_generation
+    _write_generation += 1
+    try:
+        return await asyncio.to_thread(fn, **kwargs)
+    finally:
+        _write_generation += 1
+        _read_cache.clear()
+
+
+async def _run_write_once(fn: Callable, **kwargs) -> Any:
+    """
+    Like _run_write(), but identical concurrent calls share one run.
+
+    For expensive, non-idempotent workflows (e.g. building a curated
+    playlist) where a duplicated tool call would otherwise create a second
+    copy of the playlist.
+    """
+    return await _single_flight(_call_key(fn, kwargs), lambda: _run_write(fn, **kwargs))
+
+
+# Refresh the OAuth token this long before it expires, in the background,
+# so tool calls never wait on a token refresh
+TOKEN_REFRESH_LEAD = 300  # seconds
+
+
+async def _keep_token_fresh() -> None:
+    """Background task: refresh the Spotify token shortly before each expiry."""
+    while True:
+        expires_at = spotify_client.token_expires_at()
+        if expires_at is None:
+            return
+
+        await asyncio.sleep(max(0.0, expires_at - time.time() - TOKEN_REFRESH_LEAD))
+        try:
+            if await asyncio.to_thread(spotify_client.refresh_token) is None:
+                return
+        except Exception as e:
+            print(f"⚠️  Background token refresh failed: {e}", file=sys.stderr)
+            await asyncio.sleep(60)
+
+
+# Display labels used by the tool handlers
+TIME_RANGE_LABELS = {
+    "short_term": "last 4 weeks",
+    "medium_term": "last 6 months",
+    "long_term": "all time"
+}
+KEY_NAMES = ("C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B")
+MODE_NAMES = ("minor", "major")
+
+# Long track listings are returned as several content blocks of this many tracks
+PLAYLIST_TRACKS_PAGE_SIZE = 50
+
+
+# Tool definitions are static, so they are built once at import
+TOOLS: list[Tool] = [
+    Tool(
+        name="create_playlist",
+        description="Create a new Spotify playlist",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "name": {
+                    "type": "string",
+                    "description": "Name of the playlist"
                 },
-                "required": ["name"]
-            }
-        ),
-        Tool(
-            name="search_tracks",
-            description="Search for tracks on Spotify by name, artist, or other criteria",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "query": {
-                        "type": "string",
-                        "description": "Search query (e.g., 'artist:Queen track:Bohemian Rhapsody')"
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": "Maximum number of results (1-50, default: 20)",
-                        "minimum": 1,
-                        "maximum": 50
-                    }
+                "description": {
+                    "type": "string",
+                    "description": "Description of the playlist (optional)"
                 },
-                "required": ["query"]
-            }
-        ),
-        Tool(
-            name="add_tracks_to_playlist",
-            description="Add tracks to an existing playlist",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "playlist_id": {
-                        "type": "string",
-                        "description": "Spotify playlist ID"
-                    },
-                    "track_uris": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "List of Spotify track URIs (e.g., ['spotify:track:...'])"
-                    }
+                "public": {
+                    "type": "boolean",
+                    "description": "Whether the playlist is public (default: false)"
+                }
+            },
+            "required": ["name"]
+        }
+    ),
+    Tool(
+        name="search_tracks",
+        description="Search for tracks on Spotify by name, artist, or other criteria",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Search query (e.g., 'artist:Queen track:Bohemian Rhapsody')"
                 },
-                "required": ["playlist_id", "track_uris"]
-            }
-        ),
-        Tool(
-            name="remove_tracks_from_playlist",
-            description="Remove tracks from an existing playlist",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "playlist_id": {
-                        "type": "string",
-                        "description": "Spotify playlist ID"
-                    },
-                    "track_uris": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "List of Spotify track URIs to remove (e.g., ['spotify:track:...'])"
-                    }
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of results (1-50, default: 20)",
+                    "minimum": 1,
+                    "maximum": 50
+                }
+            },
+            "required": ["query"]
+        }
+    ),
+    Tool(
+        name="add_tracks_to_playlist",
+        description="Add tracks to an existing playlist",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "playlist_id": {
+                    "type": "string",
+                    "description": "Spotify playlist ID"
                 },
-                "required": ["playlist_id", "track_uris"]
-            }
-        ),
-        Tool(
-            name="get_user_playlists",
-            description="Get the current user's playlists",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "limit": {
-                        "type": "integer",
-                        "description": "Maximum number of playlists to return (default: 50)",
-                        "minimum": 1,
-                        "maximum": 50
-                    }
+                "track_uris": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "List of Spotify track URIs (e.g., ['spotify:track:...'])"
                 }
-            }
-        ),
-        Tool(
-            name="get_playlist_tracks",
-            description="Get all tracks from a specific playlist",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "playlist_id": {
-                        "type": "string",
-                        "description": "Spotify playlist ID"
-                    }
+            },
+            "required": ["playlist_id", "track_uris"]
+        }
+    ),
+    Tool(
+        name="remove_tracks_from_playlist",
+        description="Remove tracks from an existing playlist",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "playlist_id": {
+                    "type": "string",
+                    "description": "Spotify playlist ID"
                 },
-                "required": ["playlist_id"]
-            }
-        ),
-        Tool(
-            name="get_recommendations",
-            description="Get track recommendations based on seed tracks, artists, or genres",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "seed_tracks": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "List of track IDs for recommendations (max 5 total seeds)"
-                    },
-                    "seed_artists": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "List of artist IDs for recommendations (max 5 total seeds)"
-                    },
-                    "seed_genres": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "List of genre names for recommendations (max 5 total seeds)"
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": "Number of recommendations (1-100, default: 20)",
-                        "minimum": 1,
-                        "maximum": 100
-                    }
+                "track_uris": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "List of Spotify track URIs to remove (e.g., ['spotify:track:...'])"
+                }
+            },
+            "required": ["playlist_id", "track_uris"]
+        }
+    ),
+    Tool(
+        name="get_user_playlists",
+        description="Get the current user's playlists",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of playlists to return (default: 50)",
+                    "minimum": 1,
+                    "maximum": 50
                 }
             }
-        ),
-        Tool(
-            name="find_duplicates",
-            description="Find duplicate tracks in a playlist based on track name and artist",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "playlist_id": {
-                        "type": "string",
-                        "description": "Spotify playlist ID"
-                    }
+        }
+    ),
+    Tool(
+        name="get_playlist_tracks",
+        description="Get all tracks from a specific playlist",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "playlist_id": {
+                    "type": "string",
+                    "description": "Spotify playlist ID"
+                }
+            },
+            "required": ["playlist_id"]
+        }
+    ),
+    Tool(
+        name="get_recommendations",
+        description="Get track recommendations based on seed tracks, artists, or genres",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "seed_tracks": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "List of track IDs for recommendations (max 5 total seeds)"
                 },
-                "required": ["playlist_id"]
-            }
-        ),
-        Tool(
-            name="get_top_tracks",
-            description="Get user's top tracks based on listening history. Returns tracks the user has listened to most frequently.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "limit": {
-                        "type": "integer",
-                        "description": "Number of tracks to return (1-50, default: 20)",
-                        "minimum": 1,
-                        "maximum": 50
-                    },
-                    "time_range": {
-                        "type": "string",
-                        "description": "Time period: 'short_term' (~4 weeks), 'medium_term' (~6 months, default), 'long_term' (all time)",
-                        "enum": ["short_term", "medium_term", "long_term"]
-                    }
+                "seed_artists": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "List of artist IDs for recommendations (max 5 total seeds)"
+                },
+                "seed_genres": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "List of genre names for recommendations (max 5 total seeds)"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Number of recommendations (1-100, default: 20)",
+                    "minimum": 1,
+                    "maximum": 100
                 }
             }
-        ),
-        Tool(
-            name="create_curated_playlist_from_top_tracks",
-            description="Create an intelligent curated playlist based on user's top tracks plus similar recommendations. Automatically gets top tracks, finds recommendations, creates playlist, and adds all tracks.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "playlist_name": {
-                        "type": "string",
-                        "description": "Name for the new curated playlist"
-                    },
-                    "num_top_tracks": {
-                        "type": "integer",
-                        "description": "Number of user's top tracks to include (1-50, default: 20)",
-                        "minimum": 1,
-                        "maximum": 50
-                    },
-                    "num_recommendations": {
-                        "type": "integer",
-                        "description": "Number of recommended similar tracks to add (1-100, default: 30)",
-                        "minimum": 1,
-                        "maximum": 100
-                    },
-                    "time_range": {
-                        "type": "string",
-                        "description": "Time period for top tracks: 'short_term' (~4 weeks), 'medium_term' (~6 months, default), 'long_term' (all time)",
-                        "enum": ["short_term", "medium_term", "long_term"]
-                    },
-                    "playlist_description": {
-                        "type": "string",
-                        "description": "Optional custom description for the playlist (auto-generated if not provided)"
-                    },
-                    "public": {
-                        "type": "boolean",
-                        "description": "Whether the playlist should be public (default: false)"
-                    }
+        }
+    ),
+    Tool(
+        name="find_duplicates",
+        description="Find duplicate tracks in a playlist based on track name and artist",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "playlist_id": {
+                    "type": "string",
+                    "description": "Spotify playlist ID"
+                }
+            },
+            "required": ["playlist_id"]
+        }
+    ),
+    Tool(
+        name="get_top_tracks",
+        description="Get user's top tracks based on listening history. Returns tracks the user has listened to most frequently.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "limit": {
+                    "type": "integer",
+                    "description": "Number of tracks to return (1-50, default: 20)",
+                    "minimum": 1,
+                    "maximum": 50
                 },
-                "required": ["playlist_name"]
+                "time_range": {
+                    "type": "string",
+                    "description": "Time period: 'short_term' (~4 weeks), 'medium_term' (~6 months, default), 'long_term' (all time)",
+                    "enum": ["short_term", "medium_term", "long_term"]
+                }
             }
-        ),
-        # Phase 1 - Playlist Intelligence Tools
-        Tool(
-            name="get_playlist_stats",
-            description="Get comprehensive statistics for a playlist including duration, genre breakdown, and average release year",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "playlist_id": {
-                        "type": "string",
-                        "description": "Spotify playlist ID"
-                    }
+        }
+    ),
+    Tool(
+        name="create_curated_playlist_from_top_tracks",
+        description="Create an intelligent curated playlist based on user's top tracks plus similar recommendations. Automatically gets top tracks, finds recommendations, creates playlist, and adds all tracks.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "playlist_name": {
+                    "type": "string",
+                    "description": "Name for the new curated playlist"
                 },
-                "required": ["playlist_id"]
-            }
-        ),
-        Tool(
-            name="merge_playlists",
-            description="Merge multiple playlists into a new playlist with optional deduplication",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "playlist_ids": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "List of Spotify playlist IDs to merge"
-                    },
-                    "new_playlist_name": {
-                        "type": "string",
-                        "description": "Name for the new merged playlist"
-                    },
-                    "remove_duplicates": {
-                        "type": "boolean",
-                        "description": "Whether to remove duplicate tracks (default: true)"
-                    },
-                    "description": {
-                        "type": "string",
-                        "description": "Description for the new playlist (optional)"
-                    },
-                    "public": {
-                        "type": "boolean",
-                        "description": "Whether the playlist should be public (default: false)"
-                    }
+                "num_top_tracks": {
+                    "type": "integer",
+                    "description": "Number of user's top tracks to include (1-50, default: 20)",
+                    "minimum": 1,
+                    "maximum": 50
                 },
-                "required": ["playlist_ids", "new_playlist_name"]
-            }
-        ),
-        Tool(
-            name="compare_playlists",
-            description="Compare two playlists to find shared tracks and unique tracks in each",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "playlist_id_1": {
-                        "type": "string",
-                        "description": "First Spotify playlist ID"
-                    },
-                    "playlist_id_2": {
-                        "type": "string",
-                        "description": "Second Spotify playlist ID"
-                    }
+                "num_recommendations": {
+                    "type": "integer",
+                    "description": "Number of recommended similar tracks to add (1-100, default: 30)",
+                    "minimum": 1,
+                    "maximum": 100
                 },
-                "required": ["playlist_id_1", "playlist_id_2"]
-            }
-        ),
-        Tool(
-            name="set_collaborative",
-            description="Set the collaborative status of a playlist",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "playlist_id": {
-                        "type": "string",
-                        "description": "Spotify playlist ID"
-                    },
-                    "collaborative": {
-                        "type": "boolean",
-                        "description": "Whether the playlist should be collaborative"
-                    }
+                "time_range": {
+                    "type": "string",
+                    "description": "Time period for top tracks: 'short_term' (~4 weeks), 'medium_term' (~6 months, default), 'long_term' (all time)",
+                    "enum": ["short_term", "medium_term", "long_term"]
                 },
-                "required": ["playlist_id", "collaborative"]
-            }
-        ),
-        # Phase 1 - Artist Deep Dive Tools
-        Tool(
-            name="get_artist_discography",
-            description="Get an artist's complete discography grouped by album type (albums, singles, compilations)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "artist_id": {
-                        "type": "string",
-                        "description": "Spotify artist ID"
-                    },
-                    "include_groups": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "Album types to include: album, single, compilation, appears_on (default: album, single, compilation)"
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": "Maximum albums per group (default: 50)",
-                        "minimum": 1,
-                        "maximum": 50
-                    }
+                "playlist_description": {
+                    "type": "string",
+                    "description": "Optional custom description for the playlist (auto-generated if not provided)"
                 },
-                "required": ["artist_id"]
-            }
-        ),
-        Tool(
-            name="get_related_artists",
-            description="Get artists related to a given artist based on Spotify's analysis",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "artist_id": {
-                        "type": "string",
-                        "description": "Spotify artist ID"
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": "Maximum number of related artists (max: 20, default: 20)",
-                        "minimum": 1,
-                        "maximum": 20
-                    }
+                "public": {
+                    "type": "boolean",
+                    "description": "Whether the playlist should be public (default: false)"
+                }
+            },
+            "required": ["playlist_name"]
+        }
+    ),
+    # Phase 1 - Playlist Intelligence Tools
+    Tool(
+        name="get_playlist_stats",
+        description="Get comprehensive statistics for a playlist including duration, genre breakdown, and average release year",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "playlist_id": {
+                    "type": "string",
+                    "description": "Spotify playlist ID"
+                }
+            },
+            "required": ["playlist_id"]
+        }
+    ),
+    Tool(
+        name="merge_playlists",
+        description="Merge multiple playlists into a new playlist with optional deduplication",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "playlist_ids": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "List of Spotify playlist IDs to merge"
                 },
-                "required": ["artist_id"]
-            }
-        ),
-        Tool(
-            name="get_artist_top_tracks",
-            description="Get an artist's top tracks by popularity",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "artist_id": {
-                        "type": "string",
-                        "description": "Spotify artist ID"
-                    },
-                    "country": {
-                        "type": "string",
-                        "description": "ISO 3166-1 alpha-2 country code (default: US)"
-                    }
+                "new_playlist_name": {
+                    "type": "string",
+                    "description": "Name for the new merged playlist"
                 },
-                "required": ["artist_id"]
-            }
-        ),
-        # Phase 2 - Audio Analysis Tool
-        Tool(
-            name="get_audio_features",
-            description="Get audio features (tempo/BPM, key, mode, danceability, acousticness, energy, valence, etc.) for a track from multiple sources (GetSongBPM, MusicBrainz, AcousticBrainz). Returns None if features unavailable. Coverage varies by track - popular tracks more likely to have data.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "track_id": {
-                        "type": "string",
-                        "description": "Spotify track ID"
-                    }
+                "remove_duplicates": {
+                    "type": "boolean",
+                    "description": "Whether to remove duplicate tracks (default: true)"
                 },
-                "required": ["track_id"]
-            }
+                "description": {
+                    "type": "string",
+                    "description": "Description for the new playlist (optional)"
+                },
+                "public": {
+                    "type": "boolean",
+                    "description": "Whether the playlist should be public (default: false)"
+                }
+            },
+            "required": ["playlist_ids", "new_playlist_name"]
+        }
+    ),
+    Tool(
+        name="compare_playlists",
+        description="Compare two playlists to find shared tracks and unique tracks in each",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "playlist_id_1": {
+                    "type": "string",
+                    "description": "First Spotify playlist ID"
+                },
+                "playlist_id_2": {
+                    "type": "string",
+                    "description": "Second Spotify playlist ID"
+                }
+            },
+            "required": ["playlist_id_1", "playlist_id_2"]
+        }
+    ),
+    Tool(
+        name="set_collaborative",
+        description="Set the collaborative status of a playlist",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "playlist_id": {
+                    "type": "string",
+                    "description": "Spotify playlist ID"
+                },
+                "collaborative": {
+                    "type": "boolean",
+                    "description": "Whether the playlist should be collaborative"
+                }
+            },
+            "required": ["playlist_id", "collaborative"]
+        }
+    ),
+    # Phase 1 - Artist Deep Dive Tools
+    Tool(
+        name="get_artist_discography",
+        description="Get an artist's complete discography grouped by album type (albums, singles, compilations)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "artist_id": {
+                    "type": "string",
+                    "description": "Spotify artist ID"
+                },
+                "include_groups": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Album types to include: album, single, compilation, appears_on (default: album, single, compilation)"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum albums per group (default: 50)",
+                    "minimum": 1,
+                    "maximum": 50
+                }
+            },
+            "required": ["artist_id"]
+        }
+    ),
+    Tool(
+        name="get_related_artists",
+        description="Get artists related to a given artist based on Spotify's analysis",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "artist_id": {
+                    "type": "string",
+                    "description": "Spotify artist ID"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of related artists (max: 20, default: 20)",
+                    "minimum": 1,
+                    "maximum": 20
+                }
+            },
+            "required": ["artist_id"]
+        }
+    ),
+    Tool(
+        name="get_artist_top_tracks",
+        description="Get an artist's top tracks by popularity",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "artist_id": {
+                    "type": "string",
+                    "description": "Spotify artist ID"
+                },
+                "country": {
+                    "type": "string",
+                    "description": "ISO 3166-1 alpha-2 country code (default: US)"
+                }
+            },
+            "required": ["artist_id"]
+        }
+    ),
+    # Phase 2 - Audio Analysis Tool
+    Tool(
+        name="get_audio_features",
+        description="Get audio features (tempo/BPM, key, mode, danceability, acousticness, energy, valence, etc.) for a track from multiple sources (GetSongBPM, MusicBrainz, AcousticBrainz). Returns None if features unavailable. Coverage varies by track - popular tracks more likely to have data.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "track_id": {
+                    "type": "string",
+                    "description": "Spotify track ID"
+                }
+            },
+            "required": ["track_id"]
+        }
+    ),
+    Tool(
+        name="get_tracks_audio_features",
+        description="Get audio features (tempo/BPM, key, mode, energy, etc.) for several tracks at once. Lookups are batched, so this is much faster than calling get_audio_features per track. Coverage varies by track.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "track_ids": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Spotify track IDs (1-50)",
+                    "minItems": 1,
+                    "maxItems": 50
+                }
+            },
+            "required": ["track_ids"]
+        }
+    )
+]
+
+
+@server.list_tools()
+async def list_tools() -> list[Tool]:
+    """List all available Spotify tools."""
+    return TOOLS
+
+
+async def _handle_create_playlist(arguments: Dict[str, Any]) -> list[TextContent]:
+    """Handle the create_playlist tool."""
+    result = await _run_write(
+        spotify_client.create_playlist,
+        name=arguments["name"],
+        description=arguments.get("description", ""),
+        public=arguments.get("public", False)
+    )
+    return [TextContent(
+        type="text",
+        text=f"✅ Created playlist: {result['name']}\n"
+             f"URL: {result['url']}\n"
+             f"ID: {result['playlist_id']}"
+    )]
+
+
+async def _handle_search_tracks(arguments: Dict[str, Any]) -> list[TextContent]:
+    """Handle the search_tracks tool."""
+    tracks = await asyncio.to_thread(
+        spotify_client.search_tracks,
+        query=arguments["query"],
+        limit=arguments.get("limit", 20)
+    )
+    
+    if not tracks:
+        return [TextContent(type="text", text="No tracks found.")]
+    
+    result_text = f"Found {len(tracks)} track(s):\n\n"
+    result_text += "".join(
+        f"{i}. {track.name} by {track.artist}\n"
+        f"   Album: {track.album}\n"
+        f"   URI: {track.uri}\n"
+        f"   URL: {track.url}\n\n"
+        for i, track in enumerate(tracks, 1)
+    )
+    
+    return [TextContent(type="text", text=result_text)]
+
+
+async def _handle_add_tracks_to_playlist(arguments: Dict[str, Any]) -> list[TextContent]:
+    """Handle the add_tracks_to_playlist tool."""
+    result = await _run_write(
+        spotify_client.add_tracks_to_playlist,
+        playlist_id=arguments["playlist_id"],
+        track_uris=arguments["track_uris"]
+    )
+    return [TextContent(
+        type="text",
+        text=f"✅ Added {result['tracks_added']} track(s) to playlist {result['playlist_id']}"
+    )]
+
+
+async def _handle_remove_tracks_from_playlist(arguments: Dict[str, Any]) -> list[TextContent]:
+    """Handle the remove_tracks_from_playlist tool."""
+    result = await _run_write(
+        spotify_client.remove_tracks_from_playlist,
+        playlist_id=arguments["playlist_id"],
+        track_uris=arguments["track_uris"]
+    )
+    return [TextContent(
+        type="text",
+        text=f"✅ Removed {result['tracks_removed']} track(s) from playlist {result['playlist_id']}"
+    )]
+
+
+async def _handle_get_user_playlists(arguments: Dict[str, Any]) -> list[TextContent]:
+    """Handle the get_user_playlists tool."""
+    playlists = await _cached_read(
+        spotify_client.get_user_playlists,
+        limit=arguments.get("limit", 50)
+    )
+    
+    if not playlists:
+        return [TextContent(type="text", text="No playlists found.")]
+    
+    result_text = f"Found {len(playlists)} playlist(s):\n\n"
+    parts = []
+    for i, playlist in enumerate(playlists, 1):
+        visibility = "Public" if playlist['public'] else "Private"
+        parts.append(
+            f"{i}. {playlist['name']} ({visibility})\n"
+            f"   Description: {playlist['description']}\n"
+            f"   Tracks: {playlist['tracks_total']}\n"
+            f"   ID: {playlist['id']}\n"
+            f"   URL: {playlist['url']}\n\n"
         )
-    ]
+    result_text += "".join(parts)
+    
+    return [TextContent(type="text", text=result_text)]
 
 
-@server.call_tool()
-async def call_tool(name: str, arguments: Any) -> list[TextContent]:
-    """Handle tool calls from Claude."""
+async def _handle_get_playlist_tracks(arguments: Dict[str, Any]) -> list[TextContent]:
+    """Handle the get_playlist_tracks tool."""
+    tracks = await _cached_read(
+        spotify_client.get_playlist_tracks_async,
+        playlist_id=arguments["playlist_id"]
+    )
     
-    try:
-        if name == "create_playlist":
-            result = spotify_client.create_playlist(
-                name=arguments["name"],
-                description=arguments.get("description", ""),
-                public=arguments.get("public", False)
-            )
-            return [TextContent(
-                type="text",
-                text=f"✅ Created playlist: {result['name']}\n"
-                     f"URL: {result['url']}\n"
-                     f"ID: {result['playlist_id']}"
-            )]
-        
-        elif name == "search_tracks":
-            tracks = spotify_client.search_tracks(
-                query=arguments["query"],
-                limit=arguments.get("limit", 20)
-            )
-            
-            if not tracks:
-                return [TextContent(type="text", text="No tracks found.")]
-            
-            result_text = f"Found {len(tracks)} track(s):\n\n"
-            for i, track in enumerate(tracks, 1):
-                result_text += (
-                    f"{i}. {track['name']} by {track['artist']}\n"
-                    f"   Album: {track['album']}\n"
-                    f"   URI: {track['uri']}\n"
-                    f"   URL: {track['url']}\n\n"
-                )
-            
-            return [TextContent(type="text", text=result_text)]
-        
-        elif name == "add_tracks_to_playlist":
-            result = spotify_client.add_tracks_to_playlist(
-                playlist_id=arguments["playlist_id"],
-                track_uris=arguments["track_uris"]
-            )
-            return [TextContent(
-                type="text",
-                text=f"✅ Added {result['tracks_added']} track(s) to playlist {result['playlist_id']}"
-            )]
-
-        elif name == "remove_tracks_from_playlist":
-            result = spotify_client.remove_tracks_from_playlist(
-                playlist_id=arguments["playlist_id"],
-                track_uris=arguments["track_uris"]
-            )
-            return [TextContent(
-                type="text",
-                text=f"✅ Removed {result['tracks_removed']} track(s) from playlist {result['playlist_id']}"
-            )]
-
-        elif name == "get_user_playlists":
-            playlists = spotify_client.get_user_playlists(
-                limit=arguments.get("limit", 50)
-            )
-            
-            if not playlists:
-                return [TextContent(type="text", text="No playlists found.")]
-            
-            result_text = f"Found {len(playlists)} playlist(s):\n\n"
-            for i, playlist in enumerate(playlists, 1):
-                visibility = "Public" if playlist['public'] else "Private"
-                result_text += (
-                    f"{i}. {playlist['name']} ({visibility})\n"
-                    f"   Description: {playlist['description']}\n"
-                    f"   Tracks: {playlist['tracks_total']}\n"
-                    f"   ID: {playlist['id']}\n"
-                    f"   URL: {playlist['url']}\n\n"
-                )
-            
-            return [TextContent(type="text", text=result_text)]
-        
-        elif name == "get_playlist_tracks":
-            tracks = spotify_client.get_playlist_tracks(
-                playlist_id=arguments["playlist_id"]
-            )
-            
-            if not tracks:
-                return [TextContent(type="text", text="Playlist is empty.")]
-            
-            result_text = f"Found {len(tracks)} track(s):\n\n"
-            for i, track in enumerate(tracks, 1):
-                result_text += (
-                    f"{i}. {track['name']} by {track['artist']}\n"
-                    f"   Album: {track['album']}\n"
-                    f"   URI: {track['uri']}\n\n"
-                )
-            
-            return [TextContent(type="text", text=result_text)]
-        
-        elif name == "get_recommendations":
-            tracks = spotify_client.get_recommendations(
-                seed_tracks=arguments.get("seed_tracks"),
-                seed_artists=arguments.get("seed_artists"),
-                seed_genres=arguments.get("seed_genres"),
-                limit=arguments.get("limit", 20)
-            )
+    if not tracks:
+        return [TextContent(type="text", text="Playlist is empty.")]
+    
+    contents = [TextContent(type="text", text=f"Found {len(tracks)} track(s):\n\n")]
+    for start in range(0, len(tracks), PLAYLIST_TRACKS_PAGE_SIZE):
+        contents.append(TextContent(type="text", text="".join(
+            f"{i}. {track.name} by {track.artist}\n"
+            f"   Album: {track.album}\n"
+            f"   URI: {track.uri}\n\n"
+            for i, track in enumerate(tracks[start:start + PLAYLIST_TRACKS_PAGE_SIZE], start + 1)
+        )))
+    
+    return contents
 
-            if not tracks:
-                return [TextContent(type="text", text="No recommendations found.")]
 
-            result_text = f"Found {len(tracks)} recommendation(s):\n\n"
-            for i, track in enumerate(tracks, 1):
-                result_text += (
-                    f"{i}. {track['name']} by {track['artist']}\n"
-                    f"   Album: {track['album']}\n"
-                    f"   URI: {track['uri']}\n"
-                    f"   URL: {track['url']}\n\n"
-                )
+async def _handle_get_recommendations(arguments: Dict[str, Any]) -> list[TextContent]:
+    """Handle the get_recommendations tool."""
+    tracks = await asyncio.to_thread(
+        spotify_client.get_recommendations,
+        seed_tracks=arguments.get("seed_tracks"),
+        seed_artists=arguments.get("seed_artists"),
+        seed_genres=arguments.get("seed_genres"),
+        limit=arguments.get("limit", 20)
+    )
 
-            return [TextContent(type="text", text=result_text)]
+    if not tracks:
+        return [TextContent(type="text", text="No recommendations found.")]
 
-        elif name == "find_duplicates":
-            result = spotify_client.find_duplicates(
-                playlist_id=arguments["playlist_id"]
-            )
+    result_text = f"Found {len(tracks)} recommendation(s):\n\n"
+    result_text += "".join(
+        f"{i}. {track.name} by {track.artist}\n"
+        f"   Album: {track.album}\n"
+        f"   URI: {track.uri}\n"
+        f"   URL: {track.url}\n\n"
+        for i, track in enumerate(tracks, 1)
+    )
 
-            if result["duplicate_count"] == 0:
-                return [TextContent(
-                    type="text",
-                    text=f"✅ No duplicates found in playlist ({result['total_tracks']} total tracks)"
-                )]
+    return [TextContent(type="text", text=result_text)]
 
-            result_text = (
-                f"Found {result['duplicate_count']} duplicate track(s) "
-                f"in playlist ({result['total_tracks']} total tracks):\n\n"
-            )
 
-            for i, dup in enumerate(result["duplicates"], 1):
-                result_text += (
-                    f"{i}. {dup['name']} by {dup['artist']}\n"
-                    f"   Occurrences: {dup['occurrences']}\n"
-                    f"   URIs: {', '.join(dup['uris'])}\n\n"
-                )
+async def _handle_find_duplicates(arguments: Dict[str, Any]) -> list[TextContent]:
+    """Handle the find_duplicates tool."""
+    result = await asyncio.to_thread(
+        spotify_client.find_duplicates,
+        playlist_id=arguments["playlist_id"]
+    )
 
-            return [TextContent(type="text", text=result_text)]
+    if result["duplicate_count"] == 0:
+        return [TextContent(
+            type="text",
+            text=f"✅ No duplicates found in playlist ({result['total_tracks']} total tracks)"
+        )]
 
-        elif name == "get_top_tracks":
-            tracks = spotify_client.get_top_tracks(
-                limit=arguments.get("limit", 20),
-                time_range=arguments.get("time_range", "medium_term")
-            )
+    result_text = (
+        f"Found {result['duplicate_count']} duplicate track(s) "
+        f"in playlist ({result['total_tracks']} total tracks):\n\n"
+    )
 
-            if not tracks:
-                return [TextContent(type="text", text="No top tracks found.")]
+    result_text += "".join(
+        f"{i}. {dup['name']} by {dup['artist']}\n"
+        f"   Occurrences: {dup['occurrences']}\n"
+        f"   URIs: {', '.join(dup['uris'])}\n\n"
+        for i, dup in enumerate(result["duplicates"], 1)
+    )
 
-            time_labels = {
-                "short_term": "last 4 weeks",
-                "medium_term": "last 6 months",
-                "long_term": "all time"
-            }
-            time_range = arguments.get("time_range", "medium_term")
-
-            result_text = f"Your top {len(tracks)} tracks ({time_labels.get(time_range)}):\n\n"
-            for i, track in enumerate(tracks, 1):
-                result_text += (
-                    f"{i}. {track['name']} by {track['artist']}\n"
-                    f"   Album: {track['album']}\n"
-                    f"   URI: {track['uri']}\n"
-                    f"   URL: {track['url']}\n\n"
-                )
-
-            return [TextContent(type="text", text=result_text)]
-
-        elif name == "create_curated_playlist_from_top_tracks":
-            result = spotify_client.create_curated_playlist_from_top_tracks(
-                playlist_name=arguments["playlist_name"],
-                num_top_tracks=arguments.get("num_top_tracks", 20),
-                num_recommendations=arguments.get("num_recommendations", 30),
-                time_range=arguments.get("time_range", "medium_term"),
-                playlist_description=arguments.get("playlist_description", ""),
-                public=arguments.get("public", False)
-            )
+    return [TextContent(type="text", text=result_text)]
 
-            result_text = (
-                f"✅ Created curated playlist: {result['playlist_name']}\n\n"
-                f"📊 Summary:\n"
-                f"   - Total tracks added: {result['tracks_added']}\n"
-                f"   - Your top tracks: {result['top_tracks_count']}\n"
-                f"   - Recommendations: {result['recommendations_count']}\n\n"
-                f"🔗 Playlist URL: {result['playlist_url']}\n\n"
-                f"📝 Description: {result['description']}"
-            )
 
-            return [TextContent(type="text", text=result_text)]
-
-        # Phase 1 - Playlist Intelligence Tools
-        elif name == "get_playlist_stats":
-            stats = playlist_logic.get_playlist_stats(arguments["playlist_id"])
-
-            # Format genres for display
-            genres_display = ", ".join(list(stats['genre_breakdown'].keys())[:5])
-
-            result_text = (
-                f"📊 Playlist Stats: {stats['playlist_name']}\n\n"
-                f"📝 Description: {stats['playlist_description']}\n"
-                f"👤 Owner: {stats['owner']}\n"
-                f"🔓 Visibility: {'Public' if stats['public'] else 'Private'}\n"
-                f"🤝 Collaborative: {'Yes' if stats['collaborative'] else 'No'}\n\n"
-                f"📀 Total Tracks: {stats['total_tracks']}\n"
-                f"⏱️  Duration: {stats['total_duration_formatted']}\n"
-                f"📅 Avg Release Year: {stats['avg_release_year']}\n\n"
-                f"🎸 Top Genres: {genres_display}\n\n"
-            )
+async def _handle_get_top_tracks(arguments: Dict[str, Any]) -> list[TextContent]:
+    """Handle the get_top_tracks tool."""
+    time_range = arguments.get("time_range", "medium_term")
+    tracks = await _cached_read(
+        spotify_client.get_top_tracks,
+        limit=arguments.get("limit", 20),
+        time_range=time_range
+    )
 
-            if stats.get('earliest_track'):
-                result_text += (
-                    f"📜 Oldest Track: {stats['earliest_track']['name']} by {stats['earliest_track']['artist']} "
-                    f"({stats['earliest_track']['release_date']})\n"
-                )
-
-            if stats.get('newest_track'):
-                result_text += (
-                    f"🆕 Newest Track: {stats['newest_track']['name']} by {stats['newest_track']['artist']} "
-                    f"({stats['newest_track']['release_date']})\n"
-                )
-
-            return [TextContent(type="text", text=result_text)]
-
-        elif name == "merge_playlists":
-            result = playlist_logic.merge_playlists(
-                playlist_ids=arguments["playlist_ids"],
-                new_playlist_name=arguments["new_playlist_name"],
-                remove_duplicates=arguments.get("remove_duplicates", True),
-                description=arguments.get("description", ""),
-                public=arguments.get("public", False)
-            )
+    if not tracks:
+        return [TextContent(type="text", text="No top tracks found.")]
 
-            source_list = "\n".join([
-                f"   - {p['name']} ({p['track_count']} tracks)"
-                for p in result['source_playlists']
-            ])
-
-            result_text = (
-                f"✅ Merged Playlists Successfully!\n\n"
-                f"🎵 New Playlist: {result['playlist_name']}\n"
-                f"🔗 URL: {result['playlist_url']}\n\n"
-                f"📊 Summary:\n"
-                f"   - Tracks Added: {result['tracks_added']}\n"
-                f"   - Duplicates Removed: {result['duplicates_removed']}\n\n"
-                f"📋 Source Playlists:\n{source_list}"
-            )
+    result_text = f"Your top {len(tracks)} tracks ({TIME_RANGE_LABELS.get(time_range)}):\n\n"
+    result_text += "".join(
+        f"{i}. {track.name} by {track.artist}\n"
+        f"   Album: {track.album}\n"
+        f"   URI: {track.uri}\n"
+        f"   URL: {track.url}\n\n"
+        for i, track in enumerate(tracks, 1)
+    )
 
-            return [TextContent(type="text", text=result_text)]
+    return [TextContent(type="text", text=result_text)]
+
+
+# Optional create_curated_playlist_from_top_tracks arguments
+CURATED_PLAYLIST_DEFAULTS = {
+    "num_top_tracks": 20,
+    "num_recommendations": 30,
+    "time_range": "medium_term",
+    "playlist_description": "",
+    "public": False
+}
+
+
+async def _handle_create_curated_playlist_from_top_tracks(arguments: Dict[str, Any]) -> list[TextContent]:
+    """Handle the create_curated_playlist_from_top_tracks tool."""
+    args = CURATED_PLAYLIST_DEFAULTS | arguments
+    result = await _run_write_once(
+        spotify_client.create_curated_playlist_from_top_tracks,
+        playlist_name=args["playlist_name"],
+        num_top_tracks=args["num_top_tracks"],
+        num_recommendations=args["num_recommendations"],
+        time_range=args["time_range"],
+        playlist_description=args["playlist_description"],
+        public=args["public"]
+    )
 
-        elif name == "compare_playlists":
-            result = playlist_logic.compare_playlists(
-                playlist_id_1=arguments["playlist_id_1"],
-                playlist_id_2=arguments["playlist_id_2"]
-            )
+    result_text = (
+        f"✅ Created curated playlist: {result['playlist_name']}\n\n"
+        f"📊 Summary:\n"
+        f"   - Total tracks added: {result['tracks_added']}\n"
+        f"   - Your top tracks: {result['top_tracks_count']}\n"
+        f"   - Recommendations: {result['recommendations_count']}\n\n"
+        f"🔗 Playlist URL: {result['playlist_url']}\n\n"
+        f"📝 Description: {result['description']}"
+    )
 
-            result_text = (
-                f"🔍 Playlist Comparison\n\n"
-                f"📋 Playlist 1: {result['playlist_1_name']}\n"
-                f"📋 Playlist 2: {result['playlist_2_name']}\n\n"
-                f"📊 Summary:\n"
-                f"   - Shared Tracks: {result['shared_count']}\n"
-                f"   - Unique to '{result['playlist_1_name']}': {result['unique_1_count']}\n"
-                f"   - Unique to '{result['playlist_2_name']}': {result['unique_2_count']}\n\n"
-            )
+    return [TextContent(type="text", text=result_text)]
 
-            if result['shared_count'] > 0:
-                result_text += f"🤝 Shared Tracks (showing first 5):\n"
-                for i, track in enumerate(result['shared_tracks'][:5], 1):
-                    result_text += f"   {i}. {track['name']} by {track['artist']}\n"
 
-            return [TextContent(type="text", text=result_text)]
+# Phase 1 - Playlist Intelligence Tools
+async def _handle_get_playlist_stats(arguments: Dict[str, Any]) -> list[TextContent]:
+    """Handle the get_playlist_stats tool."""
+    stats = await asyncio.to_thread(
+        playlist_logic.get_playlist_stats,
+        arguments["playlist_id"]
+    )
 
-        elif name == "set_collaborative":
-            result = playlist_logic.set_collaborative(
-                playlist_id=arguments["playlist_id"],
-                collaborative=arguments["collaborative"]
-            )
+    # Format genres for display
+    genres_display = ", ".join(islice(stats['genre_breakdown'], 5))
+
+    result_text = (
+        f"📊 Playlist Stats: {stats['playlist_name']}\n\n"
+        f"📝 Description: {stats['playlist_description']}\n"
+        f"👤 Owner: {stats['owner']}\n"
+        f"🔓 Visibility: {'Public' if stats['public'] else 'Private'}\n"
+        f"🤝 Collaborative: {'Yes' if stats['collaborative'] else 'No'}\n\n"
+        f"📀 Total Tracks: {stats['total_tracks']}\n"
+        f"⏱️  Duration: {stats['total_duration_formatted']}\n"
+        f"📅 Avg Release Year: {stats['avg_release_year']}\n\n"
+        f"🎸 Top Genres: {genres_display}\n\n"
+    )
 
-            status = "collaborative" if result['collaborative'] else "non-collaborative"
-            result_text = (
-                f"✅ Successfully updated playlist!\n\n"
-                f"🎵 Playlist: {result['playlist_name']}\n"
-                f"🤝 Status: Now {status}\n"
-                f"📋 ID: {result['playlist_id']}"
-            )
+    if stats.get('earliest_track'):
+        result_text += (
+            f"📜 Oldest Track: {stats['earliest_track']['name']} by {stats['earliest_track']['artist']} "
+            f"({stats['earliest_track']['release_date']})\n"
+        )
 
-            return [TextContent(type="text", text=result_text)]
+    if stats.get('newest_track'):
+        result_text += (
+            f"🆕 Newest Track: {stats['newest_track']['name']} by {stats['newest_track']['artist']} "
+            f"({stats['newest_track']['release_date']})\n"
+        )
 
-        # Phase 1 - Artist Deep Dive Tools
-        elif name == "get_artist_discography":
-            result = artist_logic.get_artist_discography(
-                artist_id=arguments["artist_id"],
-                include_groups=arguments.get("include_groups"),
-                limit=arguments.get("limit", 50)
-            )
+    return [TextContent(type="text", text=result_text)]
 
-            result_text = (
-                f"🎸 Artist Discography: {result['artist_name']}\n\n"
-                f"📊 Stats:\n"
-                f"   - Total Releases: {result['total_releases']}\n"
-                f"   - Popularity: {result['popularity']}/100\n"
-                f"   - Followers: {result['followers']:,}\n"
-                f"   - Genres: {', '.join(result['genres'][:5]) if result['genres'] else 'N/A'}\n\n"
-            )
 
-            if 'albums' in result and result['albums']:
-                result_text += f"💿 Albums ({len(result['albums'])}):\n"
-                for album in result['albums'][:5]:
-                    result_text += f"   - {album['name']} ({album['release_date'][:4]})\n"
-                if len(result['albums']) > 5:
-                    result_text += f"   ... and {len(result['albums']) - 5} more\n"
-                result_text += "\n"
-
-            if 'singles' in result and result['singles']:
-                result_text += f"💽 Singles ({len(result['singles'])}) - showing first 5:\n"
-                for single in result['singles'][:5]:
-                    result_text += f"   - {single['name']} ({single['release_date'][:4]})\n"
-                if len(result['singles']) > 5:
-                    result_text += f"   ... and {len(result['singles']) - 5} more\n"
-
-            return [TextContent(type="text", text=result_text)]
-
-        elif name == "get_related_artists":
-            result = artist_logic.get_related_artists(
-                artist_id=arguments["artist_id"],
-                limit=arguments.get("limit", 20)
-            )
+async def _handle_merge_playlists(arguments: Dict[str, Any]) -> list[TextContent]:
+    """Handle the merge_playlists tool."""
+    result = await _run_write(
+        playlist_logic.merge_playlists,
+        playlist_ids=arguments["playlist_ids"],
+        new_playlist_name=arguments["new_playlist_name"],
+        remove_duplicates=arguments.get("remove_duplicates", True),
+        description=arguments.get("description", ""),
+        public=arguments.get("public", False)
+    )
 
-            result_text = (
-                f"🔗 Artists Related to: {result['original_artist']['name']}\n\n"
-                f"Found {result['count']} related artist(s):\n\n"
-            )
+    source_list = "\n".join([
+        f"   - {p['name']} ({p['track_count']} tracks)"
+        for p in result['source_playlists']
+    ])
+
+    result_text = (
+        f"✅ Merged Playlists Successfully!\n\n"
+        f"🎵 New Playlist: {result['playlist_name']}\n"
+        f"🔗 URL: {result['playlist_url']}\n\n"
+        f"📊 Summary:\n"
+        f"   - Tracks Added: {result['tracks_added']}\n"
+        f"   - Duplicates Removed: {result['duplicates_removed']}\n\n"
+        f"📋 Source Playlists:\n{source_list}"
+    )
 
-            for i, artist in enumerate(result['related_artists'], 1):
-                genres = ", ".join(artist['genres'][:3]) if artist['genres'] else "N/A"
-                result_text += (
-                    f"{i}. {artist['name']}\n"
-                    f"   Popularity: {artist['popularity']}/100\n"
-                    f"   Genres: {genres}\n"
-                    f"   Followers: {artist['followers']:,}\n"
-                    f"   URL: {artist['url']}\n\n"
-                )
-
-            return [TextContent(type="text", text=result_text)]
-
-        elif name == "get_artist_top_tracks":
-            result = artist_logic.get_artist_top_tracks(
-                artist_id=arguments["artist_id"],
-                country=arguments.get("country", "US")
-            )
+    return [TextContent(type="text", text=result_text)]
 
-            result_text = (
-                f"⭐ Top Tracks: {result['artist_name']}\n"
-                f"🌍 Country: {result['country']}\n\n"
-                f"Found {result['count']} track(s):\n\n"
-            )
 
-            for i, track in enumerate(result['tracks'], 1):
-                duration_min = track['duration_ms'] // 60000
-                duration_sec = (track['duration_ms'] % 60000) // 1000
-                result_text += (
-                    f"{i}. {track['name']}\n"
-                    f"   Album: {track['album']}\n"
-                    f"   Popularity: {track['popularity']}/100\n"
-                    f"   Duration: {duration_min}:{duration_sec:02d}\n"
-                    f"   URL: {track['url']}\n\n"
-                )
-
-            return [TextContent(type="text", text=result_text)]
-
-        # Phase 2 - Audio Analysis Tool
-        elif name == "get_audio_features":
-            features = await spotify_client.get_track_audio_features(
-                track_id=arguments["track_id"]
-            )
+async def _handle_compare_playlists(arguments: Dict[str, Any]) -> list[TextContent]:
+    """Handle the compare_playlists tool."""
+    result = await asyncio.to_thread(
+        playlist_logic.compare_playlists,
+        playlist_id_1=arguments["playlist_id_1"],
+        playlist_id_2=arguments["playlist_id_2"]
+    )
 
-            if not features:
-                return [TextContent(
-                    type="text",
-                    text="❌ No audio features available. The track may not have a preview URL."
-                )]
-
-            # Format for display
-            key_names = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
-            mode_names = {0: "minor", 1: "major"}
-
-            result_text = (
-                f"🎵 Audio Features (Track: {arguments['track_id']})\n\n"
-                f"🎼 Musical Properties:\n"
-                f"   - Tempo: {features['tempo']:.1f} BPM\n"
-                f"   - Key: {key_names[features['key']]} {mode_names[features['mode']]}\n\n"
-                f"📊 Energy & Mood:\n"
-                f"   - Energy: {features['energy']:.2f} (0=calm, 1=intense)\n"
-                f"   - Danceability: {features['danceability']:.2f} (0=low, 1=high)\n"
-                f"   - Valence: {features['valence']:.2f} (0=sad, 1=happy)\n\n"
-                f"ℹ️  Analysis Method: {features['analysis_method']}\n"
-                f"⚠️  Note: Based on 30-second preview\n"
-            )
+    result_text = (
+        f"🔍 Playlist Comparison\n\n"
+        f"📋 Playlist 1: {result['playlist_1_name']}\n"
+        f"📋 Playlist 2: {result['playlist_2_name']}\n\n"
+        f"📊 Summary:\n"
+        f"   - Shared Tracks: {result['shared_count']}\n"
+        f"   - Unique to '{result['playlist_1_name']}': {result['unique_1_count']}\n"
+        f"   - Unique to '{result['playlist_2_name']}': {result['unique_2_count']}\n\n"
+    )
 
-            return [TextContent(type="text", text=result_text)]
+    if result['shared_count'] > 0:
+        parts = [f"🤝 Shared Tracks (showing first 5):\n"]
+        for i, track in enumerate(result['shared_tracks'][:5], 1):
+            parts.append(f"   {i}. {track.name} by {track.artist}\n")
+        result_text += "".join(parts)
 
-        else:
-            return [TextContent(
-                type="text",
-                text=f"Unknown tool: {name}"
-            )]
-    
+    return [TextContent(type="text", text=result_text)]
+
+
+async def _handle_set_collaborative(arguments: Dict[str, Any]) -> list[TextContent]:
+    """Handle the set_collaborative tool."""
+    result = await _run_write(
+        playlist_logic.set_collaborative,
+        playlist_id=arguments["playlist_id"],
+        collaborative=arguments["collaborative"]
+    )
+
+    status = "collaborative" if result['collaborative'] else "non-collaborative"
+    result_text = (
+        f"✅ Successfully updated playlist!\n\n"
+        f"🎵 Playlist: {result['playlist_name']}\n"
+        f"🤝 Status: Now {status}\n"
+        f"📋 ID: {result['playlist_id']}"
+    )
+
+    return [TextContent(type="text", text=result_text)]
+
+
+# Phase 1 - Artist Deep Dive Tools
+async def _handle_get_artist_discography(arguments: Dict[str, Any]) -> list[TextContent]:
+    """Handle the get_artist_discography tool."""
+    result = await _cached_read(
+        artist_logic.get_artist_discography,
+        artist_id=arguments["artist_id"],
+        include_groups=arguments.get("include_groups"),
+        limit=arguments.get("limit", 50)
+    )
+
+    parts = [
+        f"🎸 Artist Discography: {result['artist_name']}\n\n"
+        f"📊 Stats:\n"
+        f"   - Total Releases: {result['total_releases']}\n"
+        f"   - Popularity: {result['popularity']}/100\n"
+        f"   - Followers: {result['followers']:,}\n"
+        f"   - Genres: {', '.join(result['genres'][:5]) or 'N/A'}\n\n"
+    ]
+
+    if 'albums' in result and result['albums']:
+        parts.append(f"💿 Albums ({len(result['albums'])}):\n")
+        parts.extend(
+            f"   - {album['name']} ({album['release_date'][:4]})\n"
+            for album in islice(result['albums'], 5)
+        )
+        if len(result['albums']) > 5:
+            parts.append(f"   ... and {len(result['albums']) - 5} more\n")
+        parts.append("\n")
+
+    if 'singles' in result and result['singles']:
+        parts.append(f"💽 Singles ({len(result['singles'])}) - showing first 5:\n")
+        parts.extend(
+            f"   - {single['name']} ({single['release_date'][:4]})\n"
+            for single in islice(result['singles'], 5)
+        )
+        if len(result['singles']) > 5:
+            parts.append(f"   ... and {len(result['singles']) - 5} more\n")
+
+    return [TextContent(type="text", text="".join(parts))]
+
+
+async def _handle_get_related_artists(arguments: Dict[str, Any]) -> list[TextContent]:
+    """Handle the get_related_artists tool."""
+    result = await _cached_read(
+        artist_logic.get_related_artists,
+        artist_id=arguments["artist_id"],
+        limit=arguments.get("limit", 20)
+    )
+
+    result_text = (
+        f"🔗 Artists Related to: {result['original_artist']['name']}\n\n"
+        f"Found {result['count']} related artist(s):\n\n"
+    )
+
+    result_text += "".join(
+        f"{i}. {artist['name']}\n"
+        f"   Popularity: {artist['popularity']}/100\n"
+        f"   Genres: {', '.join(artist['genres'][:3]) or 'N/A'}\n"
+        f"   Followers: {artist['followers']:,}\n"
+        f"   URL: {artist['url']}\n\n"
+        for i, artist in enumerate(result['related_artists'], 1)
+    )
+
+    return [TextContent(type="text", text=result_text)]
+
+
+async def _handle_get_artist_top_tracks(arguments: Dict[str, Any]) -> list[TextContent]:
+    """Handle the get_artist_top_tracks tool."""
+    result = await _cached_read(
+        artist_logic.get_artist_top_tracks,
+        artist_id=arguments["artist_id"],
+        country=arguments.get("country", "US")
+    )
+
+    result_text = (
+        f"⭐ Top Tracks: {result['artist_name']}\n"
+        f"🌍 Country: {result['country']}\n\n"
+        f"Found {result['count']} track(s):\n\n"
+    )
+
+    parts = []
+    for i, track in enumerate(result['tracks'], 1):
+        duration_min, duration_sec = divmod(track['duration_ms'] // 1000, 60)
+        parts.append(
+            f"{i}. {track['name']}\n"
+            f"   Album: {track['album']}\n"
+            f"   Popularity: {track['popularity']}/100\n"
+            f"   Duration: {duration_min}:{duration_sec:02d}\n"
+            f"   URL: {track['url']}\n\n"
+        )
+    result_text += "".join(parts)
+
+    return [TextContent(type="text", text=result_text)]
+
+
+# Phase 2 - Audio Analysis Tool
+async def _handle_get_audio_features(arguments: Dict[str, Any]) -> list[TextContent]:
+    """Handle the get_audio_features tool."""
+    features = await _cached_read(
+        spotify_client.get_track_audio_features,
+        track_id=arguments["track_id"]
+    )
+
+    if not features:
+        return [TextContent(
+            type="text",
+            text="❌ No audio features available. The track may not have a preview URL."
+        )]
+
+    # Format for display
+    result_text = (
+        f"🎵 Audio Features (Track: {arguments['track_id']})\n\n"
+        f"🎼 Musical Properties:\n"
+        f"   - Tempo: {features['tempo']:.1f} BPM\n"
+        f"   - Key: {KEY_NAMES[features['key']]} {MODE_NAMES[features['mode']]}\n\n"
+        f"📊 Energy & Mood:\n"
+        f"   - Energy: {features['energy']:.2f} (0=calm, 1=intense)\n"
+        f"   - Danceability: {features['danceability']:.2f} (0=low, 1=high)\n"
+        f"   - Valence: {features['valence']:.2f} (0=sad, 1=happy)\n\n"
+        f"ℹ️  Analysis Method: {features['analysis_method']}\n"
+        f"⚠️  Note: Based on 30-second preview\n"
+    )
+
+    return [TextContent(type="text", text=result_text)]
+
+
+def _format_track_features(features: Dict[str, Any]) -> str:
+    """One-line summary of the features a source provided (missing ones are skipped)."""
+    parts = []
+    if features.get('tempo') is not None:
+        parts.append(f"Tempo: {features['tempo']:.1f} BPM")
+    if features.get('key') is not None:
+        mode = features.get('mode')
+        parts.append(f"Key: {KEY_NAMES[features['key']]}{'' if mode is None else ' ' + MODE_NAMES[mode]}")
+    for name in ('energy', 'danceability', 'valence'):
+        if features.get(name) is not None:
+            parts.append(f"{name.capitalize()}: {features[name]:.2f}")
+    return " | ".join(parts) or "No feature values"
+
+
+async def _handle_get_tracks_audio_features(arguments: Dict[str, Any]) -> list[TextContent]:
+    """Handle the get_tracks_audio_features tool."""
+    results = await _cached_read(
+        spotify_client.get_tracks_audio_features,
+        track_ids=arguments["track_ids"]
+    )
+
+    if not results:
+        return [TextContent(type="text", text="No tracks found.")]
+
+    found = sum(1 for result in results if result['features'])
+    result_text = f"🎵 Audio features for {found} of {len(results)} track(s):\n\n"
+    result_text += "".join(
+        f"{i}. {result['name']} by {result['artist']}\n"
+        + (
+            f"   {_format_track_features(result['features'])}\n"
+            f"   Source: {result['features'].get('source') or 'unknown'}\n\n"
+            if result['features'] else "   ❌ No audio features available\n\n"
+        )
+        for i, result in enumerate(results, 1)
+    )
+
+    return [TextContent(type="text", text=result_text)]
+
+
+# Tool name -> handler, looked up once per call
+TOOL_HANDLERS: Dict[str, Callable[[Dict[str, Any]], Awaitable[list[TextContent]]]] = {
+    "create_playlist": _handle_create_playlist,
+    "search_tracks": _handle_search_tracks,
+    "add_tracks_to_playlist": _handle_add_tracks_to_playlist,
+    "remove_tracks_from_playlist": _handle_remove_tracks_from_playlist,
+    "get_user_playlists": _handle_get_user_playlists,
+    "get_playlist_tracks": _handle_get_playlist_tracks,
+    "get_recommendations": _handle_get_recommendations,
+    "find_duplicates": _handle_find_duplicates,
+    "get_top_tracks": _handle_get_top_tracks,
+    "create_curated_playlist_from_top_tracks": _handle_create_curated_playlist_from_top_tracks,
+    "get_playlist_stats": _handle_get_playlist_stats,
+    "merge_playlists": _handle_merge_playlists,
+    "compare_playlists": _handle_compare_playlists,
+    "set_collaborative": _handle_set_collaborative,
+    "get_artist_discography": _handle_get_artist_discography,
+    "get_related_artists": _handle_get_related_artists,
+    "get_artist_top_tracks": _handle_get_artist_top_tracks,
+    "get_audio_features": _handle_get_audio_features,
+    "get_tracks_audio_features": _handle_get_tracks_audio_features,
+}
+
+
+@server.call_tool()
+async def call_tool(name: str, arguments: Any) -> list[TextContent]:
+    """Handle tool calls from Claude.
+
+    Dispatches to the tool's handler in TOOL_HANDLERS. Blocking Spotify calls
+    run in worker threads (asyncio.to_thread), either in the handler or
+    inside the async client methods, so the event loop stays free to serve
+    other tool calls meanwhile.
+    """
+    handler = TOOL_HANDLERS.get(name)
+    if handler is None:
+        return [TextContent(
+            type="text",
+            text=f"Unknown tool: {name}"
+        )]
+
+    try:
+        return await handler(arguments)
     except Exception as e:
         return [TextContent(
             type="text",
@@ -850,6 +1164,12 @@ async def main():
     """Main entry point for the MCP server."""
     global spotify_client, playlist_logic, artist_logic
 
+    # The stdio transport is only needed when actually serving
+    from mcp.server.stdio import stdio_server
+
+    # Load environment variables (only the server entry point needs them)
+    load_dotenv()
+
     # Get credentials from environment
     client_id = os.getenv("SPOTIFY_CLIENT_ID")
     client_secret = os.getenv("SPOTIFY_CLIENT_SECRET")
@@ -891,12 +1211,20 @@ async def main():
 
     print("✅ Spotify MCP Server ready!", file=sys.stderr)
     
+    # Keep the access token fresh while the server runs (authenticated only)
+    token_task = asyncio.create_task(_keep_token_fresh()) if spotify_client.sp else None
+
     # Run the MCP server
-    async with stdio_server() as (read_stream, write_stream):
-        await server.run(
-            read_stream,
-            write_stream,
-            server.create_initialization_options()
-        )
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await server.run(
+                read_stream,
+                write_stream,
+                server.create_initialization_options()
+            )
+    finally:
+        if token_task is not None:
+            token_task.cancel()
+        await spotify_client.aclose()
 if __name__ == "__main__":
     asyncio.run(main())
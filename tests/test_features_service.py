@@ -0,0 +1,133 @@
+"""Tests for batched audio feature lookups."""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from src.features.cache import FeatureCache, MBIDCache
+from src.features.clients._retry import RateLimiter
+from src.features.clients.musicbrainz import MusicBrainzClient
+from src.features.models import AudioFeatures, SpotifyTrack
+from src.features.service import AudioFeaturesService
+
+
+class _FakeMusicBrainz:
+    """Answers ISRC lookups from a fixed table and records each call."""
+
+    cache = None
+
+    def __init__(self, mbids):
+        self.mbids = mbids
+        self.batch_calls = []
+        self.single_calls = []
+
+    async def lookup_mbids_by_isrcs(self, isrcs):
+        self.batch_calls.append(list(isrcs))
+        return {isrc: self.mbids.get(isrc) for isrc in isrcs}
+
+    async def cached_mbid_for_isrc(self, isrc):
+        # Mirrors the real client: the batched lookup above fills the cache
+        if any(isrc in call for call in self.batch_calls):
+            return True, self.mbids.get(isrc)
+        return False, None
+
+    async def lookup_mbid_by_isrc(self, isrc):
+        self.single_calls.append(isrc)
+        return self.mbids.get(isrc)
+
+    async def fuzzy_search_mbid(self, track_name, artist_name, duration_ms=None):
+        return None
+
+
+class _FakeAcousticBrainz:
+    """Returns features with the MBID as tempo marker."""
+
+    async def fetch(self, mbid):
+        return AudioFeatures(tempo=float(mbid), source="acousticbrainz", source_track_id=mbid)
+
+    async def fetch_many(self, mbids, max_concurrency=4):
+        return {mbid: await self.fetch(mbid) for mbid in mbids}
+
+
+def _track(track_id, isrc):
+    return SpotifyTrack(id=track_id, name=f"Song {track_id}", artist="Artist", duration_ms=200_000, isrc=isrc)
+
+
+def test_get_features_batch_resolves_isrcs_in_one_request(tmp_path):
+    musicbrainz = _FakeMusicBrainz({"ISRC1": "100", "ISRC2": "120"})
+    service = AudioFeaturesService(
+        musicbrainz_client=musicbrainz,
+        acousticbrainz_client=_FakeAcousticBrainz(),
+        cache=FeatureCache(cache_dir=str(tmp_path))
+    )
+    tracks = [_track("a", "ISRC1"), _track("b", None), _track("c", "ISRC2")]
+
+    results = asyncio.run(service.get_features_batch(tracks))
+
+    assert [r and r.tempo for r in results] == [100.0, None, 120.0]
+    assert musicbrainz.batch_calls == [["ISRC1", "ISRC2"]]
+    assert musicbrainz.single_calls == []
+    service.cache.close()
+
+
+def test_rate_limiter_spaces_concurrent_waits():
+    async def run():
+        limiter = RateLimiter(20.0)
+        start = time.monotonic()
+        await asyncio.gather(*(limiter.wait() for _ in range(5)))
+        return time.monotonic() - start
+
+    # Five slots at 20/s: the last one starts 4 intervals (0.2 s) after the first
+    assert asyncio.run(run()) >= 0.19
+
+
+def test_musicbrainz_errors_are_not_cached_as_misses(tmp_path):
+    responses = [httpx.Response(200, content=b"<html>maintenance</html>"),
+                 httpx.Response(200, json={"recordings": []})]
+
+    async def run():
+        transport = httpx.MockTransport(lambda request: responses.pop(0))
+        async with httpx.AsyncClient(transport=transport) as client:
+            musicbrainz = MusicBrainzClient(client=client, cache=MBIDCache(cache_dir=str(tmp_path)))
+            musicbrainz.RATE_LIMITER = RateLimiter(1000.0)
+            with pytest.raises(ValueError):
+                await musicbrainz.lookup_mbid_by_isrc("ISRC1")
+            unset = await musicbrainz.cached_mbid_for_isrc("ISRC1")
+
+            # A genuine empty answer is cached as a negative result
+            assert await musicbrainz.lookup_mbid_by_isrc("ISRC1") is None
+            negative = await musicbrainz.cached_mbid_for_isrc("ISRC1")
+            musicbrainz.cache.close()
+            return unset, negative
+
+    assert asyncio.run(run()) == ((False, None), (True, None))
+
+
+def test_cancelled_caller_does_not_cancel_shared_fetch(tmp_path):
+    service = AudioFeaturesService(
+        musicbrainz_client=_FakeMusicBrainz({}),
+        acousticbrainz_client=_FakeAcousticBrainz(),
+        cache=FeatureCache(cache_dir=str(tmp_path))
+    )
+    calls = []
+
+    async def slow_fetch(track):
+        calls.append(track.id)
+        await asyncio.sleep(0.05)
+        return AudioFeatures(tempo=90.0, source="acousticbrainz", source_track_id="1")
+
+    service._fetch_features = slow_fetch
+
+    async def run():
+        track = _track("a", None)
+        first = asyncio.create_task(service.get_features(track))
+        second = asyncio.create_task(service.get_features(track))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(run()).tempo == 90.0
+    assert calls == ["a"]
+    service.cache.close()
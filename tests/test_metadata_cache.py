@@ -0,0 +1,22 @@
+"""Tests for the persistent Spotify metadata cache."""
+
+import time
+
+from src.clients.metadata_cache import MetadataCache
+
+
+def test_tracks_expire_after_ttl(tmp_path):
+    cache = MetadataCache(cache_dir=str(tmp_path), track_ttl_hours=1)
+    track = {"id": "t1", "name": "Song", "popularity": 40}
+    cache.set_tracks([track])
+
+    assert cache.cached_track_ids(["t1", "t2"]) == {"t1"}
+    assert cache.get_tracks(["t1"]) == {"t1": track}
+
+    # Age the row past the TTL
+    with cache._conn:
+        cache._conn.execute("UPDATE tracks SET fetched_ts = ?", (time.time() - 2 * 3600,))
+
+    assert cache.cached_track_ids(["t1"]) == set()
+    assert cache.get_tracks(["t1"]) == {}
+    cache.close()
@@ -0,0 +1,69 @@
+"""Tests for the Spotify client's HTTP session configuration."""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from src.clients.spotify_client import ConditionalGetAdapter, SpotifyClient
+
+
+class _UnavailableHandler(BaseHTTPRequestHandler):
+    """Answers every request with 503 and counts requests per method."""
+
+    counts = {}
+
+    def _unavailable(self):
+        self.counts[self.command] = self.counts.get(self.command, 0) + 1
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+        self.send_response(503)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    do_GET = _unavailable
+    do_POST = _unavailable
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def unavailable_server():
+    """Local HTTP server that always returns 503."""
+    _UnavailableHandler.counts = {}
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _UnavailableHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", _UnavailableHandler.counts
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def session():
+    """Session mounted with the client's adapter and retry policy (no backoff)."""
+    session = requests.Session()
+    adapter = ConditionalGetAdapter(max_retries=SpotifyClient.HTTP_RETRY.new(backoff_factor=0))
+    session.mount("http://", adapter)
+    yield session
+    session.close()
+
+
+def test_post_is_not_replayed_on_5xx(unavailable_server, session):
+    url, counts = unavailable_server
+
+    response = session.post(f"{url}/v1/playlists/abc/tracks", json={"uris": ["spotify:track:1"]})
+
+    assert response.status_code == 503
+    assert counts == {"POST": 1}
+
+
+def test_get_is_retried_on_5xx(unavailable_server, session):
+    url, counts = unavailable_server
+
+    with pytest.raises(requests.exceptions.RetryError):
+        session.get(f"{url}/v1/tracks/abc")
+
+    assert counts == {"GET": SpotifyClient.HTTP_RETRY.total + 1}